@@ -36,88 +36,152 @@ Features:
 
 import sys
 import re
-from collections import defaultdict
+import mmap
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+
+# Compiled once at import; parse_debug_log runs these against every log line
+SOQL_RE = re.compile(r'SOQL_EXECUTE_BEGIN.*?\[(.*?)\]')
+DML_RE = re.compile(r'DML_BEGIN\s+\[.*?\]\s+Op:(\w+)')
+
+# Cumulative limit lines, combined so each line is scanned once.
+# Group names map directly to the keys stored in metrics['limits'].
+LIMITS_RE = re.compile(
+    r'Number of SOQL queries:\s+(?P<soql_queries>\d+)\s+out of\s+(?P<soql_queries_limit>\d+)'
+    r'|Maximum CPU time:\s+(?P<cpu_time>\d+)\s+out of\s+(?P<cpu_time_limit>\d+)'
+    r'|Maximum heap size:\s+(?P<heap_size>\d+)\s+out of\s+(?P<heap_size_limit>\d+)'
+    r'|Number of DML statements:\s+(?P<dml_statements>\d+)\s+out of\s+(?P<dml_statements_limit>\d+)'
+)
+
+# Deepest method nesting tracked. Apex itself caps the call stack at about
+# 1000 frames, so deeper nesting only comes from unmatched METHOD_ENTRY lines.
+MAX_METHOD_DEPTH = 1024
+
+# Sample queries kept per method; the report only shows the first few
+SOQL_SAMPLES_PER_METHOD = 10
+
+# Events whose lines are attributed to the enclosing method
+_METHOD_CONSUMERS = (b'SOQL_EXECUTE_BEGIN', b'DML_BEGIN')
+
+
+def log_has_method_consumers(log_file):
+    """Return True if the log contains any SOQL or DML events.
+
+    Method entry/exit tracking only exists to attribute SOQL and DML to a
+    method, so logs without either can skip it. The file is memory-mapped
+    and searched in place, far cheaper than the main parse.
+    """
+    with open(log_file, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return False  # empty file
+        with buf:
+            return any(buf.find(token) != -1 for token in _METHOD_CONSUMERS)
+
+
+@lru_cache(maxsize=4096)
+def parse_limit_line(line):
+    """Return (limit name, used, limit) for a cumulative limit line, else None.
+
+    Limit lines carry no timestamp and the same usage block is repeated
+    after every transaction, so identical lines are common and cached.
+    """
+    limit_match = LIMITS_RE.search(line)
+    if not limit_match:
+        return None
+    name = limit_match.lastgroup[:-len('_limit')]
+    return name, int(limit_match.group(name)), int(limit_match.group(limit_match.lastgroup))
 
 
 def parse_debug_log(log_file):
     """Parse debug log and extract performance metrics."""
-    with open(log_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
     metrics = {
         'cpu_time': [],
         'heap_usage': [],
-        'soql_queries': [],
-        'dml_operations': [],
+        'soql_count': 0,
+        'soql_by_method': Counter(),
+        'soql_samples': defaultdict(list),
+        'dml_count': 0,
+        'dml_by_method': defaultdict(Counter),
         'methods': defaultdict(list),
         'limits': {}
     }
 
-    lines = content.split('\n')
-
     current_method = None
-    method_stack = []
-
-    for line in lines:
-        # Track method entry/exit
-        method_entry = re.search(r'METHOD_ENTRY.*?(\w+\.\w+\([^\)]*\))', line)
-        if method_entry:
-            method_name = method_entry.group(1)
-            method_stack.append(method_name)
-            current_method = method_name
-
-        method_exit = re.search(r'METHOD_EXIT.*?(\w+\.\w+\([^\)]*\))', line)
-        if method_exit:
-            if method_stack:
-                method_stack.pop()
-            current_method = method_stack[-1] if method_stack else None
-
-        # Extract SOQL queries
-        soql_match = re.search(r'SOQL_EXECUTE_BEGIN.*?\[(.*?)\]', line)
-        if soql_match:
-            query = soql_match.group(1)
-            metrics['soql_queries'].append({
-                'query': query[:200],  # Truncate long queries
-                'method': current_method or 'Unknown'
-            })
-
-        # Extract DML operations
-        dml_match = re.search(r'DML_BEGIN\s+\[.*?\]\s+Op:(\w+)', line)
-        if dml_match:
-            operation = dml_match.group(1)
-            metrics['dml_operations'].append({
-                'operation': operation,
-                'method': current_method or 'Unknown'
-            })
-
-        # Extract cumulative limits
-        limit_match = re.search(r'LIMIT_USAGE_FOR_NS.*?Number of SOQL queries:\s+(\d+)\s+out of\s+(\d+)', line)
-        if limit_match:
-            metrics['limits']['soql_queries'] = {
-                'used': int(limit_match.group(1)),
-                'limit': int(limit_match.group(2))
-            }
-
-        limit_match = re.search(r'Maximum CPU time:\s+(\d+)\s+out of\s+(\d+)', line)
-        if limit_match:
-            metrics['limits']['cpu_time'] = {
-                'used': int(limit_match.group(1)),
-                'limit': int(limit_match.group(2))
-            }
-
-        limit_match = re.search(r'Maximum heap size:\s+(\d+)\s+out of\s+(\d+)', line)
-        if limit_match:
-            metrics['limits']['heap_size'] = {
-                'used': int(limit_match.group(1)),
-                'limit': int(limit_match.group(2))
-            }
-
-        limit_match = re.search(r'Number of DML statements:\s+(\d+)\s+out of\s+(\d+)', line)
-        if limit_match:
-            metrics['limits']['dml_statements'] = {
-                'used': int(limit_match.group(1)),
-                'limit': int(limit_match.group(2))
-            }
+    method_stack = [None] * MAX_METHOD_DEPTH
+    depth = 0
+    overflow = 0  # entries past MAX_METHOD_DEPTH, not on method_stack
+    track_methods = log_has_method_consumers(log_file)
+    parse_limit_line.cache_clear()
+
+    # Iterate the file directly rather than read() + split(), so multi-GB
+    # logs are never held in memory as a string plus a list of lines.
+    with open(log_file, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        for line in f:
+            # Cheap substring checks first; most log lines match none of the
+            # events below, so the regexes only run on candidate lines.
+            # A line is a single event, so stop at the first one that
+            # matches; checks are ordered most frequent first.
+
+            # Track method entry/exit. Log lines are pipe-delimited:
+            #   timestamp|METHOD_ENTRY|[line]|id|Class.method(args)
+            # so a split is enough to pull out the event and method name.
+            if track_methods and 'METHOD_' in line:
+                parts = line.split('|', 4)
+                event = parts[1] if len(parts) > 1 else ''
+
+                if event == 'METHOD_ENTRY' and len(parts) == 5:
+                    # The same few method names repeat throughout a log;
+                    # interning keeps one copy of each
+                    method_name = sys.intern(parts[4].strip())
+                    if depth < MAX_METHOD_DEPTH:
+                        method_stack[depth] = method_name
+                        depth += 1
+                    else:
+                        overflow += 1
+                    current_method = method_name
+                    continue
+
+                elif event == 'METHOD_EXIT':
+                    # A dropped entry's exit must not pop a tracked frame
+                    if overflow:
+                        overflow -= 1
+                    elif depth:
+                        depth -= 1
+                    current_method = method_stack[depth - 1] if depth else None
+                    continue
+
+            # Extract SOQL queries
+            if 'SOQL_EXECUTE_BEGIN' in line:
+                soql_match = SOQL_RE.search(line)
+                if soql_match:
+                    # Aggregate per method as we go instead of keeping a
+                    # record per query; only a few samples are reported
+                    method = current_method or 'Unknown'
+                    metrics['soql_count'] += 1
+                    metrics['soql_by_method'][method] += 1
+                    samples = metrics['soql_samples'][method]
+                    if len(samples) < SOQL_SAMPLES_PER_METHOD:
+                        samples.append(soql_match.group(1)[:200])  # Truncate long queries
+                continue
+
+            # Extract DML operations
+            if 'DML_BEGIN' in line:
+                dml_match = DML_RE.search(line)
+                if dml_match:
+                    method = current_method or 'Unknown'
+                    metrics['dml_count'] += 1
+                    metrics['dml_by_method'][method][dml_match.group(1)] += 1
+                continue
+
+            # Extract cumulative limits
+            if 'out of' in line:
+                limit = parse_limit_line(line)
+                if limit:
+                    name, used, limit_value = limit
+                    metrics['limits'][name] = {'used': used, 'limit': limit_value}
 
     return metrics
 
@@ -128,63 +192,61 @@ def format_analysis(metrics):
     print("⚡ APEX PERFORMANCE ANALYSIS")
     print("=" * 70)
 
+    # Usage ratios, computed once for both the summary and recommendations
+    limits = metrics['limits']
+    usage = {
+        name: limit['used'] / limit['limit']
+        for name, limit in limits.items() if limit['limit']
+    }
+
     # Governor Limits Summary
-    if metrics['limits']:
+    if limits:
         print("\n📊 Governor Limits Usage:")
         print("-" * 70)
 
-        if 'cpu_time' in metrics['limits']:
-            cpu = metrics['limits']['cpu_time']
-            pct = (cpu['used'] / cpu['limit']) * 100
+        if 'cpu_time' in usage:
+            cpu = limits['cpu_time']
+            pct = usage['cpu_time'] * 100
             status = "✅" if pct < 50 else "⚠️ " if pct < 80 else "❌"
             print(f"  {status} CPU Time: {cpu['used']:,} / {cpu['limit']:,} ms ({pct:.1f}%)")
 
-        if 'heap_size' in metrics['limits']:
-            heap = metrics['limits']['heap_size']
-            pct = (heap['used'] / heap['limit']) * 100
+        if 'heap_size' in usage:
+            heap = limits['heap_size']
+            pct = usage['heap_size'] * 100
             status = "✅" if pct < 50 else "⚠️ " if pct < 80 else "❌"
             print(f"  {status} Heap Size: {heap['used']:,} / {heap['limit']:,} bytes ({pct:.1f}%)")
 
-        if 'soql_queries' in metrics['limits']:
-            soql = metrics['limits']['soql_queries']
-            pct = (soql['used'] / soql['limit']) * 100
+        if 'soql_queries' in usage:
+            soql = limits['soql_queries']
+            pct = usage['soql_queries'] * 100
             status = "✅" if pct < 50 else "⚠️ " if pct < 80 else "❌"
             print(f"  {status} SOQL Queries: {soql['used']} / {soql['limit']} ({pct:.1f}%)")
 
-        if 'dml_statements' in metrics['limits']:
-            dml = metrics['limits']['dml_statements']
-            pct = (dml['used'] / dml['limit']) * 100
+        if 'dml_statements' in usage:
+            dml = limits['dml_statements']
+            pct = usage['dml_statements'] * 100
             status = "✅" if pct < 50 else "⚠️ " if pct < 80 else "❌"
             print(f"  {status} DML Statements: {dml['used']} / {dml['limit']} ({pct:.1f}%)")
 
     # SOQL Queries
-    if metrics['soql_queries']:
-        print(f"\n🔍 SOQL Queries ({len(metrics['soql_queries'])} total):")
+    if metrics['soql_count']:
+        print(f"\n🔍 SOQL Queries ({metrics['soql_count']} total):")
         print("-" * 70)
 
-        # Group by method
-        queries_by_method = defaultdict(list)
-        for query_info in metrics['soql_queries']:
-            queries_by_method[query_info['method']].append(query_info['query'])
-
-        for method, queries in sorted(queries_by_method.items(), key=lambda x: len(x[1]), reverse=True)[:5]:
+        for method, count in metrics['soql_by_method'].most_common(5):
             print(f"\n  Method: {method}")
-            print(f"  Count: {len(queries)} queries")
-            if len(queries) > 1:
+            print(f"  Count: {count} queries")
+            if count > 1:
                 print(f"  ⚠️  Multiple queries in same method - consider bulkifying")
-            for query in queries[:2]:  # Show first 2
+            for query in metrics['soql_samples'][method][:2]:  # Show first 2
                 print(f"    • {query[:100]}...")
 
     # DML Operations
-    if metrics['dml_operations']:
-        print(f"\n💾 DML Operations ({len(metrics['dml_operations'])} total):")
+    if metrics['dml_count']:
+        print(f"\n💾 DML Operations ({metrics['dml_count']} total):")
         print("-" * 70)
 
-        # Group by method and operation
-        dml_by_method = defaultdict(lambda: defaultdict(int))
-        for dml_info in metrics['dml_operations']:
-            dml_by_method[dml_info['method']][dml_info['operation']] += 1
-
+        dml_by_method = metrics['dml_by_method']
         for method, operations in sorted(dml_by_method.items(), key=lambda x: sum(x[1].values()), reverse=True)[:5]:
             total_dml = sum(operations.values())
             print(f"\n  Method: {method}")
@@ -201,25 +263,25 @@ def format_analysis(metrics):
 
     recommendations = []
 
-    if metrics['limits'].get('cpu_time', {}).get('used', 0) / metrics['limits'].get('cpu_time', {}).get('limit', 1) > 0.5:
+    if usage.get('cpu_time', 0) > 0.5:
         recommendations.append("CPU usage is high. Consider:")
         recommendations.append("  - Moving complex logic to async (@future, Queueable, Batch)")
         recommendations.append("  - Reducing nested loops")
         recommendations.append("  - Caching expensive calculations")
 
-    if metrics['limits'].get('heap_size', {}).get('used', 0) / metrics['limits'].get('heap_size', {}).get('limit', 1) > 0.5:
+    if usage.get('heap_size', 0) > 0.5:
         recommendations.append("Heap usage is high. Consider:")
         recommendations.append("  - Loading fewer fields in SOQL queries")
         recommendations.append("  - Processing records in smaller batches")
         recommendations.append("  - Clearing large collections after use")
 
-    if len(metrics['soql_queries']) > 50:
+    if metrics['soql_count'] > 50:
         recommendations.append("High SOQL query count. Consider:")
         recommendations.append("  - Bulkifying code to use fewer queries")
         recommendations.append("  - Using Maps for lookups instead of repeated queries")
         recommendations.append("  - Moving queries outside loops")
 
-    if len(metrics['dml_operations']) > 50:
+    if metrics['dml_count'] > 50:
         recommendations.append("High DML operation count. Consider:")
         recommendations.append("  - Collecting records and using bulk DML (update list)")
         recommendations.append("  - Removing DML from loops")
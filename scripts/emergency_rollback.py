@@ -14,6 +14,8 @@ Requirements:
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
     - CSV backup file with Id column and data to restore
+    Optional: simple_salesforce (pip install simple-salesforce) to fetch current
+              records over one REST API session
 
 Safety: ⚠️ DESTRUCTIVE - WRITES DATA
     This script MODIFIES DATA in the target org.
@@ -36,37 +38,63 @@ Features:
 
 import sys
 import json
+import shutil
 import subprocess
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
+
+
+# Record IDs per `WHERE Id IN (...)` query; 200 IDs keeps each query far
+# below the SOQL statement length limit
+ID_BATCH_SIZE = 200
+
+
+# Resolved once, so each CLI call skips the PATH search
+_SF = shutil.which('sf') or 'sf'
+
 
 def run_command(cmd_list):
-    """Execute command and return output."""
+    """Execute command and return its stdout as bytes.
+
+    Output is only ever parsed as JSON, which takes bytes directly, so
+    it isn't decoded to a str first.
+    """
     try:
+        # close_fds=False is safe since Python fds are not inheritable
+        # by default, and lets subprocess use its faster spawn path
         result = subprocess.run(
-            cmd_list,
+            [_SF, *cmd_list[1:]] if cmd_list[0] == 'sf' else cmd_list,
             capture_output=True,
-            text=True,
-            check=True
+            check=True,
+            close_fds=False
         )
         return result.stdout
     except subprocess.CalledProcessError as e:
-        print(f"Error: {e.stderr}")
+        print(f"Error: {e.stderr.decode('utf-8', 'replace')}")
         return None
 
 
 def load_backup_csv(csv_file):
-    """Load backup CSV file and return records."""
+    """Load backup CSV file and return (header, rows).
+
+    Rows are plain lists; only a handful are ever shown by column name,
+    so building a dict per row is not worth it on large backups.
+    """
     print(f"📂 Loading backup file: {csv_file}")
 
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            records = list(reader)
+        with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            # csv.reader gives [] for a blank line; it isn't a record
+            rows = [row for row in reader if row]
 
-        print(f"✅ Loaded {len(records)} records from backup")
-        return records
+        print(f"✅ Loaded {len(rows)} records from backup")
+        return header, rows
 
     except FileNotFoundError:
         print(f"Error: Backup file not found: {csv_file}")
@@ -76,43 +104,100 @@ def load_backup_csv(csv_file):
         sys.exit(1)
 
 
-def get_current_records(sobject, record_ids, org_alias):
-    """Get current state of records in org."""
-    print(f"\n🔍 Fetching current records from {org_alias}...")
+def soql_quote(value):
+    """Quote a value as a SOQL string literal."""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def chunks(items, size):
+    """Yield successive slices of items of at most size elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
-    ids_str = "'" + "','".join(record_ids) + "'"
+
+def fetch_records_chunk(sobject, record_ids, org_alias):
+    """Query one batch of record IDs and return the matching records.
+
+    Returns None if the batch couldn't be queried, so a failure isn't
+    mistaken for IDs that no longer exist in the org.
+    """
+    # IDs come straight from the backup CSV, so quote each one rather than
+    # trusting the file to contain nothing but well-formed record IDs
+    ids_str = ",".join(soql_quote(record_id) for record_id in record_ids)
     query = f"SELECT Id FROM {sobject} WHERE Id IN ({ids_str})"
 
+    session = get_api_session(org_alias)
+    if session is not None:
+        try:
+            return session.query_all(query)['records']
+        except SalesforceError as e:
+            print(f"Error: {e}")
+            return None
+
     cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
     output = run_command(cmd)
 
     if not output:
-        return []
+        return None
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
         if data.get('result') and data['result'].get('records'):
             return data['result']['records']
         return []
     except json.JSONDecodeError:
+        return None
+
+
+def get_current_records(sobject, record_ids, org_alias):
+    """Get current state of records in org."""
+    print(f"\n🔍 Fetching current records from {org_alias}...")
+
+    # A single IN clause over the whole backup runs into the SOQL length
+    # limit, so query in batches and overlap the CLI round-trips
+    record_ids = [record_id for record_id in record_ids if record_id]
+    batches = list(chunks(record_ids, ID_BATCH_SIZE))
+    if not batches:
         return []
 
+    records = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(8, len(batches))) as executor:
+        results = executor.map(
+            lambda ids: fetch_records_chunk(sobject, ids, org_alias),
+            batches
+        )
+        for batch_records in results:
+            if batch_records is None:
+                failed += 1
+            else:
+                records.extend(batch_records)
+
+    # A short count would understate what the restore overwrites, and it
+    # is shown right before the confirmation prompt, so don't go on
+    if failed:
+        print(f"Error: Could not fetch {failed} of {len(batches)} batches of current records")
+        sys.exit(1)
 
-def show_diff_preview(backup_records, current_count):
+    return records
+
+
+def show_diff_preview(header, backup_rows, current_count):
     """Show preview of changes that will be applied."""
     print("\n" + "=" * 70)
     print("📊 RESTORE PREVIEW")
     print("=" * 70)
-    print(f"  Records in backup: {len(backup_records)}")
+    print(f"  Records in backup: {len(backup_rows)}")
     print(f"  Records in org: {current_count}")
 
-    if len(backup_records) > current_count:
-        print(f"  ⚠️  {len(backup_records) - current_count} records will be created")
-    elif len(backup_records) < current_count:
-        print(f"  ⚠️  {current_count - len(backup_records)} records not in backup (won't be affected)")
+    if len(backup_rows) > current_count:
+        print(f"  ⚠️  {len(backup_rows) - current_count} records will be created")
+    elif len(backup_rows) < current_count:
+        print(f"  ⚠️  {current_count - len(backup_rows)} records not in backup (won't be affected)")
 
     print("\n  Sample records to restore:")
-    for i, record in enumerate(backup_records[:5], 1):
+    for i, row in enumerate(backup_rows[:5], 1):
+        record = dict(zip(header, row))
         record_id = record.get('Id', 'N/A')
         print(f"    {i}. {record_id}: {dict(list(record.items())[:3])}")
 
@@ -132,7 +217,7 @@ def restore_data(sobject, csv_file, org_alias):
         return False
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
         if data.get('status') == 0:
             print("✅ Data restored successfully")
             return True
@@ -174,18 +259,22 @@ def main():
     print("=" * 70)
 
     # Load backup
-    backup_records = load_backup_csv(csv_file)
+    header, backup_rows = load_backup_csv(csv_file)
 
-    if not backup_records:
+    if not backup_rows:
         print("Error: No records in backup file")
         sys.exit(1)
 
     # Get current records
-    record_ids = [r['Id'] for r in backup_records if 'Id' in r]
+    if 'Id' in header:
+        id_idx = header.index('Id')
+        record_ids = [row[id_idx] for row in backup_rows if len(row) > id_idx]
+    else:
+        record_ids = []
     current_records = get_current_records(sobject, record_ids, org_alias)
 
     # Show diff
-    show_diff_preview(backup_records, len(current_records))
+    show_diff_preview(header, backup_rows, len(current_records))
 
     # Confirmation
     print("\n⚠️  WARNING: This will overwrite current data with backup data!")
@@ -202,7 +291,7 @@ def main():
     if success:
         print("✅ EMERGENCY ROLLBACK COMPLETE")
         print("=" * 70)
-        print(f"  Restored {len(backup_records)} {sobject} records")
+        print(f"  Restored {len(backup_rows)} {sobject} records")
         print("\n💡 Next Steps:")
         print("   1. Verify data in Salesforce UI")
         print("   2. Run validation queries")
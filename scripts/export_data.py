@@ -14,6 +14,9 @@ Requirements:
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
     - Write permissions for output directory
+    Optional: ijson (pip install ijson) to parse large query results incrementally
+    Optional: simple_salesforce (pip install simple-salesforce) to query over
+              one REST API session instead of a CLI call per request
 
 Safety: READ-ONLY (with file export)
     Exports data from org. Creates CSV files and import plans locally.
@@ -28,92 +31,183 @@ Features:
 """
 
 import sys
+import csv
+import itertools
 import json
+import shutil
 import subprocess
+import io
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
 
-def run_command(cmd_list):
-    """Execute command and return output."""
+# Optional: ijson parses query results incrementally from the CLI's stdout
+try:
+    import ijson
+    JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (json.JSONDecodeError,)
+
+
+# Resolved once, so each CLI call skips the PATH search
+_SF = shutil.which('sf') or 'sf'
+
+
+def run_command(cmd_list, out=None):
+    """Execute command and return its stdout as bytes.
+
+    Output is only ever parsed as JSON, which takes bytes directly, so
+    it isn't decoded to a str first. Errors are printed to out (default
+    stdout) before exiting.
+    """
     try:
+        # close_fds=False is safe since Python fds are not inheritable
+        # by default, and lets subprocess use its faster spawn path
         result = subprocess.run(
-            cmd_list,
+            [_SF, *cmd_list[1:]] if cmd_list[0] == 'sf' else cmd_list,
             capture_output=True,
-            text=True,
-            check=True
+            check=True,
+            close_fds=False
         )
         return result.stdout
     except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {' '.join(cmd_list)}")
-        print(f"Error: {e.stderr}")
+        print(f"Error executing command: {' '.join(cmd_list)}", file=out)
+        print(f"Error: {e.stderr.decode('utf-8', 'replace')}", file=out)
         sys.exit(1)
 
 
-def get_object_fields(sobject, org_alias):
-    """Get all fields for a Salesforce object."""
-    print(f"  Fetching fields for {sobject}...")
+def api_request_failed(error, out=None):
+    """Report a failed REST API call the way run_command reports CLI errors."""
+    print(f"Error: Salesforce API request failed: {error}", file=out)
+    sys.exit(1)
 
-    cmd = ['sf', 'sobject', 'describe', '-s', sobject, '-o', org_alias, '--json']
-    output = run_command(cmd)
 
-    try:
-        data = json.loads(output)
-        if data.get('status') != 0:
-            print(f"Warning: Could not describe {sobject}")
-            return []
-
-        fields = data['result']['fields']
-
-        # Filter out compound fields and non-queryable fields
-        queryable_fields = [
-            f['name'] for f in fields
-            if f.get('type') != 'address' and
-               f.get('type') != 'location' and
-               not f['name'].endswith('Address')
-        ]
+def query_json(query, org_alias, out=None):
+    """Run a SOQL query and return the `sf data query --json` style result."""
+    session = get_api_session(org_alias)
+    if session is not None:
+        try:
+            return {'status': 0, 'result': session.query_all(query)}
+        except SalesforceError as e:
+            api_request_failed(e, out)
 
-        return queryable_fields[:50]  # Limit to 50 fields to avoid SOQL limits
+    cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
+    return json_loads(run_command(cmd, out))
 
-    except json.JSONDecodeError:
-        print(f"Error: Could not parse sobject describe output for {sobject}")
-        return []
 
+def stream_query_records(query, org_alias, out=None):
+    """Yield records from `sf data query --json` as they are parsed.
 
-def get_relationship_fields(sobject, org_alias):
-    """Get lookup/master-detail fields for relationship preservation."""
-    print(f"  Identifying relationship fields for {sobject}...")
+    Reads the CLI's stdout through a pipe instead of capturing it, so a
+    large result is never held as one string on top of the parsed records.
+    With ijson installed, records are parsed incrementally as well.
+    """
+    session = get_api_session(org_alias)
+    if session is not None:
+        try:
+            yield from session.query_all_iter(query)
+        except SalesforceError as e:
+            api_request_failed(e, out)
+        return
 
-    cmd = ['sf', 'sobject', 'describe', '-s', sobject, '-o', org_alias, '--json']
-    output = run_command(cmd)
+    cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
 
-    try:
-        data = json.loads(output)
-        if data.get('status') != 0:
-            return []
-
-        fields = data['result']['fields']
-
-        relationship_fields = []
-        for f in fields:
-            # Find lookup and master-detail fields
-            if f.get('type') == 'reference' and f.get('relationshipName'):
-                relationship_info = {
-                    'field': f['name'],
-                    'relationshipName': f['relationshipName'],
-                    'referenceTo': f.get('referenceTo', [])
-                }
-                relationship_fields.append(relationship_info)
+    # stderr goes to a file so a chatty CLI can't fill the pipe and block
+    with tempfile.TemporaryFile(mode='w+') as stderr, \
+            subprocess.Popen([_SF, *cmd[1:]], stdout=subprocess.PIPE, stderr=stderr,
+                             close_fds=False) as proc:
+        if ijson is not None:
+            yield from ijson.items(proc.stdout, 'result.records.item', use_float=True)
+        else:
+            data = json_loads(proc.stdout.read())
+            yield from (data.get('result') or {}).get('records') or []
+
+        if proc.wait() != 0:
+            stderr.seek(0)
+            print(f"Error executing command: {' '.join(cmd)}", file=out)
+            print(f"Error: {stderr.read()}", file=out)
+            sys.exit(1)
+
+
+# Describe results keyed by (sobject, org_alias). Each `sf sobject describe`
+# spawns the CLI, so fetch once per object and share between callers.
+_describe_cache = {}
+
+
+def describe_sobject(sobject, org_alias, out=None):
+    """Return parsed `sf sobject describe` output, cached per object and org."""
+    key = (sobject, org_alias)
+    session = get_api_session(org_alias)
+    if key not in _describe_cache and session is not None:
+        try:
+            describe = session.restful(f'sobjects/{sobject}/describe')
+            _describe_cache[key] = {'status': 0, 'result': describe}
+        except SalesforceError as e:
+            api_request_failed(e, out)
+
+    if key not in _describe_cache:
+        cmd = ['sf', 'sobject', 'describe', '-s', sobject, '-o', org_alias, '--json']
+        output = run_command(cmd, out)
+
+        try:
+            _describe_cache[key] = json_loads(output)
+        except json.JSONDecodeError:
+            _describe_cache[key] = None
 
-        return relationship_fields
+    return _describe_cache[key]
 
-    except json.JSONDecodeError:
-        return []
 
+# Field types that can't be selected or written back as a plain CSV column
+UNEXPORTABLE_FIELD_TYPES = ('address', 'location', 'base64')
 
-def build_soql_query(sobject, fields, relationship_fields):
-    """Build SOQL query with relationship fields."""
+
+def get_export_fields(sobject, org_alias, out=None):
+    """Get the fields to export and the relationship fields for an object.
+
+    Returns (fields, relationship_fields), both taken from one describe.
+    Formula, deprecated and compound/binary fields are left out since they
+    can't be imported back.
+    """
+    print(f"  Fetching fields for {sobject}...", file=out)
+
+    data = describe_sobject(sobject, org_alias, out)
+    if data is None:
+        print(f"Error: Could not parse sobject describe output for {sobject}", file=out)
+        return [], []
+
+    if data.get('status') != 0:
+        print(f"Warning: Could not describe {sobject}", file=out)
+        return [], []
+
+    fields = []
+    relationship_fields = []
+    for f in data['result']['fields']:
+        if (f.get('calculated') or f.get('deprecatedAndHidden') or
+                f.get('type') in UNEXPORTABLE_FIELD_TYPES):
+            continue
+
+        fields.append(f['name'])
+
+        # Find lookup and master-detail fields
+        if f.get('type') == 'reference' and f.get('relationshipName'):
+            relationship_fields.append({
+                'field': f['name'],
+                'relationshipName': f['relationshipName'],
+                'referenceTo': f.get('referenceTo', [])
+            })
+
+    return fields, relationship_fields
+
+
+def build_field_list(fields, relationship_fields):
+    """Build the SOQL select list, Id first, including relationship fields."""
     field_list = fields.copy()
 
     # Add relationship fields (e.g., Account.Name instead of AccountId)
@@ -131,44 +225,44 @@ def build_soql_query(sobject, fields, relationship_fields):
     if 'Id' in field_list:
         field_list.remove('Id')
 
-    query = f"SELECT Id, {', '.join(field_list)} FROM {sobject}"
+    return ['Id'] + field_list
+
 
-    return query
+def build_soql_query(sobject, field_list):
+    """Build SOQL query from a select list."""
+    return f"SELECT {', '.join(field_list)} FROM {sobject}"
 
 
-def export_object(sobject, org_alias, output_dir):
-    """Export a single Salesforce object to CSV."""
-    print(f"\n📦 Exporting {sobject}...")
+def export_object(sobject, org_alias, output_dir, out=None):
+    """Export a single Salesforce object to CSV, printing progress to out."""
+    print(f"\n📦 Exporting {sobject}...", file=out)
 
     # Get object metadata
-    fields = get_object_fields(sobject, org_alias)
+    fields, relationship_fields = get_export_fields(sobject, org_alias, out)
     if not fields:
-        print(f"  ⚠️  No fields found for {sobject}, skipping")
+        print(f"  ⚠️  No fields found for {sobject}, skipping", file=out)
         return None
 
-    relationship_fields = get_relationship_fields(sobject, org_alias)
-
     # Build SOQL query
-    query = build_soql_query(sobject, fields, relationship_fields)
+    field_list = build_field_list(fields, relationship_fields)
+    query = build_soql_query(sobject, field_list)
 
-    print(f"  Query: {query[:100]}..." if len(query) > 100 else f"  Query: {query}")
+    print(f"  Query: {query[:100]}..." if len(query) > 100 else f"  Query: {query}", file=out)
 
     # Check record count first
     count_query = f"SELECT COUNT(Id) cnt FROM {sobject}"
-    count_cmd = ['sf', 'data', 'query', '-q', count_query, '-o', org_alias, '--json']
-    count_output = run_command(count_cmd)
 
     try:
-        count_data = json.loads(count_output)
+        count_data = query_json(count_query, org_alias, out)
         record_count = count_data['result']['records'][0]['cnt'] if count_data.get('result') else 0
-        print(f"  Found {record_count} records")
+        print(f"  Found {record_count} records", file=out)
 
         if record_count == 0:
-            print(f"  ⚠️  No records found for {sobject}, skipping")
+            print(f"  ⚠️  No records found for {sobject}, skipping", file=out)
             return None
 
     except (json.JSONDecodeError, KeyError):
-        print(f"  ⚠️  Could not determine record count, attempting export anyway")
+        print(f"  ⚠️  Could not determine record count, attempting export anyway", file=out)
         record_count = -1
 
     # Export based on record count
@@ -176,75 +270,92 @@ def export_object(sobject, org_alias, output_dir):
 
     if record_count > 10000:
         # Use bulk export for large datasets
-        print(f"  Using bulk export (large dataset)...")
+        print(f"  Using bulk export (large dataset)...", file=out)
         cmd = ['sf', 'data', 'export', 'bulk', '-q', query, '-o', org_alias, '--output-dir', output_dir]
-        run_command(cmd)
+        run_command(cmd, out)
         # Bulk export creates a file with timestamp; rename it
         # (This is simplified; actual bulk export file handling may vary)
     else:
         # Use standard query for smaller datasets
-        print(f"  Using standard export...")
-        cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
-        output = run_command(cmd)
-
+        print(f"  Using standard export...", file=out)
         try:
-            data = json.loads(output)
-            if data.get('result') and data['result'].get('records'):
-                records = data['result']['records']
+            records = stream_query_records(query, org_alias, out)
+            exported = write_csv(records, output_file, field_list)
 
-                # Write to CSV
-                write_csv(records, output_file, sobject)
-                print(f"  ✅ Exported {len(records)} records to {output_file}")
+            if exported:
+                print(f"  ✅ Exported {exported} records to {output_file}", file=out)
 
                 return {
                     'object': sobject,
                     'file': output_file,
-                    'count': len(records),
+                    'count': exported,
                     'relationships': relationship_fields
                 }
             else:
-                print(f"  ⚠️  No records returned for {sobject}")
+                print(f"  ⚠️  No records returned for {sobject}", file=out)
                 return None
 
-        except json.JSONDecodeError:
-            print(f"  ❌ Error parsing JSON output for {sobject}")
+        except JSON_ERRORS:
+            print(f"  ❌ Error parsing JSON output for {sobject}", file=out)
             return None
 
 
-def write_csv(records, output_file, sobject):
-    """Write records to CSV file."""
-    if not records:
-        return
-
-    # Remove attributes field from records
-    clean_records = []
-    for record in records:
-        clean_record = {k: v for k, v in record.items() if k != 'attributes'}
-
-        # Flatten relationship fields
-        flattened = {}
-        for key, value in clean_record.items():
-            if isinstance(value, dict):
-                # Relationship field (e.g., Account: {Name: "Acme"})
-                for subkey, subvalue in value.items():
-                    if subkey != 'attributes':
-                        flattened[f"{key}.{subkey}"] = subvalue
-            else:
-                flattened[key] = value
-
-        clean_records.append(flattened)
+def write_csv(records, output_file, fieldnames):
+    """Write records to CSV file and return how many were written.
 
-    # Get all unique keys across all records
-    all_keys = set()
-    for record in clean_records:
-        all_keys.update(record.keys())
+    The header comes from the SOQL select list, so rows are flattened and
+    written one at a time instead of collecting every row first to find
+    the union of their keys. records may be any iterable, including a
+    generator; no file is created if it is empty.
+    """
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        return 0
 
-    # Write CSV
-    import csv
+    count = 0
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=sorted(all_keys))
+        writer = csv.DictWriter(f, fieldnames=sorted(fieldnames), extrasaction='ignore')
         writer.writeheader()
-        writer.writerows(clean_records)
+
+        for record in itertools.chain([first], records):
+            # Flatten relationship fields (e.g., Account: {Name: "Acme"})
+            # and drop the attributes metadata at both levels
+            flattened = {}
+            for key, value in record.items():
+                if key == 'attributes':
+                    continue
+                if isinstance(value, dict):
+                    for subkey, subvalue in value.items():
+                        if subkey != 'attributes':
+                            flattened[f"{key}.{subkey}"] = subvalue
+                else:
+                    flattened[key] = value
+
+            writer.writerow(flattened)
+            count += 1
+
+    return count
+
+
+def export_object_buffered(sobject, org_alias, output_dir, failed):
+    """Run export_object with its output captured.
+
+    Returns (result, output, error). A CLI or API failure exits through
+    run_command; that exit is returned as error rather than raised, so
+    the caller can print this object's output in order before stopping.
+    Once any export has failed (the failed event is set), objects that
+    haven't started are skipped.
+    """
+    if failed.is_set():
+        return None, '', None
+    buffer = io.StringIO()
+    try:
+        result = export_object(sobject, org_alias, output_dir, buffer)
+    except SystemExit as e:
+        failed.set()
+        return None, buffer.getvalue(), e
+    return result, buffer.getvalue(), None
 
 
 def create_import_plan(exports, output_dir):
@@ -305,12 +416,26 @@ def main():
     print(f"Output: {output_dir}")
     print("=" * 60)
 
-    # Export each object
+    # Export objects concurrently; each one waits on several sf CLI calls.
+    # Output is buffered per object and printed in the requested order.
     exports = []
-    for sobject in objects:
-        export_info = export_object(sobject, org_alias, output_dir)
-        if export_info:
-            exports.append(export_info)
+    failed = threading.Event()
+    with ThreadPoolExecutor(max_workers=min(8, len(objects))) as executor:
+        futures = [
+            executor.submit(export_object_buffered, sobject, org_alias, output_dir, failed)
+            for sobject in objects
+        ]
+        for future in futures:
+            export_info, output, error = future.result()
+            print(output, end='')
+            if error is not None:
+                # Stop at the first failure, as a sequential export would:
+                # objects not yet started are cancelled, not exported
+                for pending in futures:
+                    pending.cancel()
+                raise error
+            if export_info:
+                exports.append(export_info)
 
     # Create import plan
     create_import_plan(exports, output_dir)
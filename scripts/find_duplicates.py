@@ -15,6 +15,9 @@ Requirements:
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
     - Write permissions for export directory
+    Optional: ijson (pip install ijson) to parse large query results incrementally
+    Optional: simple_salesforce (pip install simple-salesforce) to query over
+              one REST API session instead of a CLI call per query
 
 Safety: READ-ONLY (with file export)
     Reads duplicate records from org. Exports results to CSV files.
@@ -29,36 +32,110 @@ Features:
 """
 
 import sys
+import csv
+import itertools
 import json
+import string
+import shutil
 import subprocess
+import tempfile
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from collections import defaultdict
 
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
+
+# Optional: ijson parses query results incrementally from the CLI's stdout
+try:
+    import ijson
+    JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (json.JSONDecodeError,)
+
+
+# Duplicate groups fetched per records query. Each group adds an OR'd
+# condition, so this keeps the statement well under the SOQL length limit.
+GROUPS_PER_QUERY = 200
+
+# The query is sent URL-encoded in a GET request, and the REST API caps the
+# URI at 16,384 bytes. A batch also closes once its encoded WHERE clause
+# reaches this many characters, leaving room for the rest of the request.
+WHERE_CLAUSE_BUDGET = 10000
+
+# Backslash and single quote are the characters SOQL string literals escape
+_SOQL_TRANS = str.maketrans({'\\': '\\\\', "'": "\\'"})
+
+
+# Resolved once, so each CLI call skips the PATH search
+_SF = shutil.which('sf') or 'sf'
+
 
 def run_command(cmd_list):
-    """Execute command and return output."""
+    """Execute command and return its stdout as bytes.
+
+    Output is only ever parsed as JSON, which takes bytes directly, so
+    it isn't decoded to a str first.
+    """
     try:
+        # close_fds=False is safe since Python fds are not inheritable
+        # by default, and lets subprocess use its faster spawn path
         result = subprocess.run(
-            cmd_list,
+            [_SF, *cmd_list[1:]] if cmd_list[0] == 'sf' else cmd_list,
             capture_output=True,
-            text=True,
-            check=True
+            check=True,
+            close_fds=False
         )
         return result.stdout
     except subprocess.CalledProcessError as e:
         print(f"Error executing command: {' '.join(cmd_list)}")
-        print(f"Error: {e.stderr}")
+        print(f"Error: {e.stderr.decode('utf-8', 'replace')}")
         sys.exit(1)
 
 
-def find_duplicate_field_values(sobject, fields, org_alias):
-    """Find field values that appear more than once."""
-    print(f"🔍 Searching for duplicates in {sobject}...")
-    print(f"   Matching on: {', '.join(fields)}")
+def run_query(query, org_alias):
+    """Yield a SOQL query's records as they are parsed.
 
-    # Build GROUP BY query
+    Reads the CLI's stdout through a pipe instead of capturing it, so a
+    large result is never held as one string on top of the parsed records.
+    With ijson installed, records are parsed incrementally as well.
+    """
+    session = get_api_session(org_alias)
+    if session is not None:
+        try:
+            yield from session.query_all_iter(query)
+        except SalesforceError as e:
+            print(f"Error: Salesforce API request failed: {e}")
+            sys.exit(1)
+        return
+
+    cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
+
+    # stderr goes to a file so a chatty CLI can't fill the pipe and block
+    with tempfile.TemporaryFile(mode='w+') as stderr, \
+            subprocess.Popen([_SF, *cmd[1:]], stdout=subprocess.PIPE, stderr=stderr,
+                             close_fds=False) as proc:
+        if ijson is not None:
+            yield from ijson.items(proc.stdout, 'result.records.item', use_float=True)
+        else:
+            data = json_loads(proc.stdout.read())
+            yield from (data.get('result') or {}).get('records') or []
+
+        if proc.wait() != 0:
+            stderr.seek(0)
+            print(f"Error executing command: {' '.join(cmd)}")
+            print(f"Error: {stderr.read()}")
+            sys.exit(1)
+
+
+def build_duplicate_values_query(sobject, fields, extra_condition=None):
+    """Build the GROUP BY query that finds repeated field values."""
     field_list = ', '.join(fields)
     having_conditions = ' AND '.join([f"{field} != null" for field in fields])
+    if extra_condition:
+        having_conditions += f" AND {extra_condition}"
 
     query = f"""
         SELECT {field_list}, COUNT(Id) cnt
@@ -70,52 +147,166 @@ def find_duplicate_field_values(sobject, fields, org_alias):
         LIMIT 1000
     """
 
-    query_oneline = ' '.join(query.split())
+    return ' '.join(query.split())
 
-    print(f"\n📋 Query: {query_oneline}\n")
 
-    cmd = ['sf', 'data', 'query', '-q', query_oneline, '-o', org_alias, '--json']
-    output = run_command(cmd)
+def query_duplicate_values(query, org_alias):
+    """Run a duplicate values query and return its records without attributes."""
+    records = []
 
-    try:
-        data = json.loads(output)
-        if data.get('result') and data['result'].get('records'):
-            records = data['result']['records']
+    # Remove attributes field in place rather than copying each record
+    for record in run_query(query, org_alias):
+        record.pop('attributes', None)
+        records.append(record)
 
-            # Remove attributes field
-            clean_records = []
-            for record in records:
-                clean_record = {k: v for k, v in record.items() if k != 'attributes'}
-                clean_records.append(clean_record)
+    return records
 
-            return clean_records
-        else:
+
+def shard_conditions(field):
+    """Split an object on the first character of field.
+
+    One shard per letter plus one for everything else (digits,
+    punctuation), so together they cover every non-null value. LIKE is
+    case-insensitive, so each letter shard covers both cases.
+    """
+    letter_conditions = [f"{field} LIKE '{letter}%'" for letter in string.ascii_uppercase]
+    return letter_conditions + ["(NOT (" + ' OR '.join(letter_conditions) + "))"]
+
+
+def find_duplicate_field_values(sobject, fields, org_alias, shard_by=None):
+    """Find field values that appear more than once.
+
+    A single aggregate query returns at most 1000 groups. With shard_by
+    (one of the match fields), the object is split by the field's first
+    character and the shards are queried concurrently, raising that cap
+    per shard.
+    """
+    print(f"🔍 Searching for duplicates in {sobject}...")
+    print(f"   Matching on: {', '.join(fields)}")
+
+    if not shard_by:
+        query_oneline = build_duplicate_values_query(sobject, fields)
+
+        print(f"\n📋 Query: {query_oneline}\n")
+
+        try:
+            return query_duplicate_values(query_oneline, org_alias)
+
+        except JSON_ERRORS as e:
+            print(f"Error parsing JSON output: {e}")
             return []
 
-    except json.JSONDecodeError as e:
+    queries = [
+        build_duplicate_values_query(sobject, fields, condition)
+        for condition in shard_conditions(shard_by)
+    ]
+
+    print(f"   Sharded by first character of {shard_by} ({len(queries)} queries)")
+    print(f"\n📋 Query: {queries[0]}\n")
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            shards = list(executor.map(lambda q: query_duplicate_values(q, org_alias), queries))
+
+    except JSON_ERRORS as e:
         print(f"Error parsing JSON output: {e}")
         return []
 
+    # Shard-by is a match field, so a group can't span shards; the dict
+    # just guards against overlap before re-ranking across shards
+    match_key = match_key_function(fields)
+    merged = {}
+    for shard in shards:
+        for values in shard:
+            merged.setdefault(match_key(values), values)
 
-def get_duplicate_records(sobject, fields, field_values, org_alias):
-    """Get all records that match the duplicate field values."""
-    print(f"\n📦 Retrieving full details for duplicate records...")
+    return sorted(merged.values(), key=lambda v: v.get('cnt', 0), reverse=True)
+
+
+def soql_literal(value):
+    """Format a field value as a SOQL literal."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped_value = str(value).translate(_SOQL_TRANS)
+    return f"'{escaped_value}'"
 
-    all_duplicates = []
 
+def fold_case(value):
+    """Lower-case strings, leaving other values alone."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def match_key_function(fields):
+    """Return a function giving the key of a record's duplicate group.
+
+    SOQL string comparison and GROUP BY are case-insensitive, so strings
+    are folded to match the way Salesforce grouped them. A field missing
+    from the record (spelled differently, or a relationship path) counts
+    as None rather than failing the run.
+    """
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda record: (fold_case(record.get(field)),)
+    return lambda record: tuple(fold_case(record.get(field)) for field in fields)
+
+
+def field_values_function(fields, default):
+    """Return a function giving a record's values for fields as a tuple.
+
+    A field missing from the record gives default. Built once per run,
+    one for the report and one for the CSV export.
+    """
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda record: (record.get(field, default),)
+    return lambda record: tuple(record.get(field, default) for field in fields)
+
+
+def batch_where_clauses(fields, field_values):
+    """Yield batches of duplicate groups with the WHERE clause matching each.
+
+    A batch closes at GROUPS_PER_QUERY groups, or earlier once the clause's
+    URL-encoded length would pass WHERE_CLAUSE_BUDGET, so long values
+    across several fields can't push the request past the URI limit.
+    """
+    separator = ' OR '
+    separator_length = len(quote(separator))
+    batch, group_conditions, encoded_length = [], [], 0
     for values in field_values:
-        # Build WHERE clause
-        where_conditions = []
-        for field in fields:
-            value = values.get(field)
-            if value:
-                # Escape single quotes
-                escaped_value = str(value).replace("'", "\\'")
-                where_conditions.append(f"{field} = '{escaped_value}'")
-
-        where_clause = ' AND '.join(where_conditions)
-
-        # Query for all records with these field values
+        where_conditions = [
+            f"{field} = {soql_literal(values[field])}"
+            for field in fields if values.get(field) is not None
+        ]
+        condition = '(' + ' AND '.join(where_conditions) + ')'
+        condition_length = len(quote(condition))
+        if batch and (len(batch) == GROUPS_PER_QUERY or
+                      encoded_length + separator_length + condition_length > WHERE_CLAUSE_BUDGET):
+            yield batch, separator.join(group_conditions)
+            batch, group_conditions, encoded_length = [], [], 0
+        if batch:
+            encoded_length += separator_length
+        batch.append(values)
+        group_conditions.append(condition)
+        encoded_length += condition_length
+    if batch:
+        yield batch, separator.join(group_conditions)
+
+
+def iter_duplicate_records(sobject, fields, field_values, org_alias):
+    """Yield duplicate groups with their records, one query batch at a time.
+
+    Groups are yielded in the order they were found as soon as their batch
+    has been fetched, so only one batch of records is held at a time.
+    """
+    print(f"\n📦 Retrieving full details for duplicate records...")
+
+    match_key = match_key_function(fields)
+
+    # One query per batch of groups instead of one per group
+    for batch, where_clause in batch_where_clauses(fields, field_values):
+        # Query for all records with any of these field values
         query = f"""
             SELECT Id, {', '.join(fields)}, CreatedDate, LastModifiedDate
             FROM {sobject}
@@ -125,32 +316,28 @@ def get_duplicate_records(sobject, fields, field_values, org_alias):
 
         query_oneline = ' '.join(query.split())
 
-        cmd = ['sf', 'data', 'query', '-q', query_oneline, '-o', org_alias, '--json']
-        output = run_command(cmd)
-
+        records_by_key = defaultdict(list)
         try:
-            data = json.loads(output)
-            if data.get('result') and data['result'].get('records'):
-                records = data['result']['records']
-
+            for record in run_query(query_oneline, org_alias):
                 # Clean attributes
-                clean_records = []
-                for record in records:
-                    clean_record = {k: v for k, v in record.items() if k != 'attributes'}
-                    clean_records.append(clean_record)
+                record.pop('attributes', None)
+                records_by_key[match_key(record)].append(record)
+
+        except JSON_ERRORS:
+            continue
 
-                # Add duplicate group info
+        # Add duplicate group info
+        for values in batch:
+            clean_records = records_by_key.get(match_key(values))
+            if clean_records:
                 group_info = {
                     'match_values': values,
                     'count': values.get('cnt', len(clean_records)),
                     'records': clean_records
                 }
-                all_duplicates.append(group_info)
-
-        except json.JSONDecodeError:
-            continue
-
-    return all_duplicates
+                # Both the report and the CSV need this; work it out once
+                group_info['master_id'] = recommend_master_record(group_info)
+                yield group_info
 
 
 def recommend_master_record(duplicate_group):
@@ -163,107 +350,118 @@ def recommend_master_record(duplicate_group):
     # Strategy: Prefer oldest record (first created)
     # Secondary: Most recently modified (has most up-to-date data)
 
-    # Sort by CreatedDate (oldest first), then LastModifiedDate (newest first)
-    sorted_records = sorted(
+    # Oldest record by CreatedDate, then LastModifiedDate, is the master.
+    # min() picks it in one pass without sorting the whole group.
+    master = min(
         records,
-        key=lambda r: (r.get('CreatedDate', ''), r.get('LastModifiedDate', '')),
-        reverse=False
+        key=lambda r: (r.get('CreatedDate', ''), r.get('LastModifiedDate', ''))
     )
 
-    # First record is oldest (master)
-    return sorted_records[0]['Id']
+    return master['Id']
 
 
-def format_duplicate_report(sobject, fields, duplicate_groups):
-    """Format duplicate groups for display."""
+def format_report_header(sobject, fields, value_count):
+    """Print the duplicate report header.
+
+    value_count is the number of repeated value combinations the GROUP BY
+    found. The groups actually reported, whose records could be fetched,
+    are counted in the summary.
+    """
     print("\n" + "=" * 70)
     print("🔍 DUPLICATE RECORDS FOUND")
     print("=" * 70)
     print(f"Object: {sobject}")
     print(f"Match Fields: {', '.join(fields)}")
-    print(f"Duplicate Groups: {len(duplicate_groups)}")
+    print(f"Duplicate value combinations: {value_count}")
     print("=" * 70)
 
-    total_records = 0
 
-    for i, group in enumerate(duplicate_groups, 1):
-        match_values = group['match_values']
-        records = group['records']
-        count = len(records)
-        total_records += count
+def format_duplicate_group(i, field_labels, field_values, group):
+    """Print one duplicate group and its records.
+
+    field_labels are the "   Field: " prefixes and field_values the
+    function from field_values_function, both built once per run.
+    """
+    records = group['records']
+    count = len(records)
 
-        print(f"\n📌 Group {i} ({count} records):")
+    lines = []
+    lines.append(f"\n📌 Group {i} ({count} records):")
 
-        # Show match values
-        for field in fields:
-            value = match_values.get(field, 'N/A')
-            print(f"   {field}: {value}")
+    # Show match values
+    for label, value in zip(field_labels, field_values(group['match_values'])):
+        lines.append(f"{label}{value}")
 
-        # Show all records in group
-        master_id = recommend_master_record(group)
+    # Show all records in group
+    master_id = group['master_id']
 
-        for record in records:
-            record_id = record.get('Id', 'N/A')
-            created = record.get('CreatedDate', 'N/A')[:10]  # Just date
-            modified = record.get('LastModifiedDate', 'N/A')[:10]
+    for record in records:
+        record_id = record.get('Id', 'N/A')
+        created = record.get('CreatedDate', 'N/A')[:10]  # Just date
+        modified = record.get('LastModifiedDate', 'N/A')[:10]
 
-            is_master = " [MASTER - Keep this]" if record_id == master_id else " [Duplicate - Merge]"
+        is_master = " [MASTER - Keep this]" if record_id == master_id else " [Duplicate - Merge]"
 
-            print(f"      • {record_id} | Created: {created} | Modified: {modified}{is_master}")
+        lines.append(f"      • {record_id} | Created: {created} | Modified: {modified}{is_master}")
 
+    # Collected and written once rather than a print (and stdout lock) per line
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def format_report_summary(group_count, total_records):
+    """Print the duplicate report summary."""
     print("\n" + "=" * 70)
     print(f"📊 SUMMARY")
     print("=" * 70)
-    print(f"   Total Duplicate Groups: {len(duplicate_groups)}")
+    print(f"   Total Duplicate Groups: {group_count}")
     print(f"   Total Records Affected: {total_records}")
-    print(f"   Records to Merge/Delete: {total_records - len(duplicate_groups)}")
+    print(f"   Records to Merge/Delete: {total_records - group_count}")
     print("=" * 70)
 
 
-def export_to_csv(sobject, fields, duplicate_groups, output_file):
-    """Export duplicate groups to CSV for analysis."""
-    import csv
-
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        # Build fieldnames
-        fieldnames = ['Group', 'IsMaster', 'Id', 'CreatedDate', 'LastModifiedDate'] + fields
+def create_csv_writer(f, fields):
+    """Create the duplicate export CSV writer and write its header."""
+    writer = csv.writer(f)
+    writer.writerow(['Group', 'IsMaster', 'Id', 'CreatedDate', 'LastModifiedDate'] + fields)
+    return writer
 
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for i, group in enumerate(duplicate_groups, 1):
-            match_values = group['match_values']
-            records = group['records']
-            master_id = recommend_master_record(group)
-
-            for record in records:
-                row = {
-                    'Group': i,
-                    'IsMaster': 'Yes' if record['Id'] == master_id else 'No',
-                    'Id': record.get('Id', ''),
-                    'CreatedDate': record.get('CreatedDate', ''),
-                    'LastModifiedDate': record.get('LastModifiedDate', '')
-                }
 
-                # Add match field values
-                for field in fields:
-                    row[field] = record.get(field, '')
+def write_duplicate_group(writer, i, field_values, group):
+    """Write one duplicate group's records as CSV rows.
 
-                writer.writerow(row)
-
-    print(f"\n💾 Exported to: {output_file}")
-    print(f"   Open in Excel/Sheets for review and planning merges")
+    Rows are plain lists in header order, which csv.writer emits without
+    the per-row dict that DictWriter builds and looks up. field_values is
+    the function from field_values_function.
+    """
+    master_id = group['master_id']
+
+    writer.writerows(
+        [
+            i,
+            'Yes' if record['Id'] == master_id else 'No',
+            record.get('Id', ''),
+            record.get('CreatedDate', ''),
+            record.get('LastModifiedDate', ''),
+            *field_values(record)
+        ]
+        for record in group['records']
+    )
 
 
 def main():
     """Main execution."""
     if len(sys.argv) < 4:
-        print("Usage: find_duplicates.py <sobject> \"<field1>,<field2>,...\" <org-alias>")
+        print("Usage: find_duplicates.py <sobject> \"<field1>,<field2>,...\" <org-alias> [--shard-by FIELD]")
         print("")
         print("Examples:")
         print('  ./find_duplicates.py Contact "Email" my-org')
         print('  ./find_duplicates.py Account "Name,BillingCity" dev-sandbox')
         print('  ./find_duplicates.py Custom_Object__c "External_Id__c,Name" production')
+        print('  ./find_duplicates.py Contact "LastName,FirstName" production --shard-by LastName')
+        print("")
+        print("Options:")
+        print("  --shard-by FIELD   Split the search by the first character of FIELD (one of")
+        print("                     the match fields) to find more than 1000 duplicate groups")
         print("")
         sys.exit(1)
 
@@ -274,6 +472,17 @@ def main():
     # Parse fields
     fields = [field.strip() for field in fields_str.split(',')]
 
+    # Parse options
+    shard_by = None
+    if '--shard-by' in sys.argv:
+        idx = sys.argv.index('--shard-by')
+        if idx + 1 < len(sys.argv):
+            shard_by = sys.argv[idx + 1]
+
+        if shard_by not in fields:
+            print("Error: --shard-by must name one of the match fields")
+            sys.exit(1)
+
     print("=" * 70)
     print("🔎 Salesforce Duplicate Finder")
     print("=" * 70)
@@ -283,7 +492,7 @@ def main():
     print("=" * 70)
 
     # Step 1: Find duplicate field values
-    duplicate_field_values = find_duplicate_field_values(sobject, fields, org_alias)
+    duplicate_field_values = find_duplicate_field_values(sobject, fields, org_alias, shard_by)
 
     if not duplicate_field_values:
         print("\n✅ No duplicates found!")
@@ -292,20 +501,41 @@ def main():
 
     print(f"\n✅ Found {len(duplicate_field_values)} duplicate field value combinations")
 
-    # Step 2: Get full records for each duplicate group
-    duplicate_groups = get_duplicate_records(sobject, fields, duplicate_field_values, org_alias)
+    # Step 2: Get full records for each duplicate group. Groups stream in
+    # batch by batch and are reported and exported as they arrive.
+    duplicate_groups = iter_duplicate_records(sobject, fields, duplicate_field_values, org_alias)
+    first_group = next(duplicate_groups, None)
 
-    if not duplicate_groups:
+    if first_group is None:
         print("\n⚠️  Could not retrieve duplicate records")
         sys.exit(1)
 
-    # Step 3: Display results
-    format_duplicate_report(sobject, fields, duplicate_groups)
+    # Step 3: Display results and export to CSV
+    format_report_header(sobject, fields, len(duplicate_field_values))
 
-    # Step 4: Export to CSV
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     output_file = f"./duplicates-{sobject}-{timestamp}.csv"
-    export_to_csv(sobject, fields, duplicate_groups, output_file)
+
+    # Match field lookups and labels are the same for every group
+    report_values = field_values_function(fields, 'N/A')
+    csv_values = field_values_function(fields, '')
+    field_labels = [f"   {field}: " for field in fields]
+
+    group_count = 0
+    total_records = 0
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        writer = create_csv_writer(f, fields)
+
+        for i, group in enumerate(itertools.chain([first_group], duplicate_groups), 1):
+            format_duplicate_group(i, field_labels, report_values, group)
+            write_duplicate_group(writer, i, csv_values, group)
+            group_count += 1
+            total_records += len(group['records'])
+
+    format_report_summary(group_count, total_records)
+
+    print(f"\n💾 Exported to: {output_file}")
+    print(f"   Open in Excel/Sheets for review and planning merges")
 
     # Next steps
     print("\n💡 Next Steps:")
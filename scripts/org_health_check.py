@@ -8,11 +8,18 @@ health score with actionable recommendations.
 Usage:
     ./org_health_check.py my-org
     ./org_health_check.py production --detailed
+    ./org_health_check.py production --no-cache
 
 Requirements:
     - Salesforce CLI (sf) v2.x+ installed
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
+    Optional: simple_salesforce (pip install simple-salesforce) to query over
+              one REST API session instead of a CLI call per request
+
+Environment:
+    SF_CACHE_TTL: seconds CLI results are cached in ~/.cache/sf-skill
+                  (default 60, 0 disables; --no-cache skips it per run)
 
 Safety: READ-ONLY
     Reads org metadata and limits only. No data is modified.
@@ -28,37 +35,107 @@ Features:
 """
 
 import sys
+import os
 import json
+import time
+import hashlib
+import tempfile
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
+
+
+# Output of read-only sf commands is kept on disk briefly, so the health
+# check and limits monitor run back to back (e.g. from cron) share one
+# fetch. SF_CACHE_TTL sets the lifetime in seconds; 0 or --no-cache disables.
+CACHE_DIR = Path.home() / '.cache' / 'sf-skill'
+try:
+    CACHE_TTL = float(os.environ.get('SF_CACHE_TTL', 60))
+except ValueError:
+    CACHE_TTL = 60
+
+
+# Resolved once, so each CLI call skips the PATH search
+_SF = shutil.which('sf') or 'sf'
 
 
-def run_command(cmd_list):
-    """Execute command and return output."""
+def run_command(cmd_list, cache=False):
+    """Execute command and return output.
+
+    With cache=True, output younger than CACHE_TTL seconds is reused from
+    CACHE_DIR. Only cache commands whose output holds no credentials.
+    """
+    cache_file = None
+    if cache and CACHE_TTL > 0:
+        key = hashlib.blake2b(json.dumps(cmd_list).encode(), digest_size=16).hexdigest()
+        cache_file = CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime < CACHE_TTL:
+                return cache_file.read_text(encoding='utf-8')
+        except OSError:
+            pass  # not cached yet
+
     try:
+        # close_fds=False is safe since Python fds are not inheritable
+        # by default, and lets subprocess use its faster spawn path
         result = subprocess.run(
-            cmd_list,
+            [_SF, *cmd_list[1:]] if cmd_list[0] == 'sf' else cmd_list,
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            close_fds=False
         )
-        return result.stdout
     except subprocess.CalledProcessError:
         return None
 
+    if cache_file is not None:
+        # Write to a temporary file and rename, so a concurrent reader
+        # never sees a partly written entry
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(result.stdout)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            pass  # caching is best effort
+
+    return result.stdout
+
+
+def get_api_limits(session):
+    """Fetch org limits over REST in the shape `sf org list limits` returns."""
+    try:
+        limits = session.restful('limits/')
+    except SalesforceError:
+        return None
+
+    return [
+        {'name': name, 'max': info.get('Max', 0), 'remaining': info.get('Remaining', 0)}
+        for name, info in limits.items()
+    ]
+
 
 def get_org_limits(org_alias):
     """Get org limits and usage."""
-    print("  Fetching org limits...")
+    session = get_api_session(org_alias)
+    if session is not None:
+        return get_api_limits(session)
 
     cmd = ['sf', 'org', 'list', 'limits', '-o', org_alias, '--json']
-    output = run_command(cmd)
+    output = run_command(cmd, cache=True)
 
     if not output:
         return None
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
         return data.get('result', [])
     except json.JSONDecodeError:
         return None
@@ -66,53 +143,102 @@ def get_org_limits(org_alias):
 
 def get_apex_test_results(org_alias):
     """Get recent Apex test results."""
-    print("  Checking Apex test coverage...")
-
     cmd = ['sf', 'apex', 'get', 'test', '-o', org_alias, '--code-coverage', '--json']
-    output = run_command(cmd)
+    output = run_command(cmd, cache=True)
 
     if not output:
         return None
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
         return data.get('result', {})
     except json.JSONDecodeError:
         return None
 
 
+def get_api_metadata_counts(session):
+    """Get metadata counts over REST in a single composite request."""
+    base = f'/services/data/v{session.sf_version}'
+    apex_class_query = urlencode({'q': 'SELECT COUNT() FROM ApexClass'})
+    trigger_query = urlencode({'q': "SELECT COUNT() FROM ApexTrigger WHERE Status = 'Active'"})
+    subrequests = {
+        'ApexClass': f"{base}/query?{apex_class_query}",
+        'ApexTrigger': f"{base}/query?{trigger_query}",
+        'CustomObject': f"{base}/sobjects",
+    }
+    body = {
+        'compositeRequest': [
+            {'method': 'GET', 'url': url, 'referenceId': ref}
+            for ref, url in subrequests.items()
+        ]
+    }
+
+    try:
+        response = session.restful('composite', method='POST', json=body)
+    except SalesforceError:
+        return {}
+
+    counts = {}
+    for sub in response.get('compositeResponse', []):
+        if sub.get('httpStatusCode') != 200:
+            continue
+        ref, result = sub['referenceId'], sub['body']
+        if ref == 'CustomObject':
+            counts[ref] = sum(1 for obj in result['sobjects'] if obj['name'].endswith('__c'))
+        else:
+            counts[ref] = result['totalSize']
+
+    # Keep the order the report has always used
+    return {ref: counts[ref] for ref in subrequests if ref in counts}
+
+
+def parse_csv_count(output):
+    """Return the count from `sf data query --result-format csv` output."""
+    return int(output.strip().splitlines()[-1].rsplit(',', 1)[-1])
+
+
 def get_metadata_counts(org_alias):
     """Get counts of various metadata types."""
-    print("  Counting metadata components...")
-
     counts = {}
 
+    session = get_api_session(org_alias)
+    if session is not None:
+        return get_api_metadata_counts(session)
+
+    # The three lookups are independent, so run the CLI calls side by side.
+    # The count queries only need one number, so they ask for CSV output
+    # (a header line and the value) rather than the full JSON envelope.
+    commands = [
+        ['sf', 'data', 'query', '-q', 'SELECT COUNT(Id) cnt FROM ApexClass', '-o', org_alias, '--result-format', 'csv'],
+        ['sf', 'data', 'query', '-q', "SELECT COUNT(Id) cnt FROM ApexTrigger WHERE Status = 'Active'", '-o', org_alias, '--result-format', 'csv'],
+        ['sf', 'sobject', 'list', '-o', org_alias, '--json'],
+    ]
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        class_output, trigger_output, sobject_output = executor.map(
+            lambda cmd: run_command(cmd, cache=True), commands
+        )
+
     # Count Apex classes
-    cmd = ['sf', 'data', 'query', '-q', 'SELECT COUNT(Id) cnt FROM ApexClass', '-o', org_alias, '--json']
-    output = run_command(cmd)
+    output = class_output
     if output:
         try:
-            data = json.loads(output)
-            counts['ApexClass'] = data['result']['records'][0]['cnt']
+            counts['ApexClass'] = parse_csv_count(output)
         except:
             counts['ApexClass'] = 0
 
     # Count Apex triggers
-    cmd = ['sf', 'data', 'query', '-q', "SELECT COUNT(Id) cnt FROM ApexTrigger WHERE Status = 'Active'", '-o', org_alias, '--json']
-    output = run_command(cmd)
+    output = trigger_output
     if output:
         try:
-            data = json.loads(output)
-            counts['ApexTrigger'] = data['result']['records'][0]['cnt']
+            counts['ApexTrigger'] = parse_csv_count(output)
         except:
             counts['ApexTrigger'] = 0
 
     # Count custom objects
-    cmd = ['sf', 'sobject', 'list', '-o', org_alias, '--json']
-    output = run_command(cmd)
+    output = sobject_output
     if output:
         try:
-            data = json.loads(output)
+            data = json_loads(output)
             custom_objects = [obj for obj in data.get('result', []) if obj.endswith('__c')]
             counts['CustomObject'] = len(custom_objects)
         except:
@@ -121,6 +247,17 @@ def get_metadata_counts(org_alias):
     return counts
 
 
+# Issue substring -> recommendation printed when any issue contains it
+ISSUE_RECOMMENDATIONS = (
+    ('API usage', "Review API integrations and optimize callout frequency"),
+    ('Storage', "Archive old records or purchase additional storage"),
+    ('Code coverage', "Write additional Apex tests to increase coverage"),
+    ('failing', "Fix failing tests immediately"),
+    ('Apex class count', "Review and remove unused Apex classes"),
+    ('trigger count', "Consolidate triggers using trigger framework"),
+)
+
+
 def calculate_health_score(limits, test_results, metadata_counts):
     """Calculate overall org health score (0-100)."""
     score = 100
@@ -128,30 +265,34 @@ def calculate_health_score(limits, test_results, metadata_counts):
 
     # Check API limits (deduct up to 20 points)
     if limits:
-        for limit in limits:
-            if 'DailyApiRequests' in limit.get('name', ''):
-                max_val = limit.get('max', 1)
-                remaining = limit.get('remaining', max_val)
-                used_pct = ((max_val - remaining) / max_val) * 100
-
-                if used_pct > 90:
-                    score -= 20
-                    issues.append(f"API usage critical: {used_pct:.1f}%")
-                elif used_pct > 75:
-                    score -= 10
-                    issues.append(f"API usage high: {used_pct:.1f}%")
-
-            if 'DataStorageMB' in limit.get('name', ''):
-                max_val = limit.get('max', 1)
-                remaining = limit.get('remaining', max_val)
-                used_pct = ((max_val - remaining) / max_val) * 100
-
-                if used_pct > 90:
-                    score -= 15
-                    issues.append(f"Storage critical: {used_pct:.1f}%")
-                elif used_pct > 75:
-                    score -= 7
-                    issues.append(f"Storage high: {used_pct:.1f}%")
+        # Index once so each limit of interest is a direct lookup
+        by_name = {limit.get('name', ''): limit for limit in limits}
+
+        daily_api = by_name.get('DailyApiRequests')
+        if daily_api:
+            max_val = daily_api.get('max', 1)
+            remaining = daily_api.get('remaining', max_val)
+            used_pct = ((max_val - remaining) / max_val) * 100
+
+            if used_pct > 90:
+                score -= 20
+                issues.append(f"API usage critical: {used_pct:.1f}%")
+            elif used_pct > 75:
+                score -= 10
+                issues.append(f"API usage high: {used_pct:.1f}%")
+
+        data_storage = by_name.get('DataStorageMB')
+        if data_storage:
+            max_val = data_storage.get('max', 1)
+            remaining = data_storage.get('remaining', max_val)
+            used_pct = ((max_val - remaining) / max_val) * 100
+
+            if used_pct > 90:
+                score -= 15
+                issues.append(f"Storage critical: {used_pct:.1f}%")
+            elif used_pct > 75:
+                score -= 7
+                issues.append(f"Storage high: {used_pct:.1f}%")
 
     # Check code coverage (deduct up to 30 points)
     if test_results:
@@ -188,12 +329,13 @@ def calculate_health_score(limits, test_results, metadata_counts):
 
 def format_report(org_alias, limits, test_results, metadata_counts, score, issues):
     """Format health check report."""
-    print("\n" + "=" * 70)
-    print("🏥 SALESFORCE ORG HEALTH CHECK")
-    print("=" * 70)
-    print(f"Org: {org_alias}")
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 70)
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("🏥 SALESFORCE ORG HEALTH CHECK")
+    lines.append("=" * 70)
+    lines.append(f"Org: {org_alias}")
+    lines.append(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append("=" * 70)
 
     # Health Score
     if score >= 90:
@@ -209,12 +351,12 @@ def format_report(org_alias, limits, test_results, metadata_counts, score, issue
         status = "❌ POOR"
         color = "red"
 
-    print(f"\n🎯 Health Score: {score}/100 {status}")
+    lines.append(f"\n🎯 Health Score: {score}/100 {status}")
 
     # Key Limits
     if limits:
-        print("\n📊 Key Limits:")
-        print("-" * 70)
+        lines.append("\n📊 Key Limits:")
+        lines.append("-" * 70)
 
         for limit in limits[:10]:  # Show top 10 limits
             name = limit.get('name', 'Unknown')
@@ -224,12 +366,12 @@ def format_report(org_alias, limits, test_results, metadata_counts, score, issue
             used_pct = (used / max_val * 100) if max_val > 0 else 0
 
             status_icon = "✅" if used_pct < 50 else "⚠️ " if used_pct < 75 else "❌"
-            print(f"  {status_icon} {name}: {used:,} / {max_val:,} ({used_pct:.1f}%)")
+            lines.append(f"  {status_icon} {name}: {used:,} / {max_val:,} ({used_pct:.1f}%)")
 
     # Code Coverage
     if test_results:
-        print("\n🧪 Code Coverage:")
-        print("-" * 70)
+        lines.append("\n🧪 Code Coverage:")
+        lines.append("-" * 70)
 
         summary = test_results.get('summary', {})
         coverage = summary.get('orgWideCoverage', 'N/A')
@@ -237,69 +379,89 @@ def format_report(org_alias, limits, test_results, metadata_counts, score, issue
         failing = summary.get('failing', 0)
         total = passing + failing
 
-        print(f"  Coverage: {coverage}")
-        print(f"  Tests: {passing}/{total} passing")
+        lines.append(f"  Coverage: {coverage}")
+        lines.append(f"  Tests: {passing}/{total} passing")
 
         if failing > 0:
-            print(f"  ❌ {failing} test(s) failing")
+            lines.append(f"  ❌ {failing} test(s) failing")
 
     # Metadata Counts
     if metadata_counts:
-        print("\n📦 Metadata:")
-        print("-" * 70)
+        lines.append("\n📦 Metadata:")
+        lines.append("-" * 70)
 
         for metadata_type, count in metadata_counts.items():
-            print(f"  {metadata_type}: {count}")
+            lines.append(f"  {metadata_type}: {count}")
 
     # Issues
     if issues:
-        print("\n⚠️  Issues Found:")
-        print("-" * 70)
+        lines.append("\n⚠️  Issues Found:")
+        lines.append("-" * 70)
         for i, issue in enumerate(issues, 1):
-            print(f"  {i}. {issue}")
+            lines.append(f"  {i}. {issue}")
 
     # Recommendations
-    print("\n💡 Recommendations:")
-    print("-" * 70)
+    lines.append("\n💡 Recommendations:")
+    lines.append("-" * 70)
 
     if score >= 90:
-        print("  ✅ Org is in excellent health. Keep monitoring regularly.")
+        lines.append("  ✅ Org is in excellent health. Keep monitoring regularly.")
     else:
-        if any('API usage' in issue for issue in issues):
-            print("  • Review API integrations and optimize callout frequency")
-        if any('Storage' in issue for issue in issues):
-            print("  • Archive old records or purchase additional storage")
-        if any('Code coverage' in issue for issue in issues):
-            print("  • Write additional Apex tests to increase coverage")
-        if any('failing' in issue for issue in issues):
-            print("  • Fix failing tests immediately")
-        if any('Apex class count' in issue for issue in issues):
-            print("  • Review and remove unused Apex classes")
-        if any('trigger count' in issue for issue in issues):
-            print("  • Consolidate triggers using trigger framework")
-
-    print("=" * 70)
+        # Categorize the issues in a single pass, then print each
+        # matching recommendation once, in table order
+        flagged = {
+            marker
+            for issue in issues
+            for marker, _ in ISSUE_RECOMMENDATIONS
+            if marker in issue
+        }
+        for marker, recommendation in ISSUE_RECOMMENDATIONS:
+            if marker in flagged:
+                lines.append(f"  • {recommendation}")
+
+    lines.append("=" * 70)
+
+    # Collected and written once rather than a print (and stdout lock) per line
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
     """Main execution."""
     if len(sys.argv) < 2:
-        print("Usage: org_health_check.py <org-alias>")
+        print("Usage: org_health_check.py <org-alias> [--no-cache]")
         print("")
         print("Examples:")
         print("  ./org_health_check.py my-org")
         print("  ./org_health_check.py production")
         print("")
+        print("Options:")
+        print("  --no-cache   Always query the org; ignore results cached by earlier runs")
+        print("")
         sys.exit(1)
 
     org_alias = sys.argv[1]
 
+    if '--no-cache' in sys.argv:
+        global CACHE_TTL
+        CACHE_TTL = 0
+
     print(f"🔍 Running health check on {org_alias}...\n")
 
-    # Gather data
-    limits = get_org_limits(org_alias)
-    test_results = get_apex_test_results(org_alias)
-    metadata_counts = get_metadata_counts(org_alias)
+    # Gather data. The three sources don't depend on each other, so fetch
+    # them concurrently; the check takes as long as the slowest one.
+    # Progress is printed up front so worker output can't interleave.
+    print("  Fetching org limits...")
+    print("  Checking Apex test coverage...")
+    print("  Counting metadata components...")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        limits_future = executor.submit(get_org_limits, org_alias)
+        tests_future = executor.submit(get_apex_test_results, org_alias)
+        counts_future = executor.submit(get_metadata_counts, org_alias)
+
+    limits = limits_future.result()
+    test_results = tests_future.result()
+    metadata_counts = counts_future.result()
 
     # Calculate health score
     score, issues = calculate_health_score(limits, test_results, metadata_counts)
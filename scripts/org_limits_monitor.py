@@ -8,11 +8,18 @@ for continuous monitoring.
 Usage:
     ./org_limits_monitor.py my-org
     ./org_limits_monitor.py production --alert-threshold 80
+    ./org_limits_monitor.py production --no-cache
 
 Requirements:
     - Salesforce CLI (sf) v2.x+ installed
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
+    Optional: simple_salesforce (pip install simple-salesforce) to query over
+              one REST API session instead of a CLI call per request
+
+Environment:
+    SF_CACHE_TTL: seconds CLI results are cached in ~/.cache/sf-skill
+                  (default 60, 0 disables; --no-cache skips it per run)
 
 Safety: READ-ONLY
     Reads org limits only. No data is modified.
@@ -25,35 +32,111 @@ Features:
 """
 
 import sys
+import os
 import json
+import time
+import hashlib
+import tempfile
+import shutil
 import subprocess
 from datetime import datetime
+from pathlib import Path
+
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
+
+# Optional: orjson also serializes the saved limits history several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Output of read-only sf commands is kept on disk briefly, so the health
+# check and limits monitor run back to back (e.g. from cron) share one
+# fetch. SF_CACHE_TTL sets the lifetime in seconds; 0 or --no-cache disables.
+CACHE_DIR = Path.home() / '.cache' / 'sf-skill'
+try:
+    CACHE_TTL = float(os.environ.get('SF_CACHE_TTL', 60))
+except ValueError:
+    CACHE_TTL = 60
+
 
+# Resolved once, so each CLI call skips the PATH search
+_SF = shutil.which('sf') or 'sf'
+
+
+def run_command(cmd_list, cache=False):
+    """Execute command and return output.
+
+    With cache=True, output younger than CACHE_TTL seconds is reused from
+    CACHE_DIR. Only cache commands whose output holds no credentials.
+    """
+    cache_file = None
+    if cache and CACHE_TTL > 0:
+        key = hashlib.blake2b(json.dumps(cmd_list).encode(), digest_size=16).hexdigest()
+        cache_file = CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime < CACHE_TTL:
+                return cache_file.read_text(encoding='utf-8')
+        except OSError:
+            pass  # not cached yet
 
-def run_command(cmd_list):
-    """Execute command and return output."""
     try:
+        # close_fds=False is safe since Python fds are not inheritable
+        # by default, and lets subprocess use its faster spawn path
         result = subprocess.run(
-            cmd_list,
+            [_SF, *cmd_list[1:]] if cmd_list[0] == 'sf' else cmd_list,
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            close_fds=False
         )
-        return result.stdout
     except subprocess.CalledProcessError:
         return None
 
+    if cache_file is not None:
+        # Write to a temporary file and rename, so a concurrent reader
+        # never sees a partly written entry
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(result.stdout)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            pass  # caching is best effort
+
+    return result.stdout
+
+
+def get_api_limits(session):
+    """Fetch org limits over REST in the shape `sf org list limits` returns."""
+    try:
+        limits = session.restful('limits/')
+    except SalesforceError:
+        return None
+
+    return [
+        {'name': name, 'max': info.get('Max', 0), 'remaining': info.get('Remaining', 0)}
+        for name, info in limits.items()
+    ]
+
 
 def get_org_limits(org_alias):
     """Get all org limits and usage."""
+    session = get_api_session(org_alias)
+    if session is not None:
+        return get_api_limits(session)
+
     cmd = ['sf', 'org', 'list', 'limits', '-o', org_alias, '--json']
-    output = run_command(cmd)
+    output = run_command(cmd, cache=True)
 
     if not output:
         return None
 
     try:
-        data = json.loads(output)
+        data = json_loads(output)
         return data.get('result', [])
     except json.JSONDecodeError:
         return None
@@ -96,43 +179,44 @@ def analyze_limits(limits, threshold=80):
 
 def format_report(org_alias, critical, warning, ok, threshold):
     """Format monitoring report."""
-    print("=" * 70)
-    print("📊 SALESFORCE ORG LIMITS MONITOR")
-    print("=" * 70)
-    print(f"Org: {org_alias}")
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Alert Threshold: {threshold}%")
-    print("=" * 70)
+    lines = []
+    lines.append("=" * 70)
+    lines.append("📊 SALESFORCE ORG LIMITS MONITOR")
+    lines.append("=" * 70)
+    lines.append(f"Org: {org_alias}")
+    lines.append(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append(f"Alert Threshold: {threshold}%")
+    lines.append("=" * 70)
 
     # Critical Limits
     if critical:
-        print(f"\n🚨 CRITICAL LIMITS ({len(critical)}):")
-        print("-" * 70)
+        lines.append(f"\n🚨 CRITICAL LIMITS ({len(critical)}):")
+        lines.append("-" * 70)
         for limit in critical:
-            print(f"  ❌ {limit['name']}")
-            print(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
-            print(f"     Remaining: {limit['remaining']:,}")
+            lines.append(f"  ❌ {limit['name']}")
+            lines.append(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
+            lines.append(f"     Remaining: {limit['remaining']:,}")
 
     # Warning Limits
     if warning:
-        print(f"\n⚠️  WARNING LIMITS ({len(warning)}):")
-        print("-" * 70)
+        lines.append(f"\n⚠️  WARNING LIMITS ({len(warning)}):")
+        lines.append("-" * 70)
         for limit in warning:
-            print(f"  ⚠️  {limit['name']}")
-            print(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
-            print(f"     Remaining: {limit['remaining']:,}")
+            lines.append(f"  ⚠️  {limit['name']}")
+            lines.append(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
+            lines.append(f"     Remaining: {limit['remaining']:,}")
 
     # Summary
-    print(f"\n📈 SUMMARY:")
-    print("-" * 70)
-    print(f"  Critical: {len(critical)}")
-    print(f"  Warning: {len(warning)}")
-    print(f"  OK: {len(ok)}")
-    print(f"  Total: {len(critical) + len(warning) + len(ok)}")
+    lines.append(f"\n📈 SUMMARY:")
+    lines.append("-" * 70)
+    lines.append(f"  Critical: {len(critical)}")
+    lines.append(f"  Warning: {len(warning)}")
+    lines.append(f"  OK: {len(ok)}")
+    lines.append(f"  Total: {len(critical) + len(warning) + len(ok)}")
 
     # Key Limits Always Shown
-    print(f"\n🔑 KEY LIMITS:")
-    print("-" * 70)
+    lines.append(f"\n🔑 KEY LIMITS:")
+    lines.append("-" * 70)
 
     key_limit_names = [
         'DailyApiRequests',
@@ -141,36 +225,50 @@ def format_report(org_alias, critical, warning, ok, threshold):
         'FileStorageMB'
     ]
 
-    all_limits = critical + warning + ok
+    # Index by name once; each key limit is then a direct lookup
+    by_name = {l['name']: l for l in critical + warning + ok}
 
     for key_name in key_limit_names:
-        matching = [l for l in all_limits if key_name in l['name']]
-        if matching:
-            limit = matching[0]
+        limit = by_name.get(key_name)
+        if limit:
             status = "❌" if limit['used_pct'] >= 90 else "⚠️ " if limit['used_pct'] >= threshold else "✅"
-            print(f"  {status} {limit['name']}")
-            print(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
+            lines.append(f"  {status} {limit['name']}")
+            lines.append(f"     {limit['used']:,} / {limit['max']:,} ({limit['used_pct']:.1f}%)")
 
     # Recommendations
     if critical or warning:
-        print(f"\n💡 RECOMMENDATIONS:")
-        print("-" * 70)
-
-        if any('API' in l['name'] for l in critical + warning):
-            print("  • Review API integrations and reduce callout frequency")
-            print("  • Implement caching to reduce API calls")
-            print("  • Use bulk API instead of REST API where possible")
-
-        if any('Storage' in l['name'] for l in critical + warning):
-            print("  • Archive old records")
-            print("  • Remove unused files and attachments")
-            print("  • Consider purchasing additional storage")
-
-        if any('Async' in l['name'] for l in critical + warning):
-            print("  • Reduce frequency of batch/scheduled jobs")
-            print("  • Optimize batch sizes")
-
-    print("=" * 70)
+        lines.append(f"\n💡 RECOMMENDATIONS:")
+        lines.append("-" * 70)
+
+        # Flag each limit category in one pass over the flagged limits
+        flagged = set()
+        for l in critical + warning:
+            name = l['name']
+            if 'API' in name:
+                flagged.add('api')
+            if 'Storage' in name:
+                flagged.add('storage')
+            if 'Async' in name:
+                flagged.add('async')
+
+        if 'api' in flagged:
+            lines.append("  • Review API integrations and reduce callout frequency")
+            lines.append("  • Implement caching to reduce API calls")
+            lines.append("  • Use bulk API instead of REST API where possible")
+
+        if 'storage' in flagged:
+            lines.append("  • Archive old records")
+            lines.append("  • Remove unused files and attachments")
+            lines.append("  • Consider purchasing additional storage")
+
+        if 'async' in flagged:
+            lines.append("  • Reduce frequency of batch/scheduled jobs")
+            lines.append("  • Optimize batch sizes")
+
+    lines.append("=" * 70)
+
+    # Collected and written once rather than a print (and stdout lock) per line
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     # Return status code
     if critical:
@@ -192,8 +290,12 @@ def export_limits_history(org_alias, limits):
         'limits': limits
     }
 
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
 
     print(f"\n💾 Exported limits history to: {filename}")
 
@@ -201,7 +303,7 @@ def export_limits_history(org_alias, limits):
 def main():
     """Main execution."""
     if len(sys.argv) < 2:
-        print("Usage: org_limits_monitor.py <org-alias> [--alert-threshold N]")
+        print("Usage: org_limits_monitor.py <org-alias> [--alert-threshold N] [--no-cache]")
         print("")
         print("Monitor Salesforce org limits and send alerts.")
         print("")
@@ -212,6 +314,7 @@ def main():
         print("Options:")
         print("  --alert-threshold N   Alert when usage exceeds N% (default: 80)")
         print("  --export              Export limits history to JSON file")
+        print("  --no-cache            Always query the org; ignore results cached by earlier runs")
         print("")
         sys.exit(1)
 
@@ -228,6 +331,10 @@ def main():
     if '--export' in sys.argv:
         export = True
 
+    if '--no-cache' in sys.argv:
+        global CACHE_TTL
+        CACHE_TTL = 0
+
     print(f"🔍 Monitoring limits for {org_alias}...\n")
 
     # Get limits
@@ -8,11 +8,37 @@ for improving query performance based on best practices.
 Usage:
     ./profile_soql.py "SELECT Id, Name FROM Account" my-org
     ./profile_soql.py "SELECT Id FROM Contact WHERE Email = 'test@example.com'" dev-sandbox
+    ./profile_soql.py "SELECT Id FROM Account WHERE Name = 'Acme'" my-org --no-cache
+    ./profile_soql.py "SELECT Id FROM Contact WHERE Email = 'a@b.com'" my-org --exact
+    ./profile_soql.py --input-file queries.txt my-org --concurrency 3
+    ./profile_soql.py "SELECT Id FROM Account WHERE Name = 'Acme'" my-org --warm
 
 Requirements:
     - Salesforce CLI (sf) v2.x+ installed
     - Python 3.8+
     - Authenticated Salesforce org via: sf org login web -a <org-alias>
+    Optional: ijson (pip install ijson) to parse large query results incrementally
+    Optional: simple_salesforce (pip install simple-salesforce) to query over
+              one REST API session instead of a CLI call per query, and
+              to read the optimizer's query plan
+
+Timing:
+    Through the sf CLI, execution time is wall clock time and includes the
+    CLI's startup. Over a simple_salesforce session it is the org's
+    response time for each page of results, with transfer and parsing
+    shown separately. --warm runs the query once untimed first, so the
+    timed run reflects warm server caches.
+
+Batch mode:
+    --input-file profiles each query in a file (one per line; blank lines
+    and # comments are skipped), --concurrency at a time (default 5).
+    Each profile is printed as it completes, then a table of all of them
+    ranked by execution time. Exits 1 if any query failed.
+
+Caching:
+    Each object's total record count (used for selectivity) is cached in
+    ~/.cache/sf-skill for 5 minutes, and its indexed fields (read from the
+    org's describe) for a day. Pass --no-cache to always refetch both.
 
 Safety: READ-ONLY
     Executes SELECT queries only. No data is modified.
@@ -23,77 +49,259 @@ Features:
     - Checks for common anti-patterns
     - Provides optimization recommendations
     - Estimates query selectivity
+    - Shows the optimizer's query plan (REST session only)
 """
 
 import sys
+import os
 import json
+import hashlib
+import io
 import subprocess
+import tempfile
 import time
 import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+# Shared with the other org scripts; lives next to this script
+from sf_api import SalesforceError, get_api_session, json_loads
+
+# Optional: ijson parses query results incrementally from the CLI's stdout
+try:
+    import ijson
+    JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (json.JSONDecodeError,)
+
+# Records kept for the sample shown after the report; larger results
+# are only counted
+SAMPLE_RECORDS = 5
+
+# Indexed on every object that has them; used when the org's describe
+# isn't available
+STANDARD_INDEXED_FIELDS = (
+    'Id', 'Name', 'RecordTypeId', 'OwnerId', 'CreatedDate',
+    'SystemModstamp', 'LastModifiedDate'
+)
+
+# Total record counts (for selectivity) rarely change minute to minute,
+# while COUNT() over a large object is slow, so they are reused across
+# runs for COUNT_CACHE_TTL seconds. An object's indexed fields change
+# with deployments only and are kept a day. --no-cache disables both.
+CACHE_DIR = Path.home() / '.cache' / 'sf-skill'
+COUNT_CACHE_TTL = 300
+INDEX_CACHE_TTL = 24 * 60 * 60
+
+# Queries profiled at once in --input-file mode unless --concurrency says
+# otherwise. Each profile makes up to four requests of its own.
+BATCH_CONCURRENCY = 5
+
+# Compiled once at import rather than looked up in re's cache per call
+LEADING_WILDCARD_RE = re.compile(r"LIKE\s+'%", re.IGNORECASE)
+DATE_FUNCTION_RE = re.compile(r'(YEAR|MONTH|DAY|HOUR)\(', re.IGNORECASE)
+NOT_EQUALS_RE = re.compile(r'(!=|<>)')
+OR_WORD_RE = re.compile(r'\bOR\b', re.IGNORECASE)
+
+# Equality filter on the queried object's own Id, which identifies one
+# record. A relationship path (Owner.Id, Account.Id) can match many, and
+# Email is not unique on Contact or Lead.
+UNIQUE_MATCH_RE = re.compile(r"(?<![\w.])Id\s*=\s*'[A-Za-z0-9]{15,18}'", re.IGNORECASE)
+
+# Identifiers in a WHERE clause, skipping over string literals
+WHERE_NAME_RE = re.compile(r"'(?:[^'\\]|\\.)*'|(\w+)")
+
+# Tokens parse_soql walks: string literals (skipped), parentheses (so
+# subquery clauses are ignored) and the keywords that start a clause
+SOQL_TOKEN_RE = re.compile(
+    r"'(?:[^'\\]|\\.)*'|(?P<open>\()|(?P<close>\))"
+    r"|\b(?P<keyword>SELECT|FROM|WHERE|WITH|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|OFFSET|FOR)\b",
+    re.IGNORECASE
+)
+SOBJECT_RE = re.compile(r'\w+')
+
+# Top-level clauses of a query; a clause the query doesn't have is None
+SoqlParts = namedtuple('SoqlParts', ['select', 'sobject', 'where', 'order_by', 'limit'])
 
 
 def run_command(cmd_list):
-    """Execute command and return output."""
+    """Execute command and return its stdout as bytes.
+
+    Output is only ever parsed as JSON, which takes bytes directly, so
+    it isn't decoded to a str first.
+    """
     try:
         result = subprocess.run(
             cmd_list,
             capture_output=True,
-            text=True,
             check=True
         )
         return result.stdout
     except subprocess.CalledProcessError as e:
         print(f"Error executing command: {' '.join(cmd_list)}")
-        print(f"Error: {e.stderr}")
+        print(f"Error: {e.stderr.decode('utf-8', 'replace')}")
         sys.exit(1)
 
 
-def execute_query_with_timing(query, org_alias):
-    """Execute SOQL query and measure execution time."""
-    print(f"⏱️  Executing query...")
-
-    start_time = time.time()
+def execute_query_with_timing(query, org_alias, warm=False, out=None):
+    """Execute SOQL query and measure execution time, or return None on failure.
 
-    cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
-    output = run_command(cmd)
+    Records are counted as they are parsed and only the first
+    SAMPLE_RECORDS are kept, since the report shows no more than that.
 
-    end_time = time.time()
-    execution_time_ms = int((end_time - start_time) * 1000)
+    Over a REST session, execution_time_ms is the org's response time:
+    the time to each page's response headers, summed. Transfer and
+    parsing time only appear in wall_time_ms. Through the sf CLI the two
+    are the same wall clock time, CLI startup included. With warm, the
+    query runs once untimed first, so the timed run hits warm caches.
+    Errors are printed to out (default stdout).
+    """
+    if warm and execute_query_with_timing(query, org_alias, out=out) is None:
+        return None
 
-    try:
-        data = json.loads(output)
-        if data.get('result') and data['result'].get('records'):
-            records = data['result']['records']
-            record_count = len(records)
-        else:
-            records = []
-            record_count = 0
+    record_count = 0
+    samples = []
+
+    # Set up the session first so its `sf org display` isn't timed
+    session = get_api_session(org_alias)
+    if session is not None:
+        start_time = time.time()
+        server_time = 0.0
+        url = f"{session.base_url}query/"
+        params = {'q': query}
+        try:
+            # Paged by hand, as query_all_iter does, to read each
+            # response's elapsed time. The requests session and headers
+            # are public attributes; _call_salesforce would do the same
+            # but isn't part of simple_salesforce's API.
+            while url:
+                response = session.session.get(url, headers=session.headers, params=params)
+                if response.status_code >= 300:
+                    raise SalesforceError(url, response.status_code, 'query', response.text)
+                server_time += response.elapsed.total_seconds()
+                data = response.json()
+                for record in data.get('records', []):
+                    record_count += 1
+                    if record_count <= SAMPLE_RECORDS:
+                        samples.append(record)
+                next_url = data.get('nextRecordsUrl')
+                url = f"https://{session.sf_instance}{next_url}" if next_url else None
+                params = None
+        except SalesforceError as e:
+            print(f"Error: Salesforce API request failed: {e}", file=out)
+            return None
+        wall_time_ms = int((time.time() - start_time) * 1000)
 
         return {
-            'execution_time_ms': execution_time_ms,
+            'execution_time_ms': int(server_time * 1000),
+            'wall_time_ms': wall_time_ms,
+            'server_timing': True,
             'record_count': record_count,
-            'records': records
+            'records': samples
         }
 
-    except json.JSONDecodeError:
-        print("Error: Could not parse query results")
-        return None
+    start_time = time.time()
+
+    cmd = ['sf', 'data', 'query', '-q', query, '-o', org_alias, '--json']
 
+    # Read the CLI's stdout through a pipe rather than capturing it, so a
+    # large result is never held whole; stderr goes to a file so a chatty
+    # CLI can't fill its pipe and block
+    with tempfile.TemporaryFile(mode='w+') as stderr, \
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr) as proc:
+        parse_failed = False
+        try:
+            if ijson is not None:
+                records = ijson.items(proc.stdout, 'result.records.item', use_float=True)
+            else:
+                data = json_loads(proc.stdout.read())
+                records = (data.get('result') or {}).get('records') or []
+
+            for record in records:
+                record_count += 1
+                if record_count <= SAMPLE_RECORDS:
+                    samples.append(record)
+        except JSON_ERRORS:
+            parse_failed = True
+
+        proc.stdout.read()  # drain anything unparsed so the CLI can exit
+        returncode = proc.wait()
+
+        end_time = time.time()
+        execution_time_ms = int((end_time - start_time) * 1000)
+
+        if returncode != 0:
+            stderr.seek(0)
+            print(f"Error executing command: {' '.join(cmd)}", file=out)
+            print(f"Error: {stderr.read()}", file=out)
+            return None
+
+    if parse_failed:
+        print("Error: Could not parse query results", file=out)
+        return None
 
-def analyze_query_structure(query):
+    return {
+        'execution_time_ms': execution_time_ms,
+        'wall_time_ms': execution_time_ms,
+        'server_timing': False,
+        'record_count': record_count,
+        'records': samples
+    }
+
+
+def parse_soql(query):
+    """Split a query into its top-level clauses in one pass.
+
+    Keywords inside parentheses or string literals are skipped, so a
+    subquery's FROM or WHERE is never taken for the outer query's.
+    """
+    clauses = {}
+    depth = 0
+    keyword = None
+    start = 0
+    for token in SOQL_TOKEN_RE.finditer(query):
+        kind = token.lastgroup  # None for a string literal
+        if kind == 'open':
+            depth += 1
+        elif kind == 'close':
+            depth = max(depth - 1, 0)
+        elif kind and not depth:
+            if keyword:
+                clauses.setdefault(keyword, query[start:token.start()].strip())
+            keyword = ' '.join(token.group(kind).upper().split())
+            start = token.end()
+    if keyword:
+        clauses.setdefault(keyword, query[start:].strip())
+
+    sobject = SOBJECT_RE.match(clauses.get('FROM', ''))
+    return SoqlParts(
+        select=clauses.get('SELECT'),
+        sobject=sobject.group() if sobject else None,
+        where=clauses.get('WHERE'),
+        order_by=clauses.get('ORDER BY'),
+        limit=clauses.get('LIMIT'),
+    )
+
+
+def analyze_query_structure(query, parts):
     """Analyze query structure and identify potential issues."""
     issues = []
     recommendations = []
 
+    # Plain keyword checks are substring tests on one upper-cased copy,
+    # which beat a case-insensitive regex search per keyword
     query_upper = query.upper()
 
     # Check for LIMIT clause
-    if 'LIMIT' not in query_upper:
+    if parts.limit is None:
         issues.append("❌ Missing LIMIT clause")
         recommendations.append("Add LIMIT clause to prevent runaway queries (e.g., LIMIT 1000)")
 
     # Check for leading wildcard in LIKE
-    if re.search(r"LIKE\s+'%", query, re.IGNORECASE):
+    if LEADING_WILDCARD_RE.search(query):
         issues.append("❌ Leading wildcard in LIKE clause")
         recommendations.append("Use trailing wildcard (Name LIKE 'Acme%') instead of leading wildcard (Name LIKE '%Corp') for better index usage")
 
@@ -103,12 +311,12 @@ def analyze_query_structure(query):
         recommendations.append("Select only needed fields to reduce heap usage and improve performance")
 
     # Check for functions on indexed fields in WHERE
-    if re.search(r'WHERE.*?(YEAR|MONTH|DAY|HOUR)\(', query, re.IGNORECASE):
+    if parts.where and DATE_FUNCTION_RE.search(parts.where):
         issues.append("⚠️  Date function in WHERE clause may prevent index usage")
         recommendations.append("Use date literals instead: WHERE CreatedDate = THIS_YEAR instead of WHERE YEAR(CreatedDate) = 2024")
 
     # Check for != or <> (not equals)
-    if re.search(r'(!=|<>)', query):
+    if NOT_EQUALS_RE.search(query):
         issues.append("⚠️  Using != or <> in WHERE clause")
         recommendations.append("Consider using positive filters when possible (= instead of !=) for better index usage")
 
@@ -129,63 +337,215 @@ def analyze_query_structure(query):
     return issues, recommendations
 
 
-def estimate_selectivity(query, org_alias, record_count):
-    """Estimate query selectivity (what % of total records is returned)."""
-    # Extract object name from query
-    match = re.search(r'FROM\s+(\w+)', query, re.IGNORECASE)
-    if not match:
+def cache_file(kind, sobject, org_alias):
+    """Return the disk cache file for one kind of per-object metadata."""
+    key = hashlib.blake2b(f"{org_alias}\0{sobject.lower()}".encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{kind}-{key}.json"
+
+
+def read_cache(path, ttl):
+    """Return the value cached at path if younger than ttl seconds, else None."""
+    if ttl <= 0:
         return None
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return json.loads(path.read_text(encoding='utf-8'))['value']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # not cached yet, or unreadable
+    return None
+
+
+def write_cache(path, value):
+    """Cache value at path; caching is best effort."""
+    # Write to a temporary file and rename, so a concurrent reader
+    # never sees a partly written entry
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'value': value}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
 
-    sobject = match.group(1)
+@lru_cache(maxsize=None)
+def get_total_count(sobject, org_alias):
+    """Return the total record count for an object, or None.
 
-    # Get total record count for object
-    count_query = f"SELECT COUNT(Id) cnt FROM {sobject}"
+    Counts younger than COUNT_CACHE_TTL seconds are read from CACHE_DIR;
+    fresh counts are written back for later runs.
+    """
+    path = cache_file('count', sobject, org_alias)
+    total_count = read_cache(path, COUNT_CACHE_TTL)
+    if total_count is not None:
+        return total_count
+
+    # Plain COUNT() returns only totalSize, with no aggregate row to build
+    count_query = f"SELECT COUNT() FROM {sobject}"
     cmd = ['sf', 'data', 'query', '-q', count_query, '-o', org_alias, '--json']
+    session = get_api_session(org_alias)
 
     try:
-        output = run_command(cmd)
-        data = json.loads(output)
-        total_count = data['result']['records'][0]['cnt']
-
-        if total_count > 0:
-            selectivity_pct = (record_count / total_count) * 100
-            return {
-                'total_records': total_count,
-                'filtered_records': record_count,
-                'selectivity_pct': selectivity_pct
-            }
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError, IndexError):
-        pass
+        if session is not None:
+            try:
+                data = {'result': session.query(count_query)}
+            except SalesforceError:
+                return None
+        else:
+            # Not run_command: a failed count (an unknown object, missing
+            # permissions) only fails this query, not a whole batch
+            result = subprocess.run(cmd, capture_output=True)
+            if result.returncode != 0:
+                return None
+            data = json_loads(result.stdout)
+        total_count = data['result']['totalSize']
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
 
-    return None
+    if COUNT_CACHE_TTL > 0:
+        write_cache(path, total_count)
+    return total_count
 
 
-def check_indexed_fields(query):
-    """Check if query uses indexed fields in WHERE clause."""
-    indexed_fields = [
-        'Id', 'Name', 'RecordTypeId', 'OwnerId', 'CreatedDate',
-        'SystemModstamp', 'LastModifiedDate'
+def get_query_plan(query, org_alias):
+    """Return the optimizer's chosen plan for a query, or None.
+
+    The REST API's explain parameter returns the plans the optimizer
+    considered, cheapest first, without running the query. It needs a
+    REST session; the sf CLI has no equivalent.
+    """
+    session = get_api_session(org_alias)
+    if session is None:
+        return None
+
+    try:
+        plans = session.restful('query', params={'explain': query})['plans']
+    except (SalesforceError, KeyError, TypeError):
+        return None
+    return plans[0] if plans else None
+
+
+def describe_fields(sobject, org_alias):
+    """Return the field describes for an object, or None if unavailable."""
+    session = get_api_session(org_alias)
+    if session is not None:
+        try:
+            return session.restful(f'sobjects/{sobject}/describe')['fields']
+        except (SalesforceError, KeyError):
+            return None
+
+    # Not run_command: without a describe the standard list still works,
+    # so a failure here shouldn't end the profile
+    cmd = ['sf', 'sobject', 'describe', '-s', sobject, '-o', org_alias, '--json']
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        return None
+
+    try:
+        return json_loads(result.stdout)['result']['fields']
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_indexed_fields(sobject, org_alias):
+    """Return the names of the object's indexed fields in this org.
+
+    The standard indexed fields the object has come first, then its
+    lookups, external IDs and unique fields from the org's describe.
+    Results are cached in CACHE_DIR for INDEX_CACHE_TTL seconds. If the
+    describe fails, STANDARD_INDEXED_FIELDS is used as is.
+    """
+    path = cache_file('indexed', sobject, org_alias)
+    indexed = read_cache(path, INDEX_CACHE_TTL)
+    if indexed is not None:
+        return tuple(indexed)
+
+    fields = describe_fields(sobject, org_alias)
+    if fields is None:
+        return STANDARD_INDEXED_FIELDS
+
+    names = {field['name'] for field in fields}
+    indexed = [name for name in STANDARD_INDEXED_FIELDS if name in names]
+    indexed += [
+        field['name'] for field in fields
+        if field['name'] not in indexed
+        and (field.get('type') == 'reference' or field.get('externalId') or field.get('unique'))
     ]
 
-    query_upper = query.upper()
+    if INDEX_CACHE_TTL > 0:
+        write_cache(path, indexed)
+    return tuple(indexed)
+
+
+def heuristic_selectivity(parts):
+    """Return a selectivity estimate the filter alone settles, else None.
+
+    With no WHERE clause every record qualifies, and an equality match on
+    the object's own Id (with no OR) selects one. Either way the exact
+    COUNT() over the whole object can be skipped.
+    """
+    where_clause = parts.where
+    if not where_clause:
+        return {'estimate': "no WHERE clause, every record qualifies", 'selectivity_pct': 100.0}
+
+    if UNIQUE_MATCH_RE.search(where_clause) and not OR_WORD_RE.search(where_clause):
+        return {'estimate': "equality filter on Id", 'selectivity_pct': 0.01}
+
+    return None
+
 
-    # Extract WHERE clause
-    where_match = re.search(r'WHERE\s+(.+?)(?:ORDER BY|GROUP BY|LIMIT|$)', query_upper, re.IGNORECASE)
+def estimate_selectivity(record_count, total_count, from_plan=False):
+    """Estimate query selectivity (what % of total records is returned).
 
-    if not where_match:
+    With from_plan, total_count is the query plan's estimate of the
+    object's size rather than a count.
+    """
+    if not total_count:
+        return None
+
+    selectivity_pct = (record_count / total_count) * 100
+    return {
+        'total_records': total_count,
+        'filtered_records': record_count,
+        'selectivity_pct': selectivity_pct,
+        'from_plan': from_plan
+    }
+
+
+@lru_cache(maxsize=None)
+def field_bits(indexed_fields):
+    """Map each indexed field's upper-cased name to its own bit."""
+    return {field.upper(): 1 << i for i, field in enumerate(indexed_fields)}
+
+
+def check_indexed_fields(parts, indexed_fields=STANDARD_INDEXED_FIELDS):
+    """Check if query uses indexed fields in WHERE clause."""
+    where_clause = parts.where
+    if not where_clause:
         return None, []
 
-    where_clause = where_match.group(1)
+    # Whole identifiers only, so Id doesn't match inside ParentId; string
+    # literals match the first alternative and yield no name. Each name
+    # ORs in its field's bit, so the work follows the length of the
+    # clause rather than the number of indexed fields.
+    bits = field_bits(indexed_fields)
+    where_mask = 0
+    for name in WHERE_NAME_RE.findall(where_clause):
+        where_mask |= bits.get(name.upper(), 0)
 
+    # Lowest bit first keeps indexed_fields order
     indexed_in_where = []
-    for field in indexed_fields:
-        if field.upper() in where_clause:
-            indexed_in_where.append(field)
+    while where_mask:
+        lowest = where_mask & -where_mask
+        indexed_in_where.append(indexed_fields[lowest.bit_length() - 1])
+        where_mask ^= lowest
 
     return where_clause, indexed_in_where
 
 
-def format_recommendations(issues, recommendations, selectivity, indexed_fields):
+def format_recommendations(issues, recommendations, selectivity, indexed_fields, plan=None):
     """Format optimization recommendations."""
     print("\n" + "=" * 70)
     print("🔍 QUERY ANALYSIS")
@@ -197,7 +557,12 @@ def format_recommendations(issues, recommendations, selectivity, indexed_fields)
 
     if selectivity:
         print(f"\n📊 Selectivity:")
-        print(f"   Total {selectivity['total_records']} records")
+        if selectivity.get('from_plan'):
+            print(f"   Total ~{selectivity['total_records']} records (query plan estimate, --exact to count)")
+        elif 'total_records' in selectivity:
+            print(f"   Total {selectivity['total_records']} records")
+        else:
+            print(f"   Estimated from the filter: {selectivity['estimate']} (--exact to count)")
         print(f"   Returned {selectivity['filtered_records']} records")
         print(f"   Selectivity: {selectivity['selectivity_pct']:.2f}%")
 
@@ -208,13 +573,23 @@ def format_recommendations(issues, recommendations, selectivity, indexed_fields)
         else:
             print(f"   ✅ Query is selective (<10% of records)")
 
+    if plan:
+        print(f"\n🧭 Query Plan:")
+        print(f"   Leading operation: {plan.get('leadingOperationType', 'Unknown')}")
+        if 'relativeCost' in plan:
+            print(f"   Relative cost: {plan['relativeCost']:.2f} (above 1 is not selective)")
+        for note in plan.get('notes', []):
+            print(f"   ℹ️  {note.get('description', '')}")
+        if plan.get('leadingOperationType') == 'TableScan':
+            recommendations.append("The query plan is a full table scan; filter on an indexed field so the optimizer can use an index")
+
     if indexed_fields[1]:  # indexed_in_where
         print(f"\n🔑 Indexed Fields in WHERE:")
         for field in indexed_fields[1]:
             print(f"   ✅ {field} (indexed)")
     else:
         print(f"\n🔑 Indexed Fields:")
-        print(f"   ⚠️  No standard indexed fields found in WHERE clause")
+        print(f"   ⚠️  No indexed fields found in WHERE clause")
         recommendations.append("Consider filtering on indexed fields (Id, Name, OwnerId, CreatedDate, etc.) for better performance")
 
     if recommendations:
@@ -225,35 +600,90 @@ def format_recommendations(issues, recommendations, selectivity, indexed_fields)
     print("=" * 70)
 
 
-def main():
-    """Main execution."""
-    if len(sys.argv) < 3:
-        print("Usage: profile_soql.py \"<SOQL query>\" <org-alias>")
-        print("")
-        print("Examples:")
-        print('  ./profile_soql.py "SELECT Id, Name FROM Account WHERE Industry = \'Technology\' LIMIT 1000" my-org')
-        print('  ./profile_soql.py "SELECT Id FROM Contact WHERE Email != null" dev-sandbox')
-        print("")
-        sys.exit(1)
+def profile_query(query, org_alias, exact=False, warm=False, out=None):
+    """Profile one query and return its report data, or None if it failed.
+
+    Errors from running the query are printed to out (default stdout).
+    """
+    # Parsed once; the structure, selectivity and index checks all use it
+    parts = parse_soql(query)
+    sobject = parts.sobject
+
+    # When the filter settles selectivity on its own, skip counting the
+    # whole object, which can take longer than the query being profiled
+    heuristic = None if exact else heuristic_selectivity(parts)
+
+    # Over a REST session the query plan is fetched too, and its estimate
+    # of the object's size stands in for the count unless exact is set
+    use_plan = get_api_session(org_alias) is not None
+    count_needed = heuristic is None and sobject and (exact or not use_plan)
+
+    # Execute query with timing. The plan, the object's total record count
+    # (for selectivity) and indexed fields don't depend on it, so they are
+    # fetched at the same time. Over the sf CLI the timing is wall clock,
+    # which other CLI processes starting alongside would inflate, so there
+    # the timed query runs alone first; over REST the org's own response
+    # time is reported and the query overlaps the other fetches too.
+    if not use_plan:
+        result = execute_query_with_timing(query, org_alias, warm, out)
+        if not result:
+            return None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        if use_plan:
+            result_future = executor.submit(execute_query_with_timing, query, org_alias, warm, out)
+            plan_future = executor.submit(get_query_plan, query, org_alias)
+        if count_needed:
+            total_future = executor.submit(get_total_count, sobject, org_alias)
+        if sobject:
+            indexed_future = executor.submit(get_indexed_fields, sobject, org_alias)
+
+    if use_plan:
+        result = result_future.result()
+        if not result:
+            return None
 
-    query = sys.argv[1]
-    org_alias = sys.argv[2]
+    # Analyze query structure
+    issues, recommendations = analyze_query_structure(query, parts)
 
-    print("=" * 70)
-    print("⚡ SOQL Query Profiler")
-    print("=" * 70)
-    print(f"Query: {query}")
-    print(f"Org: {org_alias}")
-    print("=" * 70)
+    # Estimate selectivity
+    plan = plan_future.result() if use_plan else None
+    if heuristic is not None:
+        selectivity = dict(heuristic, filtered_records=result['record_count'])
+    elif count_needed:
+        selectivity = estimate_selectivity(result['record_count'], total_future.result())
+    elif plan and plan.get('sobjectCardinality'):
+        selectivity = estimate_selectivity(result['record_count'], plan['sobjectCardinality'], from_plan=True)
+    else:
+        # No plan to estimate from, so count after all
+        total_count = get_total_count(sobject, org_alias) if sobject else None
+        selectivity = estimate_selectivity(result['record_count'], total_count)
+
+    # Check indexed fields
+    org_indexed_fields = indexed_future.result() if sobject else STANDARD_INDEXED_FIELDS
+    indexed_fields = check_indexed_fields(parts, org_indexed_fields)
 
-    # Execute query with timing
-    result = execute_query_with_timing(query, org_alias)
+    return {
+        'query': query,
+        'result': result,
+        'issues': issues,
+        'recommendations': recommendations,
+        'selectivity': selectivity,
+        'indexed_fields': indexed_fields,
+        'plan': plan
+    }
 
-    if not result:
-        sys.exit(1)
+
+def print_profile(profile):
+    """Print the timing, analysis and sample records of one profile."""
+    result = profile['result']
 
     # Display results
     print(f"\n⏱️  Execution Time: {result['execution_time_ms']} ms")
+    if result['server_timing']:
+        print(f"   Org response time; {result['wall_time_ms']} ms wall clock with transfer and parsing")
+    else:
+        print(f"   Wall clock, including sf CLI startup (simple-salesforce gives org response time)")
     print(f"📊 Records Returned: {result['record_count']}")
 
     # Performance assessment
@@ -264,27 +694,169 @@ def main():
     else:
         print(f"❌ Performance: SLOW (> 1000ms)")
 
-    # Analyze query structure
-    issues, recommendations = analyze_query_structure(query)
-
-    # Estimate selectivity
-    selectivity = estimate_selectivity(query, org_alias, result['record_count'])
-
-    # Check indexed fields
-    indexed_fields = check_indexed_fields(query)
-
     # Format recommendations
-    format_recommendations(issues, recommendations, selectivity, indexed_fields)
+    format_recommendations(
+        profile['issues'], profile['recommendations'], profile['selectivity'],
+        profile['indexed_fields'], profile['plan']
+    )
 
     # Show sample records (if small result set)
-    if result['record_count'] > 0 and result['record_count'] <= 5:
+    if result['record_count'] > 0 and result['record_count'] <= SAMPLE_RECORDS:
         print("\n📄 Sample Records:")
-        for i, record in enumerate(result['records'][:5], 1):
+        for i, record in enumerate(result['records'], 1):
             clean_record = {k: v for k, v in record.items() if k != 'attributes'}
             print(f"   {i}. {json.dumps(clean_record, indent=6)}")
 
     print("")
 
 
+def read_queries(input_file):
+    """Read one query per line, skipping blank lines and # comments."""
+    with open(input_file, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def format_batch_summary(profiles, failed):
+    """Print a markdown table of batch profiles, slowest first."""
+    print("=" * 70)
+    print(f"📋 BATCH SUMMARY: {len(profiles)} profiled, {failed} failed (slowest first)")
+    print("=" * 70)
+    print("| # | Time (ms) | Records | Selectivity | Issues | Query |")
+    print("| --- | --- | --- | --- | --- | --- |")
+
+    ranked = sorted(profiles, key=lambda p: p['result']['execution_time_ms'], reverse=True)
+    for i, profile in enumerate(ranked, 1):
+        result = profile['result']
+        selectivity = profile['selectivity']
+        selectivity_str = f"{selectivity['selectivity_pct']:.2f}%" if selectivity else "-"
+        issue_count = sum(1 for issue in profile['issues'] if not issue.startswith("✅"))
+        query = profile['query'].replace('|', '\\|')
+        if len(query) > 60:
+            query = query[:57] + "..."
+        print(f"| {i} | {result['execution_time_ms']} | {result['record_count']} "
+              f"| {selectivity_str} | {issue_count} | {query} |")
+    print("")
+
+
+def profile_batch(input_file, org_alias, concurrency, exact=False, warm=False):
+    """Profile every query in input_file, concurrency at a time.
+
+    Each profile is printed as it completes, followed by a summary of all
+    of them. Returns the number of queries that failed. Workers buffer
+    their error output, and it is printed from here under its query's
+    header, so concurrent queries' output never interleaves.
+    """
+    queries = read_queries(input_file)
+    print(f"Queries: {len(queries)} from {input_file} ({concurrency} at a time)")
+    print("=" * 70)
+
+    # Set up the REST session once, before the workers share it
+    get_api_session(org_alias)
+
+    def profile_buffered(query):
+        """Profile query, returning (profile, its error output)."""
+        buffer = io.StringIO()
+        return profile_query(query, org_alias, exact, warm, buffer), buffer.getvalue()
+
+    profiles = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(profile_buffered, query): query for query in queries}
+        for future in as_completed(futures):
+            print(f"\nQuery: {futures[future]}")
+            profile, output = future.result()
+            print(output, end='')
+            if profile is None:
+                failed += 1
+                print("❌ Profiling failed")
+                continue
+            profiles.append(profile)
+            print_profile(profile)
+
+    format_batch_summary(profiles, failed)
+    return failed
+
+
+def pop_option(args, name):
+    """Remove `name value` from args and return the value, or None."""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        return None
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+
+def main():
+    """Main execution."""
+    args = sys.argv[1:]
+    input_file = pop_option(args, '--input-file')
+    concurrency = pop_option(args, '--concurrency')
+    positional = [arg for arg in args if not arg.startswith('--')]
+
+    if len(positional) < (1 if input_file else 2):
+        print("Usage: profile_soql.py \"<SOQL query>\" <org-alias> [--exact] [--no-cache] [--warm]")
+        print("       profile_soql.py --input-file <queries.txt> <org-alias> [--concurrency N] [--exact] [--no-cache] [--warm]")
+        print("")
+        print("Examples:")
+        print('  ./profile_soql.py "SELECT Id, Name FROM Account WHERE Industry = \'Technology\' LIMIT 1000" my-org')
+        print('  ./profile_soql.py "SELECT Id FROM Contact WHERE Email != null" dev-sandbox')
+        print('  ./profile_soql.py --input-file queries.txt my-org --concurrency 3')
+        print("")
+        print("Options:")
+        print("  --exact          Always count the object's records for selectivity, even when")
+        print("                   the filter alone settles it (no WHERE, or Id equality)")
+        print("                   or a REST session's query plan estimates it")
+        print("  --no-cache       Always count the object's records and describe its indexed fields;")
+        print("                   ignore results cached by earlier runs")
+        print("  --warm           Run each query once untimed first and time the second run")
+        print("  --input-file     Profile each query in a file (one per line, # for comments)")
+        print("                   and finish with a summary ranked by execution time")
+        print(f"  --concurrency    Queries profiled at once with --input-file (default {BATCH_CONCURRENCY})")
+        print("")
+        sys.exit(1)
+
+    org_alias = positional[0] if input_file else positional[1]
+    exact = '--exact' in args
+    warm = '--warm' in args
+
+    if '--no-cache' in args:
+        global COUNT_CACHE_TTL, INDEX_CACHE_TTL
+        COUNT_CACHE_TTL = 0
+        INDEX_CACHE_TTL = 0
+
+    print("=" * 70)
+    print("⚡ SOQL Query Profiler")
+    print("=" * 70)
+
+    if input_file:
+        try:
+            concurrency = max(int(concurrency or BATCH_CONCURRENCY), 1)
+        except ValueError:
+            print(f"Error: --concurrency must be a number, not {concurrency!r}")
+            sys.exit(1)
+        print(f"Org: {org_alias}")
+        try:
+            failed = profile_batch(input_file, org_alias, concurrency, exact, warm)
+        except OSError as e:
+            print(f"Error: Could not read {input_file}: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
+
+    query = positional[0]
+    print(f"Query: {query}")
+    print(f"Org: {org_alias}")
+    print("=" * 70)
+    print(f"⏱️  Executing query...")
+
+    profile = profile_query(query, org_alias, exact, warm)
+    if not profile:
+        sys.exit(1)
+
+    print_profile(profile)
+
+
 if __name__ == "__main__":
     main()
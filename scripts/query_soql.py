@@ -20,6 +20,7 @@ Safety: READ-ONLY
 Dependencies:
     - subprocess: Execute sf CLI commands
     - json: Parse CLI JSON output
+    - orjson (optional): Faster parsing of large CLI responses
     - typing: Type hints for better code clarity
 """
 import sys
@@ -27,63 +28,74 @@ import json
 import subprocess
 from typing import List, Dict, Any
 
+# Shared with the other org scripts; lives next to this script
+from sf_api import json_loads
+
 def run_soql(query: str, org: str = None) -> Dict[str, Any]:
     """Execute SOQL query via sf CLI."""
     cmd = ["sf", "data", "query", "-q", query, "--json"]
     if org:
         cmd.extend(["-o", org])
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Left as bytes: json_loads takes them directly, so the output is
+    # never decoded into a second full-size copy
+    result = subprocess.run(cmd, capture_output=True)
     if result.returncode != 0:
-        print(f"Error executing query: {result.stderr}", file=sys.stderr)
+        print(f"Error executing query: {result.stderr.decode('utf-8', 'replace')}", file=sys.stderr)
         sys.exit(1)
 
     try:
-        return json.loads(result.stdout)
+        return json_loads(result.stdout)
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON response: {e}", file=sys.stderr)
-        print(f"Raw output: {result.stdout}", file=sys.stderr)
+        print(f"Raw output: {result.stdout.decode('utf-8', 'replace')}", file=sys.stderr)
         sys.exit(1)
 
 def flatten_record(record: Dict[str, Any], parent_key: str = '') -> Dict[str, Any]:
     """Flatten nested relationship fields."""
-    flattened = {}
+    flattened: Dict[str, Any] = {}
+    _flatten_into(flattened, record, f"{parent_key}." if parent_key else '')
+    return flattened
 
+def _flatten_into(flattened: Dict[str, Any], record: Dict[str, Any], prefix: str) -> None:
+    """Add record's fields to flattened, with keys prefixed by prefix.
+
+    Relationship fields are written straight into the one output dict
+    rather than flattened into their own dict and merged in.
+    """
     for key, value in record.items():
         if key == 'attributes':
             continue
 
-        new_key = f"{parent_key}.{key}" if parent_key else key
-
         if isinstance(value, dict) and 'attributes' in value:
             # This is a relationship field
-            flattened.update(flatten_record(value, new_key))
+            _flatten_into(flattened, value, f"{prefix}{key}.")
         elif isinstance(value, list):
             # Subquery results - skip for table format
             continue
         else:
-            flattened[new_key] = value
-
-    return flattened
+            flattened[prefix + key] = value
 
 def format_table(records: List[Dict[str, Any]]) -> str:
     """Format query results as markdown table."""
     if not records:
         return "No results found."
 
-    # Flatten all records
-    flattened_records = [flatten_record(rec) for rec in records]
-
-    # Get all unique headers
-    headers = []
-    for rec in flattened_records:
-        for key in rec.keys():
-            if key not in headers:
-                headers.append(key)
-
-    # Build table
-    table = "| " + " | ".join(headers) + " |\n"
-    table += "| " + " | ".join(["---"] * len(headers)) + " |\n"
+    # Flatten all records, collecting the unique headers in the same pass.
+    # A dict keeps first-seen order with O(1) membership checks.
+    flattened_records = []
+    seen_headers: Dict[str, None] = {}
+    for rec in records:
+        flattened = flatten_record(rec)
+        flattened_records.append(flattened)
+        seen_headers.update(dict.fromkeys(flattened))
+    headers = list(seen_headers)
+
+    # Build table as a list of lines joined once at the end
+    lines = [
+        "| " + " | ".join(headers) + " |",
+        "| " + " | ".join(["---"] * len(headers)) + " |",
+    ]
 
     for record in flattened_records:
         row_values = []
@@ -98,9 +110,9 @@ def format_table(records: List[Dict[str, Any]]) -> str:
                 value_str = value_str[:47] + "..."
             row_values.append(value_str)
 
-        table += "| " + " | ".join(row_values) + " |\n"
+        lines.append("| " + " | ".join(row_values) + " |")
 
-    return table
+    return "\n".join(lines) + "\n"
 
 def main():
     if len(sys.argv) < 2:
@@ -8,6 +8,10 @@ pass/fail summary and code coverage information.
 Usage:
     ./run_tests.py CreateDonationLightningController_Test my-org
     ./run_tests.py PaymentsBL_Test production
+    ./run_tests.py "PaymentsBL_Test, RefundsBL_Test" production
+
+    Several classes, separated by commas or spaces, run in a single sf CLI
+    call and are reported together.
 
 Requirements:
     - Salesforce CLI (sf) v2.x+ installed
@@ -23,21 +27,52 @@ import json
 import subprocess
 from typing import Dict, Any, List
 
-def run_tests(class_name: str, org: str) -> Dict[str, Any]:
-    """Execute Apex tests via sf CLI."""
-    cmd = ["sf", "apex", "test", "run", "-n", class_name, "-o", org, "-c", "--json", "--wait", "10"]
+# Shared with the other org scripts; lives next to this script
+from sf_api import json_loads
+
+# Outcome symbols for the whole run and for each test; any other outcome
+# gets a warning sign
+RUN_OUTCOME_SYMBOLS = {"Passed": "✅", "Failed": "❌"}
+TEST_OUTCOME_SYMBOLS = {"Pass": "✅", "Fail": "❌"}
+
+# Coverage percentages at or above each threshold get its symbol; 75% is
+# what Salesforce requires to deploy to production
+COVERAGE_SYMBOLS = ((75, "✅"), (50, "⚠️"))
+
+def coverage_symbol(pct: float) -> str:
+    """Return the status symbol for a coverage percentage."""
+    for threshold, symbol in COVERAGE_SYMBOLS:
+        if pct >= threshold:
+            return symbol
+    return "❌"
+
+def parse_class_names(class_names: str) -> List[str]:
+    """Split a comma- or space-separated list of test classes."""
+    return class_names.replace(",", " ").split()
 
-    print(f"Running tests for: {class_name}")
+def run_tests(class_names: List[str], org: str) -> Dict[str, Any]:
+    """Execute Apex tests via sf CLI.
+
+    All classes go to one `sf apex test run` (one -n each), so the CLI
+    starts once and the org runs them as a single test job.
+    """
+    cmd = ["sf", "apex", "test", "run", "-o", org, "-c", "--json", "--wait", "10"]
+    for class_name in class_names:
+        cmd.extend(["-n", class_name])
+
+    print(f"Running tests for: {', '.join(class_names)}")
     print(f"Target org: {org}")
     print("Please wait...\n")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # Left as bytes: json_loads takes them directly, so the output is
+    # never decoded into a second full-size copy
+    result = subprocess.run(cmd, capture_output=True)
 
     try:
-        return json.loads(result.stdout)
+        return json_loads(result.stdout)
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON response: {e}", file=sys.stderr)
-        print(f"Raw output: {result.stdout}", file=sys.stderr)
+        print(f"Raw output: {result.stdout.decode('utf-8', 'replace')}", file=sys.stderr)
         sys.exit(1)
 
 def format_results(data: Dict[str, Any]) -> str:
@@ -46,9 +81,11 @@ def format_results(data: Dict[str, Any]) -> str:
     summary = result.get("summary", {})
 
     outcome = summary.get('outcome', 'Unknown')
-    outcome_emoji = "✅" if outcome == "Passed" else "❌" if outcome == "Failed" else "⚠️"
+    outcome_emoji = RUN_OUTCOME_SYMBOLS.get(outcome, "⚠️")
 
-    output = f"""
+    # Sections are collected and joined once at the end, rather than
+    # growing one string per row
+    parts = [f"""
 ## {outcome_emoji} Test Results
 
 **Outcome:** {outcome}
@@ -57,56 +94,56 @@ def format_results(data: Dict[str, Any]) -> str:
 **Failed:** {summary.get('failing', 0)}
 **Skipped:** {summary.get('skipped', 0)}
 
-"""
+"""]
 
     # Code coverage
     coverage_pct = summary.get('testRunCoverage', 'N/A')
     if coverage_pct != 'N/A':
         coverage_val = float(coverage_pct.replace('%', ''))
-        coverage_emoji = "✅" if coverage_val >= 75 else "⚠️" if coverage_val >= 50 else "❌"
-        output += f"**Coverage:** {coverage_emoji} {coverage_pct}\n\n"
+        coverage_emoji = coverage_symbol(coverage_val)
+        parts.append(f"**Coverage:** {coverage_emoji} {coverage_pct}\n\n")
     else:
-        output += f"**Coverage:** N/A\n\n"
+        parts.append(f"**Coverage:** N/A\n\n")
 
     # Show test details
     tests = result.get("tests", [])
 
     if tests:
-        output += "### Test Details\n\n"
-        output += "| Test Method | Outcome | Time (ms) |\n"
-        output += "|-------------|---------|--------|\n"
+        parts.append("### Test Details\n\n")
+        parts.append("| Test Method | Outcome | Time (ms) |\n")
+        parts.append("|-------------|---------|--------|\n")
 
         for test in tests:
             method_name = test.get('MethodName', 'Unknown')
             test_outcome = test.get('Outcome', 'Unknown')
             run_time = test.get('RunTime', 0)
-            outcome_symbol = "✅" if test_outcome == "Pass" else "❌" if test_outcome == "Fail" else "⚠️"
+            outcome_symbol = TEST_OUTCOME_SYMBOLS.get(test_outcome, "⚠️")
 
-            output += f"| {method_name} | {outcome_symbol} {test_outcome} | {run_time} |\n"
+            parts.append(f"| {method_name} | {outcome_symbol} {test_outcome} | {run_time} |\n")
 
-        output += "\n"
+        parts.append("\n")
 
     # Show failures
     failures = [t for t in tests if t.get("Outcome") == "Fail"]
 
     if failures:
-        output += "### ❌ Failures\n\n"
+        parts.append("### ❌ Failures\n\n")
         for i, test in enumerate(failures, 1):
-            output += f"**{i}. {test.get('MethodName')}**\n\n"
+            parts.append(f"**{i}. {test.get('MethodName')}**\n\n")
             message = test.get('Message', 'No message')
             stack_trace = test.get('StackTrace', '')
 
-            output += f"```\n{message}\n"
+            parts.append(f"```\n{message}\n")
             if stack_trace:
-                output += f"\n{stack_trace}\n"
-            output += "```\n\n"
+                parts.append(f"\n{stack_trace}\n")
+            parts.append("```\n\n")
 
     # Show coverage details
     coverage = result.get("codecoverage", [])
     if coverage:
-        output += "### Code Coverage Details\n\n"
-        output += "| Class/Trigger | Coverage | Lines |\n"
-        output += "|---------------|----------|-------|\n"
+        parts.append("### Code Coverage Details\n\n")
+        parts.append("| Class/Trigger | Coverage | Lines |\n")
+        parts.append("|---------------|----------|-------|\n")
 
         for cov in coverage:
             name = cov.get('name', 'Unknown')
@@ -116,24 +153,28 @@ def format_results(data: Dict[str, Any]) -> str:
 
             if total > 0:
                 pct = (covered / total) * 100
-                pct_emoji = "✅" if pct >= 75 else "⚠️" if pct >= 50 else "❌"
-                output += f"| {name} | {pct_emoji} {pct:.1f}% | {covered}/{total} |\n"
+                pct_emoji = coverage_symbol(pct)
+                parts.append(f"| {name} | {pct_emoji} {pct:.1f}% | {covered}/{total} |\n")
 
-    return output
+    return "".join(parts)
 
 def main():
     if len(sys.argv) < 3:
-        print("Usage: run_tests.py <class-name> <org-alias>")
+        print("Usage: run_tests.py <class-name[,class-name...]> <org-alias>")
         print()
         print("Examples:")
         print("  run_tests.py MyClassTest sandbox")
         print("  run_tests.py \"MyClassTest, AnotherTest\" production")
         sys.exit(1)
 
-    class_name = sys.argv[1]
+    class_names = parse_class_names(sys.argv[1])
     org = sys.argv[2]
 
-    result = run_tests(class_name, org)
+    if not class_names:
+        print("Error: no test class given", file=sys.stderr)
+        sys.exit(1)
+
+    result = run_tests(class_names, org)
 
     # Check if command succeeded
     status = result.get("status", 1)
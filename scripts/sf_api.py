@@ -0,0 +1,66 @@
+"""
+Salesforce access shared by the org scripts.
+
+The scripts that talk to an org all parse `sf ... --json` output and, with
+simple_salesforce installed, query over one REST API session instead of a
+CLI call per request. This module holds that shared set-up; it is
+imported, not run.
+"""
+
+import json
+import shutil
+import subprocess
+import threading
+
+# Optional: orjson parses large CLI responses several times faster. Its
+# JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Optional: simple_salesforce talks to the REST API directly over one session
+try:
+    from simple_salesforce import Salesforce
+    from simple_salesforce.exceptions import SalesforceError
+except ImportError:
+    Salesforce = None
+
+    class SalesforceError(Exception):
+        """Stand-in so `except SalesforceError` works; never raised."""
+
+
+# simple_salesforce sessions keyed by org alias (None: use the sf CLI)
+_api_sessions = {}
+_api_sessions_lock = threading.Lock()
+
+
+def get_api_session(org_alias):
+    """Return a REST API session for the org, or None to use the sf CLI.
+
+    Every sf invocation starts the CLI and loads the org's auth again. With
+    simple_salesforce installed, the access token is read once from
+    `sf org display` and later requests reuse one keep-alive HTTP session.
+    If the org can't be displayed, None is returned; the sf CLI call that
+    follows then fails the way the script reports CLI errors.
+    """
+    if Salesforce is None:
+        return None
+
+    with _api_sessions_lock:
+        if org_alias not in _api_sessions:
+            cmd = [shutil.which('sf') or 'sf', 'org', 'display', '-o', org_alias, '--json']
+            result = subprocess.run(cmd, capture_output=True, close_fds=False)
+            session = None
+            if result.returncode == 0:
+                try:
+                    info = json_loads(result.stdout)['result']
+                    session = Salesforce(
+                        instance_url=info['instanceUrl'],
+                        session_id=info['accessToken']
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    pass
+            _api_sessions[org_alias] = session
+
+    return _api_sessions[org_alias]
@@ -0,0 +1,63 @@
+"""
+Source file discovery shared by the local validators.
+
+validate_field_writeability.py and validate_visualforce.py both walk a
+project for source files, skip the same tool directories, and split large
+runs across worker processes. This module holds that shared walk and the
+settings that go with it; it is imported, not run.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# The characters Python's \s matches in ASCII text, for hyperscan
+# expressions that must agree with the re patterns they stand in for
+PYTHON_ASCII_SPACE = '\t\n\v\f\r\x1c\x1d\x1e\x1f '
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Directories that never hold deployable source but can be huge, like an
+# LWC project's node_modules. find_files doesn't descend into them;
+# --exclude adds more.
+SKIP_DIRS = frozenset({
+    'node_modules', '.git', '.sfdx', '.sf', 'dist', 'build', 'coverage', '.idea', '.vscode',
+})
+
+
+def find_files(root: Path, suffixes: Tuple[str, ...], skip_dirs: frozenset = SKIP_DIRS) -> List[Path]:
+    """
+    Find files under root ending in any of suffixes, in one directory walk.
+
+    Files are grouped by suffix, each directory's files before those of
+    its subdirectories, the order one recursive glob per suffix gives.
+    Directories named in skip_dirs and symlinked directories aren't
+    entered, and directories that can't be listed (unreadable, or removed
+    during the walk) are skipped.
+    """
+    found: Dict[str, List[Path]] = {suffix: [] for suffix in suffixes}
+    stack = [str(root)]
+
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in skip_dirs:
+                                subdirs.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    for suffix in suffixes:
+                        if entry.name.endswith(suffix):
+                            found[suffix].append(Path(entry.path))
+                            break
+        except OSError:
+            continue
+        # Reversed, so subdirectories are walked in listing order
+        stack.extend(reversed(subdirs))
+
+    return [path for suffix in suffixes for path in found[suffix]]
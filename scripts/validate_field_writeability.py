@@ -20,8 +20,18 @@ ARGUMENTS:
 OPTIONS:
     -h, --help       Show this help message
     -v, --verbose    Show detailed output for each file analyzed
-    --json          Output results as JSON for CI/CD integration
+    --json          Output results as JSON for CI/CD integration (progress
+                     goes to stderr, so stdout is valid JSON)
     --max-issues N   Stop scanning after N issues found (default: unlimited)
+    --jobs N         Worker processes for scanning files (default: CPU count).
+                     Trees under 64 files are scanned in-process. Use
+                     --jobs 1 to keep verbose put() notes in file order.
+    --cache-ttl N    Reuse SObject describes cached by earlier runs for up
+                     to N seconds (default: 3600)
+    --no-cache       Always describe SObjects from the org
+    --exclude DIR    Don't descend into directories named DIR (repeatable).
+                     node_modules, .git, .sfdx, .sf, dist, build, coverage,
+                     .idea and .vscode are always skipped
 
 EXAMPLES:
     # Validate sandbox before deployment
@@ -33,6 +43,9 @@ EXAMPLES:
     # JSON output for CI/CD pipelines
     ./validate_field_writeability.py src/ production --json > validation.json
 
+    # Right after deploying field changes, skip cached describes
+    ./validate_field_writeability.py src/ dev-sandbox --no-cache
+
 REQUIREMENTS:
     - Salesforce CLI (sf v2.x+): npm install -g @salesforce/cli
     - Authenticated org: sf org login web -a <alias>
@@ -41,7 +54,10 @@ REQUIREMENTS:
 SAFETY:
     🟢 READ-ONLY - No changes made to files or orgs
     🟢 QUERIES ONLY - Only reads metadata from org
-    🟢 NO DEPENDENCIES - Uses standard library only
+    🟢 Caches SObject describes in ~/.cache/sf-skill (--no-cache to skip)
+    🟢 NO DEPENDENCIES - Uses standard library only (orjson, if installed,
+       parses describe responses faster; hyperscan, if installed, speeds
+       up scanning large trees)
 
 DETECTION:
     Finds field assignments in Apex:
@@ -50,6 +66,10 @@ DETECTION:
     - List/Map assignment: accounts[0].CustomField__c = value
     - Dynamic put() calls: obj.put('FieldName', value) [field detected, SObject type unknown]
 
+    Finds field assignments in LWC JavaScript:
+    - Record field writes: fields[NAME_FIELD.fieldApiName] = value, where
+      NAME_FIELD is imported from '@salesforce/schema/Account.Name'
+
     Does NOT detect (requires manual review):
     - Reflection-based updates: obj.setSObjectField(...)
     - Dynamic field names in put(): obj.put(variableName, value)
@@ -63,13 +83,107 @@ COMMON ISSUES FIXED:
     - Lookup fields on read-only objects
 """
 
+import hashlib
 import json
+import os
 import re
 import subprocess
 import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 import argparse
+import contextlib
+
+# Shared with the other local validator and the org scripts; both live
+# next to this script
+from sf_api import json_loads
+from source_files import PARALLEL_MIN_FILES, PYTHON_ASCII_SPACE, SKIP_DIRS, find_files
+
+# Optional: hyperscan runs the direct-assignment pattern, the busiest by
+# far, as a single compiled-automaton pass over each file.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Apex field assignment patterns, compiled once at import rather than on
+# every file scanned. Each captures (sobject, field).
+
+# Direct: obj.fieldName = value (all field types: custom and standard)
+# and List/Array: list[0].fieldName = value, in one pass. The
+# lookbehind (start of line, whitespace or ;) rejects most positions
+# faster than matching a leading character would.
+APEX_DIRECT_PATTERN = re.compile(
+    r'(?<![^\s;])([a-zA-Z_]\w+)(?:\[\d+\])?\.([a-zA-Z_]\w+(?:__c)?)\s*=', re.MULTILINE
+)
+
+# Constructor: new Account(Field = value)
+APEX_CONSTRUCTOR_PATTERN = re.compile(
+    r'new\s+([a-zA-Z_]\w+)\s*\([^)]*?([a-zA-Z_]\w+(?:__c)?)\s*=', re.MULTILINE
+)
+
+# LWC schema import: import NAME_FIELD from '@salesforce/schema/Account.Name'.
+# Captures (identifier, sobject, field); relationship paths aren't matched.
+LWC_SCHEMA_IMPORT_PATTERN = re.compile(
+    r'''import\s+([A-Za-z_$][\w$]*)\s+from\s+['"]@salesforce/schema/(\w+)\.(\w+)['"]'''
+)
+
+# LWC record field write: fields[NAME_FIELD.fieldApiName] = value, as built
+# for createRecord/updateRecord. Captures the imported identifier.
+LWC_FIELD_WRITE_PATTERN = re.compile(r'\[\s*([A-Za-z_$][\w$]*)\.fieldApiName\s*\]\s*=(?!=)')
+
+# Dynamic put() method: obj.put('fieldName', value). Captures only the
+# field; the SObject type can't be told from the call.
+APEX_PUT_PATTERN = re.compile(r'\.put\s*\(\s*["\']([a-zA-Z_]\w+(?:__c)?)["\']')
+
+# APEX_DIRECT_PATTERN for hyperscan. hyperscan has no lookbehind, so the
+# match takes in the preceding character instead, and reports where it
+# starts; re then matches there to recover the groups. Python's \s is
+# spelled out, so both engines agree on ASCII text.
+_HS_DIRECT_EXPRESSION = (
+    rf'(?:^|[{PYTHON_ASCII_SPACE};])[a-zA-Z_]\w+(?:\[\d+\])?\.[a-zA-Z_]\w+[{PYTHON_ASCII_SPACE}]*='
+)
+_HS_PREFIX_CHARS = frozenset(PYTHON_ASCII_SPACE + ';')
+
+if hyperscan is not None:
+    HS_DIRECT_DATABASE = hyperscan.Database()
+    HS_DIRECT_DATABASE.compile(
+        expressions=[_HS_DIRECT_EXPRESSION.encode('ascii')],
+        flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST],
+    )
+else:
+    HS_DIRECT_DATABASE = None
+
+# Files handed to a worker process at a time
+SCAN_CHUNK_SIZE = 32
+
+# Concurrent `sf sobject describe` calls. Each mostly waits on the CLI
+# and the network, so threads are enough.
+DESCRIBE_WORKERS = 8
+
+# An SObject's fields only change with deployments, while each describe
+# costs a CLI start and an org round trip, so describes are reused across
+# runs for DESCRIBE_CACHE_TTL seconds (--cache-ttl). --no-cache disables it.
+CACHE_DIR = Path.home() / '.cache' / 'sf-skill'
+DESCRIBE_CACHE_TTL = 60 * 60
+
+
+@lru_cache(maxsize=2048)
+def _capitalize_sobject_name(name: str) -> str:
+    """
+    Return name with its first letter capitalized.
+
+    Code names the same few SObjects over and over, so each distinct
+    name is worked out once.
+    """
+    return name[0].upper() + name[1:]
 
 
 class Colors:
@@ -85,36 +199,25 @@ class Colors:
 class FieldInfo:
     """Represents field metadata from Salesforce."""
 
+    # Only the describe properties the checks read are kept, so each
+    # field's full describe dict (dozens of keys, picklist values
+    # included) is freed once its SObject is loaded
+    __slots__ = (
+        'name', 'label', 'sobj_type',
+        'is_writeable', 'is_formula', 'is_external', 'is_system_field', 'field_type',
+    )
+
     def __init__(self, name: str, label: str, sobj_type: str, metadata: Dict):
         self.name = name
         self.label = label
         self.sobj_type = sobj_type
-        self.metadata = metadata
-
-    @property
-    def is_writeable(self) -> bool:
-        """Check if field is writeable."""
-        return self.metadata.get('updateable', False)
 
-    @property
-    def is_formula(self) -> bool:
-        """Check if field is a formula field."""
-        return self.metadata.get('calculated', False)
-
-    @property
-    def is_external(self) -> bool:
-        """Check if field is an external field."""
-        return 'ExternalFieldDefinition' in self.metadata.get('type', '')
-
-    @property
-    def is_system_field(self) -> bool:
-        """Check if field is a system field."""
-        return self.metadata.get('type', '').startswith('System.')
-
-    @property
-    def field_type(self) -> str:
-        """Get the field type."""
-        return self.metadata.get('type', 'Unknown')
+        type_name = metadata.get('type') or ''
+        self.is_writeable: bool = metadata.get('updateable', False)
+        self.is_formula: bool = metadata.get('calculated', False)
+        self.is_external: bool = 'ExternalFieldDefinition' in type_name
+        self.is_system_field: bool = type_name.startswith('System.')
+        self.field_type: str = metadata.get('type', 'Unknown')
 
     def get_reason_not_writeable(self) -> str:
         """Get human-readable reason why field is not writeable."""
@@ -130,10 +233,17 @@ class FieldInfo:
 class FieldValidator:
     """Main validator for field writeability."""
 
-    def __init__(self, org_alias: str, verbose: bool = False):
+    def __init__(self, org_alias: str, verbose: bool = False, jobs: int = 1,
+                 cache_ttl: int = DESCRIBE_CACHE_TTL, max_issues: Optional[int] = None,
+                 skip_dirs: frozenset = SKIP_DIRS):
         self.org_alias = org_alias
         self.verbose = verbose
-        self.metadata_cache: Dict[str, Dict[str, FieldInfo]] = {}
+        self.jobs = jobs
+        self.cache_ttl = cache_ttl
+        self.max_issues = max_issues
+        self.skip_dirs = skip_dirs
+        # None marks an SObject the org doesn't have
+        self.metadata_cache: Dict[str, Optional[Dict[str, FieldInfo]]] = {}
         self.issues: List[Dict] = []
 
     def _normalize_sobject_name(self, name: str) -> str:
@@ -156,7 +266,7 @@ class FieldValidator:
         """
         if not name:
             return name
-        return name[0].upper() + name[1:]
+        return _capitalize_sobject_name(name)
 
     def validate(self, source_dir: Path) -> Tuple[List[Dict], int]:
         """
@@ -169,28 +279,64 @@ class FieldValidator:
             raise FileNotFoundError(f"Directory not found: {source_dir}")
 
         # Find all Apex and LWC files
-        apex_files = list(source_dir.glob('**/*.cls'))
-        js_files = list(source_dir.glob('**/*.js'))
-
-        files_to_check = apex_files + js_files
+        files_to_check = find_files(source_dir, ('.cls', '.js'), self.skip_dirs)
 
         if not files_to_check:
             print(f"{Colors.YELLOW}No Apex (.cls) or LWC (.js) files found in {source_dir}{Colors.RESET}")
             return [], 0
 
         # Extract field assignments
+        all_assignments = self._collect_assignments(files_to_check)
+
+        if not all_assignments:
+            print(f"{Colors.GREEN}✓ No field assignments found to validate{Colors.RESET}")
+            return [], 0
+
+        # Validate each SObject's fields
+        print(f"\n{Colors.BLUE}Validating {len(all_assignments)} objects across {len(files_to_check)} files...{Colors.RESET}\n")
+
+        # With --max-issues, describe a worker pool's worth of SObjects at
+        # a time, so stopping early leaves at most that many describes unused
+        sobj_types = sorted(all_assignments)
+        batch_size = DESCRIBE_WORKERS if self.max_issues else len(sobj_types)
+
+        for start in range(0, len(sobj_types), batch_size):
+            batch = sobj_types[start:start + batch_size]
+            self._prefetch_metadata(batch)
+
+            for sobj_type in batch:
+                self._validate_sobject_fields(sobj_type, all_assignments[sobj_type])
+                if self._max_issues_reached():
+                    print(f"\n{Colors.YELLOW}Stopped after {self.max_issues} issues (--max-issues){Colors.RESET}")
+                    return self.issues, 1
+
+        return self.issues, 1 if self.issues else 0
+
+    def _max_issues_reached(self) -> bool:
+        """Return True once --max-issues issues have been found."""
+        return bool(self.max_issues) and len(self.issues) >= self.max_issues
+
+    def _collect_assignments(self, files_to_check: List[Path]) -> Dict[str, Set[str]]:
+        """Extract and merge the field assignments of all files, by SObject."""
         all_assignments: Dict[str, Set[str]] = {}
 
-        for file_path in files_to_check:
-            try:
-                content = file_path.read_text(encoding='utf-8')
-            except UnicodeDecodeError:
+        # Reading and scanning files is CPU-bound and independent per
+        # file, so large trees are spread over worker processes. Results
+        # come back in file order either way.
+        if self.jobs > 1 and len(files_to_check) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(executor.map(
+                    _scan_file, files_to_check, repeat(self.verbose), chunksize=SCAN_CHUNK_SIZE
+                ))
+        else:
+            results = (self._scan_file(file_path) for file_path in files_to_check)
+
+        for file_path, assignments in zip(files_to_check, results):
+            if assignments is None:
                 if self.verbose:
                     print(f"  Skipped (encoding): {file_path}")
                 continue
 
-            assignments = self._extract_assignments(file_path, content)
-
             for sobj, fields in assignments.items():
                 if sobj not in all_assignments:
                     all_assignments[sobj] = set()
@@ -199,70 +345,96 @@ class FieldValidator:
             if self.verbose and assignments:
                 print(f"  Found in: {file_path.name} - {sum(len(f) for f in assignments.values())} fields")
 
-        if not all_assignments:
-            print(f"{Colors.GREEN}✓ No field assignments found to validate{Colors.RESET}")
-            return [], 0
-
-        # Validate each SObject's fields
-        print(f"\n{Colors.BLUE}Validating {len(all_assignments)} objects across {len(files_to_check)} files...{Colors.RESET}\n")
+        return all_assignments
 
-        for sobj_type, fields in sorted(all_assignments.items()):
-            self._validate_sobject_fields(sobj_type, fields)
-
-        return self.issues, 1 if self.issues else 0
+    def _scan_file(self, file_path: Path) -> Optional[Dict[str, Set[str]]]:
+        """Read a file and extract its field assignments, or None if it isn't UTF-8."""
+        try:
+            content = file_path.read_text(encoding='utf-8')
+        except UnicodeDecodeError:
+            return None
+        return self._extract_assignments(file_path, content)
 
     def _extract_assignments(self, file_path: Path, content: str) -> Dict[str, Set[str]]:
         """Extract field assignments from code."""
-        assignments: Dict[str, Set[str]] = {}
-
-        is_apex = file_path.suffix == '.cls'
-
-        if is_apex:
-            # Apex field assignment patterns - matches all field types
-            patterns = [
-                # Direct: obj.fieldName = value (all field types: custom and standard)
-                r'(?:^|[\s;])([a-zA-Z_]\w+)\.([a-zA-Z_]\w+(?:__c)?)\s*=',
-                # Constructor: new Account(Field = value)
-                r'new\s+([a-zA-Z_]\w+)\s*\([^)]*?([a-zA-Z_]\w+(?:__c)?)\s*=',
-                # List/Array: list[0].fieldName = value
-                r'(?:^|[\s;])([a-zA-Z_]\w+)(?:\[\d+\])\.([a-zA-Z_]\w+(?:__c)?)\s*=',
-                # Dynamic put() method: obj.put('fieldName', value)
-                r'\.put\s*\(\s*["\']([a-zA-Z_]\w+(?:__c)?)["\']',
-            ]
-
-            for pattern_idx, pattern in enumerate(patterns):
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    groups = match.groups()
-                    # put() pattern has only 1 group (field name), others have 2+ (sobj_type, field_name)
-                    if pattern_idx == 3:  # put() pattern
-                        # Can't determine SObject type from put() calls, skip for now
-                        if self.verbose:
-                            print(f"    Skipped dynamic put() - cannot determine object type")
-                    elif len(groups) >= 2:
-                        # Normalize and preserve SObject name
-                        sobj_type = self._normalize_sobject_name(groups[0])
-                        field_name = groups[-1]
-
-                        if sobj_type not in assignments:
-                            assignments[sobj_type] = set()
-                        assignments[sobj_type].add(field_name)
-
-        return assignments
+        extractor = self._EXTRACTORS.get(file_path.suffix)
+        return extractor(self, content) if extractor else {}
+
+    def _extract_apex_assignments(self, content: str) -> Dict[str, Set[str]]:
+        """Extract field assignments from Apex code."""
+        assignments: Dict[str, Set[str]] = defaultdict(set)
+
+        matches = chain(_direct_assignments(content), APEX_CONSTRUCTOR_PATTERN.finditer(content))
+        for match in matches:
+            # Every assignment pattern captures exactly (sobject, field)
+            sobj_name, field_name = match.groups()
+            # Normalize and preserve SObject name
+            sobj_type = self._normalize_sobject_name(sobj_name)
+            assignments[sobj_type].add(field_name)
+
+        # Can't determine SObject type from put() calls, skip for now.
+        # They are only reported, so only scanned for, in verbose mode.
+        if self.verbose:
+            for _ in APEX_PUT_PATTERN.finditer(content):
+                print(f"    Skipped dynamic put() - cannot determine object type")
+
+        return dict(assignments)
+
+    def _extract_lwc_assignments(self, content: str) -> Dict[str, Set[str]]:
+        """Extract field assignments from LWC JavaScript."""
+        assignments: Dict[str, Set[str]] = defaultdict(set)
+
+        # A write names its field through a schema import, which gives
+        # the SObject and field exactly; most components import none
+        schema_fields = {
+            match.group(1): (match.group(2), match.group(3))
+            for match in LWC_SCHEMA_IMPORT_PATTERN.finditer(content)
+        }
+        if schema_fields:
+            for match in LWC_FIELD_WRITE_PATTERN.finditer(content):
+                if match.group(1) in schema_fields:
+                    sobj_type, field_name = schema_fields[match.group(1)]
+                    assignments[sobj_type].add(field_name)
+
+        return dict(assignments)
+
+    # Extractor for each scanned file suffix. Anything else has no
+    # assignments.
+    _EXTRACTORS = {
+        '.cls': _extract_apex_assignments,
+        '.js': _extract_lwc_assignments,
+    }
+
+    def _prefetch_metadata(self, sobj_types):
+        """Describe all uncached SObjects concurrently, filling metadata_cache."""
+        missing = [sobj_type for sobj_type in sobj_types if sobj_type not in self.metadata_cache]
+        if len(missing) < 2:
+            return  # nothing to overlap; described on first use
+
+        with ThreadPoolExecutor(max_workers=min(DESCRIBE_WORKERS, len(missing))) as executor:
+            for sobj_type, metadata in zip(missing, executor.map(self._get_sobject_metadata, missing)):
+                self.metadata_cache[sobj_type] = metadata
 
     def _validate_sobject_fields(self, sobj_type: str, fields: Set[str]):
         """Validate all fields for an SObject type."""
         # Get metadata for this SObject
         if sobj_type not in self.metadata_cache:
-            metadata = self._get_sobject_metadata(sobj_type)
-            if not metadata:
-                print(f"{Colors.YELLOW}⚠ Warning: Could not find SObject '{sobj_type}' in org{Colors.RESET}")
-                return
-            self.metadata_cache[sobj_type] = metadata
+            self.metadata_cache[sobj_type] = self._get_sobject_metadata(sobj_type)
 
         metadata = self.metadata_cache[sobj_type]
+        if not metadata:
+            print(f"{Colors.YELLOW}⚠ Warning: Could not find SObject '{sobj_type}' in org{Colors.RESET}")
+            return
+
+        # One line per reported field, written together once the SObject
+        # is done rather than one print (and, on a terminal, one flush) each
+        lines: List[str] = []
 
         # Check each field
         for field_name in sorted(fields):
+            if self._max_issues_reached():
+                break
+
             if field_name not in metadata:
                 # Field doesn't exist - might be dynamic or typo
                 self.issues.append({
@@ -272,7 +444,7 @@ class FieldValidator:
                     'severity': 'warning',
                     'reason': f'Field not found in {sobj_type} metadata (may be dynamic)'
                 })
-                print(f"{Colors.YELLOW}⚠ {sobj_type}.{field_name:<30} FIELD NOT FOUND{Colors.RESET}")
+                lines.append(f"{Colors.YELLOW}⚠ {sobj_type}.{field_name:<30} FIELD NOT FOUND{Colors.RESET}")
             else:
                 field_info = metadata[field_name]
 
@@ -286,13 +458,69 @@ class FieldValidator:
                         'severity': 'error',
                         'reason': reason
                     })
-                    print(f"{Colors.RED}✗ {sobj_type}.{field_name:<30} NOT WRITEABLE - {reason}{Colors.RESET}")
+                    lines.append(f"{Colors.RED}✗ {sobj_type}.{field_name:<30} NOT WRITEABLE - {reason}{Colors.RESET}")
                 else:
                     if self.verbose:
-                        print(f"{Colors.GREEN}✓ {sobj_type}.{field_name:<30} writeable{Colors.RESET}")
+                        lines.append(f"{Colors.GREEN}✓ {sobj_type}.{field_name:<30} writeable{Colors.RESET}")
+
+        if lines:
+            lines.append('')
+            sys.stdout.write('\n'.join(lines))
+
+    def _cache_path(self, sobj_type: str) -> Path:
+        """Return the disk cache file for an SObject's describe in this org."""
+        key = hashlib.blake2b(f"{self.org_alias}\0{sobj_type}".encode(), digest_size=16).hexdigest()
+        return CACHE_DIR / f"describe-{key}.json"
+
+    def _read_cached_fields(self, sobj_type: str) -> Optional[List[Dict]]:
+        """Return the describe fields cached by an earlier run, if fresh enough."""
+        if self.cache_ttl <= 0:
+            return None
+        path = self._cache_path(sobj_type)
+        try:
+            if time.time() - path.stat().st_mtime < self.cache_ttl:
+                return json.loads(path.read_text(encoding='utf-8'))['fields']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # not cached yet, or unreadable
+        return None
+
+    def _write_cached_fields(self, sobj_type: str, fields: List[Dict]):
+        """Cache an SObject's describe fields; caching is best effort."""
+        if self.cache_ttl <= 0:
+            return
+        # Write to a temporary file and rename, so a concurrent run
+        # never reads a partly written entry
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'fields': fields}, f)
+            os.replace(tmp_path, self._cache_path(sobj_type))
+        except OSError:
+            pass
+
+    def _build_field_info(self, sobj_type: str, describe_fields: List[Dict]) -> Dict[str, FieldInfo]:
+        """Map field name to FieldInfo for an SObject's describe fields."""
+        fields: Dict[str, FieldInfo] = {}
+
+        for field in describe_fields:
+            field_name = field.get('name', '')
+            field_info = FieldInfo(
+                name=field_name,
+                label=field.get('label', ''),
+                sobj_type=sobj_type,
+                metadata=field
+            )
+            fields[field_name] = field_info
+
+        return fields
 
     def _get_sobject_metadata(self, sobj_type: str) -> Optional[Dict[str, FieldInfo]]:
         """Query Salesforce for SObject field metadata."""
+        cached = self._read_cached_fields(sobj_type)
+        if cached is not None:
+            return self._build_field_info(sobj_type, cached)
+
         try:
             cmd = [
                 'sf', 'sobject', 'describe',
@@ -301,32 +529,25 @@ class FieldValidator:
                 '--json'
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            # Left as bytes: json_loads takes them directly, so a wide
+            # object's describe is never decoded into a second full-size copy
+            result = subprocess.run(cmd, capture_output=True, timeout=30)
 
             if result.returncode != 0:
-                if 'No such object' in result.stderr or 'not found' in result.stderr.lower():
+                stderr = result.stderr.decode('utf-8', 'replace')
+                if 'No such object' in stderr or 'not found' in stderr.lower():
                     return None
-                raise RuntimeError(f"Failed to describe {sobj_type}: {result.stderr}")
+                raise RuntimeError(f"Failed to describe {sobj_type}: {stderr}")
 
-            data = json.loads(result.stdout)
+            data = json_loads(result.stdout)
 
             if 'status' in data and data['status'] != 0:
                 return None
 
             # Extract fields
-            fields: Dict[str, FieldInfo] = {}
-
-            for field in data.get('fields', []):
-                field_name = field.get('name', '')
-                field_info = FieldInfo(
-                    name=field_name,
-                    label=field.get('label', ''),
-                    sobj_type=sobj_type,
-                    metadata=field
-                )
-                fields[field_name] = field_info
-
-            return fields
+            describe_fields = data.get('fields', [])
+            self._write_cached_fields(sobj_type, describe_fields)
+            return self._build_field_info(sobj_type, describe_fields)
 
         except subprocess.TimeoutExpired:
             print(f"{Colors.RED}Error: Timeout querying {sobj_type} after 30 seconds{Colors.RESET}", file=sys.stderr)
@@ -341,6 +562,32 @@ class FieldValidator:
             sys.exit(2)
 
 
+def _direct_assignments(content: str):
+    """Yield APEX_DIRECT_PATTERN's matches in content, as finditer does."""
+    # hyperscan offsets are byte offsets and its \w is ASCII only, so
+    # other text goes through re
+    if HS_DIRECT_DATABASE is None or not content.isascii():
+        yield from APEX_DIRECT_PATTERN.finditer(content)
+        return
+
+    # Direct assignments end at their '=' and can't contain another, so
+    # they never overlap and each start found is one finditer match
+    starts: List[int] = []
+    HS_DIRECT_DATABASE.scan(
+        content.encode('ascii'),
+        match_event_handler=lambda _id, start, _end, _flags, _context: starts.append(start),
+    )
+    for start in starts:
+        if content[start] in _HS_PREFIX_CHARS:
+            start += 1
+        yield APEX_DIRECT_PATTERN.match(content, start)
+
+
+def _scan_file(file_path: Path, verbose: bool) -> Optional[Dict[str, Set[str]]]:
+    """Scan one file in a worker process (module-level so it can be pickled)."""
+    return FieldValidator('', verbose)._scan_file(file_path)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -352,7 +599,14 @@ def main():
     parser.add_argument('org_alias', help='Salesforce org alias')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
-    parser.add_argument('--max-issues', type=int, help='Stop after N issues')
+    parser.add_argument('--max-issues', type=int, help='Stop after N issues, without describing the remaining SObjects')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for scanning files (default: CPU count; 1 for ordered verbose output)')
+    parser.add_argument('--cache-ttl', type=int, default=DESCRIBE_CACHE_TTL,
+                        help=f'Seconds to reuse cached SObject describes (default: {DESCRIBE_CACHE_TTL})')
+    parser.add_argument('--no-cache', action='store_true', help='Always describe SObjects from the org')
+    parser.add_argument('--exclude', action='append', default=[], metavar='DIR',
+                        help='Skip directories named DIR, in addition to node_modules, .git, etc. (repeatable)')
 
     args = parser.parse_args()
 
@@ -366,8 +620,14 @@ def main():
 
     # Run validation
     try:
-        validator = FieldValidator(args.org_alias, args.verbose)
-        issues, exit_code = validator.validate(source_dir)
+        cache_ttl = 0 if args.no_cache else args.cache_ttl
+        validator = FieldValidator(
+            args.org_alias, args.verbose, max(args.jobs, 1), cache_ttl, args.max_issues,
+            skip_dirs=SKIP_DIRS.union(args.exclude)
+        )
+        # With --json, progress goes to stderr so stdout is only the JSON
+        with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+            issues, exit_code = validator.validate(source_dir)
 
         if args.max_issues and len(issues) > args.max_issues:
             issues = issues[:args.max_issues]
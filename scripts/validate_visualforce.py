@@ -20,6 +20,11 @@ OPTIONS:
     -v, --verbose    Show detailed output for each file
     --json          Output results as JSON for CI/CD integration
     --fix           Suggest fixes for common issues (experimental)
+    --exclude DIR    Don't descend into directories named DIR (repeatable).
+                     node_modules, .git, .sfdx, .sf, dist, build, coverage,
+                     .idea and .vscode are always skipped
+    --jobs N         Worker processes for validating files (default: CPU
+                     count). Trees under 64 files are validated in-process
 
 EXAMPLES:
     # Validate all VF files
@@ -53,13 +58,17 @@ SAFETY:
     🟢 READ-ONLY - No changes made to files
     🟢 STATIC ANALYSIS - No dependencies on Salesforce
     🟢 NO EXTERNAL CALLS - Runs offline
-    🟢 XXE PROTECTED - XML parsing uses resolve_entities=False (Python 3.8+)
-                       or defusedxml if available for enhanced XXE prevention
+    🟢 XXE PROTECTED - XML parsing uses resolve_entities=False (Python 3.8+),
+                       lxml without entity resolution or network access, or
+                       defusedxml if available for enhanced XXE prevention
     🟢 PATH TRAVERSAL PROTECTED - Validates file paths to prevent symlink attacks
 
 REQUIREMENTS:
     Python 3.8+
+    Optional: lxml (pip install lxml) for faster parsing of large trees
     Optional: defusedxml (pip install defusedxml) for enhanced XXE protection
+    Optional: orjson (pip install orjson) for faster --json output
+    Optional: hyperscan (pip install hyperscan) for faster -v XSS checks
     Built-in protection available in Python 3.8+ via ElementTree.XMLParser
 
 SUPPORTED VF COMPONENTS:
@@ -68,26 +77,70 @@ SUPPORTED VF COMPONENTS:
     - lightning:* (Lightning web components - warns if in VF)
 """
 
+import contextlib
+import io
 import json
+import os
 import re
+import stat
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from xml.etree import ElementTree as ET
 import argparse
 
-# Security: Use defusedxml to prevent XXE attacks if available
+# Shared with the other local validator; lives next to this script
+from source_files import PARALLEL_MIN_FILES, PYTHON_ASCII_SPACE, SKIP_DIRS, find_files
+
+# Security: Use lxml or defusedxml to prevent XXE attacks if available
 # Python 3.8+ has built-in protections against billion laughs/quadratic blowup attacks
 try:
-    from defusedxml import ElementTree as DefusedET
-    SAFE_XML_PARSE = DefusedET.fromstring
-    SECURITY_LEVEL = "HIGH"  # defusedxml provides comprehensive XXE protection
+    # lxml parses in C, faster than ElementTree. One parser is reused for
+    # every file; entities are never resolved or fetched, and comments and
+    # processing instructions are dropped, as ElementTree drops them.
+    from lxml import etree as LET
+
+    _LXML_PARSER = LET.XMLParser(
+        resolve_entities=False, no_network=True, huge_tree=False,
+        remove_comments=True, remove_pis=True, encoding='utf-8'
+    )
+
+    def SAFE_XML_PARSE(text: str):
+        """Parse text with lxml, raising ET.ParseError as ElementTree does."""
+        try:
+            return LET.fromstring(text.encode('utf-8'), _LXML_PARSER)
+        except LET.XMLSyntaxError as e:
+            error = ET.ParseError(e.msg)
+            error.position = e.position
+            raise error from None
+
+    SECURITY_LEVEL = "HIGH"  # no entity expansion, no network access
 except ImportError:
-    # Python 3.8+ secure fallback: use standard ElementTree which has entity limits
-    # In Python 3.13+, there are additional protections against entity expansion attacks
-    # Reference: https://docs.python.org/3.8/library/xml.html#xml-vulnerabilities
-    SAFE_XML_PARSE = ET.fromstring
-    SECURITY_LEVEL = "MEDIUM"  # Python 3.8+ has default entity expansion limits
+    try:
+        from defusedxml import ElementTree as DefusedET
+        SAFE_XML_PARSE = DefusedET.fromstring
+        SECURITY_LEVEL = "HIGH"  # defusedxml provides comprehensive XXE protection
+    except ImportError:
+        # Python 3.8+ secure fallback: use standard ElementTree which has entity limits
+        # In Python 3.13+, there are additional protections against entity expansion attacks
+        # Reference: https://docs.python.org/3.8/library/xml.html#xml-vulnerabilities
+        SAFE_XML_PARSE = ET.fromstring
+        SECURITY_LEVEL = "MEDIUM"  # Python 3.8+ has default entity expansion limits
+
+# Optional: orjson serializes large --json reports several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: hyperscan searches for all the XSS patterns in one pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 
 class Colors:
@@ -119,16 +172,88 @@ VF_KNOWN_ISSUES = {
 }
 
 
+# Patterns for potentially unescaped output (XSS), compiled once at import.
+# Anything the second matches contains a match of the first.
+XSS_PATTERNS = (
+    (re.compile(r'{\s*!\s*\w+\s*}'), 'Potentially unescaped output - use {!$HtmlEncode(var)}'),
+    (re.compile(r'apex:outputText\s+value\s*=\s*"{\s*!\s*\w+\s*}"'), 'Use escape="false" carefully'),
+)
+
+# XSS_PATTERNS for hyperscan, in the same order; each pattern's id is its
+# index. Python's \s is spelled out, so both engines agree on ASCII text.
+_HS_SPACE = f'[{PYTHON_ASCII_SPACE}]'
+_HS_XSS_EXPRESSIONS = (
+    rf'\{{{_HS_SPACE}*!{_HS_SPACE}*\w+{_HS_SPACE}*\}}',
+    rf'apex:outputText{_HS_SPACE}+value{_HS_SPACE}*={_HS_SPACE}*"\{{{_HS_SPACE}*!{_HS_SPACE}*\w+{_HS_SPACE}*\}}"',
+)
+
+if hyperscan is not None:
+    HS_XSS_DATABASE = hyperscan.Database()
+    HS_XSS_DATABASE.compile(
+        expressions=[expression.encode('ascii') for expression in _HS_XSS_EXPRESSIONS],
+        ids=list(range(len(_HS_XSS_EXPRESSIONS))),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_HS_XSS_EXPRESSIONS),
+    )
+else:
+    HS_XSS_DATABASE = None
+
+# Deprecated tag advice keyed by both 'apex:include' and bare 'include', the
+# two names _check_elements matches a tag name against. Earlier keys win,
+# as they did when the rules were searched in order.
+DEPRECATED_TAG_REPLACEMENTS: Dict[str, str] = {}
+for _key, _replacement in VF_KNOWN_ISSUES['deprecated_tags'].items():
+    DEPRECATED_TAG_REPLACEMENTS.setdefault(_key.split(':')[-1], _replacement)
+    DEPRECATED_TAG_REPLACEMENTS.setdefault(_key, _replacement)
+
+
+@lru_cache(maxsize=None)
+def _parse_tag(tag: str) -> Tuple[str, str, Tuple[str, ...], Optional[str]]:
+    """
+    Return (full tag, tag name, unsupported attributes, deprecation advice) for an element tag.
+
+    The full tag is '<namespace URI>:<tag name>'. Unsupported attributes
+    are listed in rule order; rule tags match as substrings of the full
+    tag, so e.g. the 'apex:page' rule also applies to apex:pageBlock.
+    A page repeats the same few tags, so all of this is worked out once
+    per distinct tag rather than on every element.
+    """
+    # Extract namespace and tag name
+    if '}' in tag:
+        namespace, tagname = tag.split('}')
+        namespace = namespace[1:]  # Remove leading {
+    else:
+        namespace = ''
+        tagname = tag
+
+    full_tag = f"{namespace}:{tagname}" if namespace else tagname
+    unsupported = tuple(
+        attr
+        for base_tag, unsupported_attrs in VF_KNOWN_ISSUES['unsupported_attributes'].items()
+        if base_tag in full_tag or full_tag.endswith(base_tag)
+        for attr in unsupported_attrs
+    )
+    return full_tag, tagname, unsupported, DEPRECATED_TAG_REPLACEMENTS.get(tagname)
+
+
+# Files handed to a worker process at a time
+VALIDATE_CHUNK_SIZE = 16
+
+
 class VFValidator:
     """Main validator for Visualforce files."""
 
-    def __init__(self, verbose: bool = False, fix_suggestions: bool = False, source_dir: Optional[Path] = None):
+    def __init__(self, verbose: bool = False, fix_suggestions: bool = False, source_dir: Optional[Path] = None,
+                 skip_dirs: frozenset = SKIP_DIRS, jobs: int = 1):
         self.verbose: bool = verbose
+        self.skip_dirs: frozenset = skip_dirs
+        self.jobs: int = jobs
         self.fix_suggestions: bool = fix_suggestions
         self.issues: List[Dict] = []
         self.files_checked: int = 0
         self.source_dir: Optional[Path] = source_dir
+        self._source_dir_prefix: str = os.path.join(str(source_dir), '') if source_dir else ''
         self.MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+        self.MAX_ELEMENTS: int = 100_000
 
     def validate(self, source_dir: Path) -> Tuple[List[Dict], int]:
         """
@@ -141,9 +266,10 @@ class VFValidator:
             raise FileNotFoundError(f"Directory not found: {source_dir}")
 
         self.source_dir = source_dir.resolve()
+        self._source_dir_prefix = os.path.join(str(self.source_dir), '')
 
         # Find all VF files
-        vf_files = list(source_dir.glob('**/*.page')) + list(source_dir.glob('**/*.component'))
+        vf_files = find_files(source_dir, ('.page', '.component'), self.skip_dirs)
 
         if not vf_files:
             print(f"{Colors.YELLOW}No Visualforce files found in {source_dir}{Colors.RESET}")
@@ -151,29 +277,75 @@ class VFValidator:
 
         print(f"{Colors.BLUE}Scanning {len(vf_files)} Visualforce files...{Colors.RESET}\n")
 
-        for file_path in vf_files:
-            self._validate_file(file_path)
-            self.files_checked += 1
+        # Each file is parsed and checked independently, so large trees are
+        # spread over worker processes. Their issues and output are merged
+        # back in file order, exactly as a single process would report.
+        if self.jobs > 1 and len(vf_files) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = executor.map(
+                    _validate_file_worker, vf_files,
+                    repeat(self.verbose), repeat(self.fix_suggestions), repeat(self.source_dir),
+                    chunksize=VALIDATE_CHUNK_SIZE
+                )
+                for issues, output in results:
+                    self.issues.extend(issues)
+                    sys.stdout.write(output)
+                    self.files_checked += 1
+        else:
+            for file_path in vf_files:
+                self._validate_file(file_path)
+                self.files_checked += 1
 
         return self.issues, 1 if self.issues else 0
 
     def _validate_file(self, file_path: Path):
         """Validate a single Visualforce file."""
-        # Security: Check for path traversal (symlink attacks)
+        with self._buffered_output():
+            self._check_file(file_path)
+
+    def _validate_source(self, content: str, origin: str):
+        """Validate Visualforce source already in memory, reporting it as the file origin."""
+        with self._buffered_output():
+            self._check_source(Path(origin), content)
+
+    @contextlib.contextmanager
+    def _buffered_output(self):
+        """Collect report lines in self._output, writing them out together at the end."""
+        # A file's report lines are written together once it is done,
+        # rather than one print (and, on a terminal, one flush) each
+        self._output: List[str] = []
+        try:
+            yield
+        finally:
+            if self._output:
+                self._output.append('')
+                sys.stdout.write('\n'.join(self._output))
+
+    def _check_file(self, file_path: Path):
+        """Run every check on one Visualforce file, reporting into self._output."""
+        # Security: Check for path traversal (symlink attacks). find_files
+        # never enters symlinked directories, so only a file that is itself
+        # a symlink can lead outside source_dir; only those are resolved.
         try:
-            resolved = file_path.resolve()
-            if self.source_dir and not str(resolved).startswith(str(self.source_dir)):
+            try:
+                link_stat = os.lstat(file_path)
+            except OSError:
+                link_stat = None  # reported by the size check
+            is_link = link_stat is not None and stat.S_ISLNK(link_stat.st_mode)
+            if (self.source_dir and is_link
+                    and not str(file_path.resolve()).startswith(self._source_dir_prefix)):
                 if self.verbose:
-                    print(f"  {Colors.YELLOW}⚠{Colors.RESET} {file_path.name}: Outside source directory (potential symlink attack)")
+                    self._output.append(f"  {Colors.YELLOW}⚠{Colors.RESET} {file_path.name}: Outside source directory (potential symlink attack)")
                 return
         except (OSError, ValueError):
             if self.verbose:
-                print(f"  Skipped: {file_path.name} (invalid path)")
+                self._output.append(f"  Skipped: {file_path.name} (invalid path)")
             return
 
-        # Security: Check file size to prevent DoS
+        # Security: Check file size to prevent DoS. Unless the file is a
+        # symlink, the lstat above already is its stat.
         try:
-            file_size = file_path.stat().st_size
+            file_size = (file_path.stat() if link_stat is None or is_link else link_stat).st_size
             if file_size > self.MAX_FILE_SIZE:
                 issue = {
                     'type': 'FILE_TOO_LARGE',
@@ -182,25 +354,29 @@ class VFValidator:
                     'message': f'File exceeds maximum size ({file_size} > {self.MAX_FILE_SIZE} bytes)'
                 }
                 self.issues.append(issue)
-                print(f"  {Colors.YELLOW}⚠{Colors.RESET} {file_path.name}: File too large (skipped)")
+                self._output.append(f"  {Colors.YELLOW}⚠{Colors.RESET} {file_path.name}: File too large (skipped)")
                 return
         except OSError:
             if self.verbose:
-                print(f"  Skipped: {file_path.name} (cannot stat file)")
+                self._output.append(f"  Skipped: {file_path.name} (cannot stat file)")
             return
 
         try:
             content = file_path.read_text(encoding='utf-8')
         except UnicodeDecodeError:
             if self.verbose:
-                print(f"  Skipped: {file_path.name} (encoding error)")
+                self._output.append(f"  Skipped: {file_path.name} (encoding error)")
             return
 
+        self._check_source(file_path, content)
+
+    def _check_source(self, file_path: Path, content: str):
+        """Parse one file's content and run the XML and pattern checks on it."""
         # Parse XML with XXE protection
         try:
             root = SAFE_XML_PARSE(content)
             if self.verbose:
-                print(f"  {Colors.GREEN}✓{Colors.RESET} {file_path.name}")
+                self._output.append(f"  {Colors.GREEN}✓{Colors.RESET} {file_path.name}")
         except ET.ParseError as e:
             issue = {
                 'type': 'SYNTAX_ERROR',
@@ -209,117 +385,96 @@ class VFValidator:
                 'message': f'Invalid XML syntax: {str(e)[:100]}'
             }
             self.issues.append(issue)
-            print(f"  {Colors.RED}✗{Colors.RESET} {file_path.name}: {Colors.RED}XML Syntax Error{Colors.RESET}")
+            self._output.append(f"  {Colors.RED}✗{Colors.RESET} {file_path.name}: {Colors.RED}XML Syntax Error{Colors.RESET}")
             return
 
-        # Check for unsupported attributes
-        self._check_unsupported_attributes(file_path, root)
-
-        # Check for deprecated tags
-        self._check_deprecated_tags(file_path, root)
+        # Check for unsupported attributes and deprecated tags
+        self._check_elements(file_path, root)
 
         # Check for common patterns
         self._check_common_patterns(file_path, content)
 
-    def _check_unsupported_attributes(self, file_path: Path, root: ET.Element):
-        """Check for unsupported attributes on VF components."""
-        for elem in root.iter():
-            tag = elem.tag
-            attrs = elem.attrib
+    def _check_elements(self, file_path: Path, root: ET.Element):
+        """Check every element for unsupported attributes and deprecated tags, in one walk."""
+        deprecated: List[Tuple[str, str]] = []
 
-            # Extract namespace and tag name
-            if '}' in tag:
-                namespace, tagname = tag.split('}')
-                namespace = namespace[1:]  # Remove leading {
-            else:
-                namespace = ''
-                tagname = tag
-
-            # Build tag key for lookup
-            full_tag = f"{namespace}:{tagname}" if namespace else tagname
-
-            # Check if this tag has known unsupported attributes
-            for base_tag, unsupported_attrs in VF_KNOWN_ISSUES.get('unsupported_attributes', {}).items():
-                if base_tag in full_tag or full_tag.endswith(base_tag):
-                    for attr in unsupported_attrs:
-                        if attr in attrs:
-                            fix = ""
-                            if attr == 'dir':
-                                fix = "Use CSS instead: <div style=\"direction: rtl;\">"
-
-                            issue = {
-                                'type': 'UNSUPPORTED_ATTRIBUTE',
-                                'file': str(file_path),
-                                'element': full_tag,
-                                'attribute': attr,
-                                'severity': 'error',
-                                'message': f'Unsupported attribute "{attr}" on {full_tag}',
-                                'suggestion': fix
-                            }
-                            self.issues.append(issue)
-                            print(
-                                f"  {Colors.RED}✗ {file_path.name}:{Colors.RESET} "
-                                f"Unsupported attr: {full_tag}@{attr}"
-                            )
-
-    def _check_deprecated_tags(self, file_path: Path, root: ET.Element):
-        """Check for deprecated Visualforce tags."""
-        for elem in root.iter():
-            tag = elem.tag
-
-            # Extract just the tag name (everything after the closing brace)
-            if '}' in tag:
-                tagname = tag.split('}')[1]
-            else:
-                tagname = tag
+        # '*' skips the unresolved entity nodes lxml leaves in the tree
+        for count, elem in enumerate(root.iter('*'), 1):
+            # Security: Stop walking pathologically large trees to prevent DoS
+            if count > self.MAX_ELEMENTS:
+                issue = {
+                    'type': 'TOO_MANY_ELEMENTS',
+                    'file': str(file_path),
+                    'severity': 'warning',
+                    'message': f'File has more than {self.MAX_ELEMENTS} elements (rest not checked)'
+                }
+                self.issues.append(issue)
+                self._output.append(f"  {Colors.YELLOW}⚠{Colors.RESET} {file_path.name}: Too many elements (rest skipped)")
+                break
 
-            # Build the common key format for lookup (namespace:tagname)
-            # For apex tags, this is "apex:tagname"
-            # We check deprecated_tags with just the tag name since that's what's keyed
-            deprecated_info = None
+            full_tag, tagname, unsupported, deprecated_info = _parse_tag(elem.tag)
 
-            # Check against known deprecated tags
-            for key in VF_KNOWN_ISSUES.get('deprecated_tags', {}).keys():
-                # Key is like 'apex:include', we extract 'include' from that and match
-                key_tagname = key.split(':')[-1] if ':' in key else key
-                if tagname == key_tagname or tagname == key:
-                    deprecated_info = VF_KNOWN_ISSUES['deprecated_tags'][key]
-                    break
+            if unsupported:
+                self._check_unsupported_attributes(file_path, full_tag, unsupported, elem.attrib)
 
             if deprecated_info:
-                display_tag = f"apex:{tagname}" if tagname else tag
+                display_tag = f"apex:{tagname}" if tagname else elem.tag
+                deprecated.append((display_tag, deprecated_info))
+
+        # Reported after all unsupported attributes, in document order
+        for display_tag, deprecated_info in deprecated:
+            issue = {
+                'type': 'DEPRECATED_TAG',
+                'file': str(file_path),
+                'tag': display_tag,
+                'severity': 'warning',
+                'message': f'Deprecated tag: {display_tag}',
+                'suggestion': f'Replace with: {deprecated_info}'
+            }
+            self.issues.append(issue)
+            self._output.append(f"  {Colors.YELLOW}⚠ {file_path.name}:{Colors.RESET} Deprecated: {display_tag}")
+
+    def _check_unsupported_attributes(self, file_path: Path, full_tag: str, unsupported: Tuple[str, ...],
+                                      attrs: Dict[str, str]):
+        """Check one element for the attributes known to be unsupported on its tag."""
+        for attr in unsupported:
+            if attr in attrs:
+                fix = ""
+                if attr == 'dir':
+                    fix = "Use CSS instead: <div style=\"direction: rtl;\">"
+
                 issue = {
-                    'type': 'DEPRECATED_TAG',
+                    'type': 'UNSUPPORTED_ATTRIBUTE',
                     'file': str(file_path),
-                    'tag': display_tag,
-                    'severity': 'warning',
-                    'message': f'Deprecated tag: {display_tag}',
-                    'suggestion': f'Replace with: {deprecated_info}'
+                    'element': full_tag,
+                    'attribute': attr,
+                    'severity': 'error',
+                    'message': f'Unsupported attribute "{attr}" on {full_tag}',
+                    'suggestion': fix
                 }
                 self.issues.append(issue)
-                print(f"  {Colors.YELLOW}⚠ {file_path.name}:{Colors.RESET} Deprecated: {display_tag}")
+                self._output.append(
+                    f"  {Colors.RED}✗ {file_path.name}:{Colors.RESET} "
+                    f"Unsupported attr: {full_tag}@{attr}"
+                )
 
     def _check_common_patterns(self, file_path: Path, content: str):
         """Check for common problematic patterns."""
-        # Check for unescaped output (potential XSS)
-        xss_patterns = [
-            (r'{\s*!\s*\w+\s*}', 'Potentially unescaped output - use {!$HtmlEncode(var)}'),
-            (r'apex:outputText\s+value\s*=\s*"{\s*!\s*\w+\s*}"', 'Use escape="false" carefully'),
-        ]
-
-        for pattern, message in xss_patterns:
-            if re.search(pattern, content):
-                if self.verbose:
-                    issue = {
-                        'type': 'POTENTIAL_XSS',
-                        'file': str(file_path),
-                        'severity': 'warning',
-                        'message': message
-                    }
-                    self.issues.append(issue)
-
-        # Check for missing slds attribute
-        if 'slds' not in content.lower() and '<apex:page' in content:
+        # Check for unescaped output (potential XSS). These are only
+        # reported in verbose mode, so only searched for then.
+        if self.verbose:
+            for message in _xss_messages(content):
+                issue = {
+                    'type': 'POTENTIAL_XSS',
+                    'file': str(file_path),
+                    'severity': 'warning',
+                    'message': message
+                }
+                self.issues.append(issue)
+
+        # Check for missing slds attribute. Only pages can miss it, so
+        # components are never lowercased.
+        if '<apex:page' in content and 'slds' not in content.lower():
             issue = {
                 'type': 'MISSING_SLDS',
                 'file': str(file_path),
@@ -329,7 +484,48 @@ class VFValidator:
             }
             self.issues.append(issue)
             if self.verbose:
-                print(f"  {Colors.YELLOW}ℹ {file_path.name}:{Colors.RESET} Missing SLDS")
+                self._output.append(f"  {Colors.YELLOW}ℹ {file_path.name}:{Colors.RESET} Missing SLDS")
+
+
+def _xss_messages(content: str) -> List[str]:
+    """Return the messages of the XSS_PATTERNS found in content, in order."""
+    # hyperscan's \w is ASCII only, so other text goes through re
+    if HS_XSS_DATABASE is None or not content.isascii():
+        messages = []
+        for pattern, message in XSS_PATTERNS:
+            if not pattern.search(content):
+                break  # later patterns can't match either
+            messages.append(message)
+        return messages
+
+    # The last pattern implies all the others, so the scan can stop there
+    found = set()
+    last = len(XSS_PATTERNS) - 1
+
+    def on_match(pattern_id, _start, _end, _flags, _context):
+        found.add(pattern_id)
+        return pattern_id == last
+
+    try:
+        HS_XSS_DATABASE.scan(content.encode('ascii'), match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass  # stopped by on_match
+    messages = []
+    for pattern_id, (_pattern, message) in enumerate(XSS_PATTERNS):
+        if pattern_id not in found:
+            break
+        messages.append(message)
+    return messages
+
+
+def _validate_file_worker(file_path: Path, verbose: bool, fix_suggestions: bool,
+                          source_dir: Optional[Path]) -> Tuple[List[Dict], str]:
+    """Validate one file in a worker process, returning its issues and printed output."""
+    validator = VFValidator(verbose, fix_suggestions, source_dir)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        validator._validate_file(file_path)
+    return validator.issues, output.getvalue()
 
 
 def main():
@@ -343,6 +539,10 @@ def main():
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
     parser.add_argument('--fix', action='store_true', help='Show fix suggestions')
+    parser.add_argument('--exclude', action='append', default=[], metavar='DIR',
+                        help='Skip directories named DIR, in addition to node_modules, .git, etc. (repeatable)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for validating files (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -353,7 +553,7 @@ def main():
         sys.exit(2)
 
     try:
-        validator = VFValidator(args.verbose, args.fix)
+        validator = VFValidator(args.verbose, args.fix, skip_dirs=SKIP_DIRS.union(args.exclude), jobs=max(args.jobs, 1))
         issues, exit_code = validator.validate(source_dir)
 
         # Filter by severity for output
@@ -362,14 +562,18 @@ def main():
         infos = [i for i in issues if i.get('severity') == 'info']
 
         if args.json:
-            print(json.dumps({
+            report = {
                 'success': exit_code == 0,
                 'files_checked': validator.files_checked,
                 'errors': errors,
                 'warnings': warnings,
                 'infos': infos,
                 'total_issues': len(issues)
-            }, indent=2))
+            }
+            if orjson is not None:
+                sys.stdout.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE).decode())
+            else:
+                print(json.dumps(report, indent=2))
         else:
             print(f"\n{Colors.BOLD}Validation Summary:{Colors.RESET}")
             print(f"  Files checked: {validator.files_checked}")
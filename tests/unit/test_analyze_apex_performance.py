@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Unit tests for analyze_apex_performance.py
+
+Tests how SOQL and DML in a debug log are attributed to methods.
+"""
+
+import unittest
+from pathlib import Path
+import tempfile
+import sys
+from unittest import mock
+
+# Add scripts directory to path so we can import the analyzer
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+
+import analyze_apex_performance
+
+
+def entry(method):
+    """Return a METHOD_ENTRY log line."""
+    return f"12:00:00.0 (1)|METHOD_ENTRY|[1]|01p000000000001|{method}\n"
+
+
+def exit_line(method):
+    """Return a METHOD_EXIT log line."""
+    return f"12:00:00.0 (1)|METHOD_EXIT|[1]|01p000000000001|{method}\n"
+
+
+SOQL_LINE = "12:00:00.0 (1)|SOQL_EXECUTE_BEGIN|[5]|Aggregations:0|SELECT Id FROM Account\n"
+
+
+class TestMethodAttribution(unittest.TestCase):
+    """Tests for charging SOQL to the method that ran it."""
+
+    def parse(self, lines):
+        """Parse a debug log made of lines."""
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False, encoding='utf-8') as f:
+            f.writelines(lines)
+        self.addCleanup(Path(f.name).unlink)
+        return analyze_apex_performance.parse_debug_log(f.name)
+
+    def test_nested_methods(self):
+        """Test that SOQL after a nested call returns is charged to the caller."""
+        metrics = self.parse([
+            entry('Outer.run()'), entry('Inner.run()'), SOQL_LINE, exit_line('Inner.run()'),
+            SOQL_LINE, exit_line('Outer.run()'),
+        ])
+
+        self.assertEqual(metrics['soql_by_method'], {'Inner.run()': 1, 'Outer.run()': 1})
+
+    def test_depth_overflow_keeps_tracked_frames(self):
+        """Test that exits of entries past the depth cap don't pop tracked frames."""
+        with mock.patch.object(analyze_apex_performance, 'MAX_METHOD_DEPTH', 2):
+            metrics = self.parse([
+                entry('A.run()'), entry('B.run()'), entry('C.run()'), entry('D.run()'),
+                exit_line('D.run()'), exit_line('C.run()'),
+                SOQL_LINE, exit_line('B.run()'),
+                SOQL_LINE, exit_line('A.run()'),
+            ])
+
+        self.assertEqual(metrics['soql_by_method'], {'B.run()': 1, 'A.run()': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for emergency_rollback.py
+
+Tests loading backup CSV files, without an org.
+"""
+
+import unittest
+from pathlib import Path
+import tempfile
+import io
+import contextlib
+import sys
+from unittest import mock
+
+# Add scripts directory to path so we can import the rollback script
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+
+import emergency_rollback
+
+
+class TestLoadBackupCsv(unittest.TestCase):
+    """Tests for reading a backup CSV into a header and rows."""
+
+    def setUp(self):
+        """Create a temporary directory for backup files."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def load(self, content):
+        """Write content to a backup file and load it."""
+        csv_file = Path(self.tmp.name) / 'backup.csv'
+        csv_file.write_text(content, encoding='utf-8')
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            header, rows = emergency_rollback.load_backup_csv(csv_file)
+        return header, rows, output.getvalue()
+
+    def test_rows_loaded(self):
+        """Test that every record after the header is loaded."""
+        header, rows, _ = self.load("Id,Name\n001A,Acme\n001B,Globex\n")
+
+        self.assertEqual(header, ['Id', 'Name'])
+        self.assertEqual(rows, [['001A', 'Acme'], ['001B', 'Globex']])
+
+    def test_blank_lines_skipped(self):
+        """Test that blank lines aren't loaded or counted as records."""
+        _, rows, output = self.load("Id,Name\n001A,Acme\n\n001B,Globex\n\n")
+
+        self.assertEqual(rows, [['001A', 'Acme'], ['001B', 'Globex']])
+        self.assertIn('Loaded 2 records', output)
+
+    def test_quoted_newline_kept(self):
+        """Test that a newline inside a quoted value stays in its record."""
+        _, rows, _ = self.load('Id,Description\n001A,"line one\n\nline three"\n')
+
+        self.assertEqual(rows, [['001A', 'line one\n\nline three']])
+
+
+class TestGetCurrentRecords(unittest.TestCase):
+    """Tests for fetching the backup's records from the org in batches."""
+
+    def setUp(self):
+        """Query over the CLI path, without a REST session."""
+        patcher = mock.patch.object(emergency_rollback, 'get_api_session', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, failing_id=None):
+        """Fetch 3 batches of IDs; the batch holding failing_id gets bad output."""
+        record_ids = [f'001{i:015d}' for i in range(emergency_rollback.ID_BATCH_SIZE * 2 + 1)]
+
+        def run_command(cmd):
+            if failing_id and failing_id in cmd[4]:
+                return b'not json'
+            return b'{"status": 0, "result": {"records": [{"Id": "001A"}]}}'
+
+        with mock.patch.object(emergency_rollback, 'run_command', side_effect=run_command), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return emergency_rollback.get_current_records('Account', record_ids, 'test-org')
+
+    def test_batches_joined(self):
+        """Test that every batch's records are returned."""
+        records = self.fetch()
+
+        self.assertEqual(records, [{'Id': '001A'}] * 3)
+
+    def test_failed_batch_aborts(self):
+        """Test that a batch that can't be read stops the rollback."""
+        with self.assertRaises(SystemExit) as raised:
+            self.fetch(failing_id=f'001{emergency_rollback.ID_BATCH_SIZE:015d}')
+        self.assertEqual(raised.exception.code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for find_duplicates.py
+
+Tests how duplicate groups are batched into records queries, without an org.
+"""
+
+import unittest
+from pathlib import Path
+from urllib.parse import quote
+import sys
+
+# Add scripts directory to path so we can import the duplicate finder
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+
+import find_duplicates
+
+
+class TestBatchWhereClauses(unittest.TestCase):
+    """Tests for splitting duplicate groups into records queries."""
+
+    fields = ['FirstName', 'LastName', 'Email']
+
+    def test_short_values_fill_group_cap(self):
+        """Test that short values batch up to GROUPS_PER_QUERY groups."""
+        field_values = [{'LastName': f'N{i}'} for i in range(find_duplicates.GROUPS_PER_QUERY + 1)]
+        batches = list(find_duplicates.batch_where_clauses(['LastName'], field_values))
+
+        self.assertEqual([len(batch) for batch, _ in batches], [find_duplicates.GROUPS_PER_QUERY, 1])
+
+    def test_long_values_stay_within_budget(self):
+        """Test that long values across several fields close batches early."""
+        field_values = [
+            {
+                'FirstName': f"Jean-Marie {i} d'Artagnan " * 3,
+                'LastName': f'Ünïcödé & {i} ' * 5,
+                'Email': f'someone.with.a.long.address+{i}@example.com',
+            }
+            for i in range(find_duplicates.GROUPS_PER_QUERY)
+        ]
+        batches = list(find_duplicates.batch_where_clauses(self.fields, field_values))
+
+        self.assertGreater(len(batches), 1)
+        for batch, where_clause in batches:
+            self.assertLessEqual(len(quote(where_clause)), find_duplicates.WHERE_CLAUSE_BUDGET)
+            self.assertEqual(where_clause.count(' OR '), len(batch) - 1)
+        self.assertEqual(sum(len(batch) for batch, _ in batches), len(field_values))
+
+    def test_oversized_group_gets_own_batch(self):
+        """Test that a group longer than the budget is still queried, alone."""
+        field_values = [
+            {'LastName': 'short'},
+            {'LastName': 'x' * find_duplicates.WHERE_CLAUSE_BUDGET},
+            {'LastName': 'short again'},
+        ]
+        batches = list(find_duplicates.batch_where_clauses(['LastName'], field_values))
+
+        self.assertEqual([len(batch) for batch, _ in batches], [1, 1, 1])
+
+    def test_null_values_left_out(self):
+        """Test that a null match value adds no condition."""
+        batches = list(find_duplicates.batch_where_clauses(
+            self.fields, [{'FirstName': None, 'LastName': 'Smith', 'Email': "o'neil@example.com"}]
+        ))
+
+        self.assertEqual(batches[0][1], "(LastName = 'Smith' AND Email = 'o\\'neil@example.com')")
+
+
+class TestMatchKey(unittest.TestCase):
+    """Tests for the key that puts records into duplicate groups."""
+
+    def test_case_folded(self):
+        """Test that strings differing only in case share a key."""
+        match_key = find_duplicates.match_key_function(['LastName', 'Email'])
+
+        self.assertEqual(
+            match_key({'LastName': 'Smith', 'Email': 'A@B.com'}),
+            match_key({'LastName': 'SMITH', 'Email': 'a@b.com'})
+        )
+
+    def test_missing_field_is_none(self):
+        """Test that a field the record lacks gives None instead of raising."""
+        self.assertEqual(find_duplicates.match_key_function(['email'])({'Email': 'a@b.com'}), (None,))
+        self.assertEqual(
+            find_duplicates.match_key_function(['Account.Name', 'LastName'])(
+                {'Account': {'Name': 'Acme'}, 'LastName': 'Smith'}
+            ),
+            (None, 'smith')
+        )
+
+
+class TestFieldValues(unittest.TestCase):
+    """Tests for reading match field values for the report and CSV."""
+
+    def test_missing_field_gets_default(self):
+        """Test that a field the record lacks gives the default."""
+        field_values = find_duplicates.field_values_function(['LastName', 'Email'], 'N/A')
+
+        self.assertEqual(field_values({'LastName': 'Smith'}), ('Smith', 'N/A'))
+        self.assertEqual(find_duplicates.field_values_function(['Email'], '')({}), ('',))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Unit tests for profile_soql.py
+
+Tests batch profiling and the selectivity shortcuts, without an org.
+"""
+
+import unittest
+from pathlib import Path
+import tempfile
+import io
+import contextlib
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from unittest import mock
+
+# Add scripts directory to path so we can import the profiler
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+
+import profile_soql
+
+
+def failing_run(cmd, check=False, **kwargs):
+    """Stand in for subprocess.run with an sf command that fails."""
+    if check:
+        raise subprocess.CalledProcessError(1, cmd, output=b'', stderr=b'INVALID_TYPE')
+    return subprocess.CompletedProcess(cmd, 1, stdout=b'', stderr=b'INVALID_TYPE')
+
+
+class TestBatchCountFailure(unittest.TestCase):
+    """Tests for a failing COUNT() during --input-file profiling."""
+
+    def setUp(self):
+        """Run without a REST session, cache or real queries."""
+        profile_soql.get_total_count.cache_clear()
+        self.addCleanup(profile_soql.get_total_count.cache_clear)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        result = {
+            'execution_time_ms': 10, 'wall_time_ms': 10, 'server_timing': False,
+            'record_count': 1, 'records': []
+        }
+        for target, kwargs in (
+            ('CACHE_DIR', {'new': Path(self.tmp.name)}),
+            ('get_api_session', {'return_value': None}),
+            ('execute_query_with_timing', {'return_value': result}),
+            ('get_indexed_fields', {'return_value': profile_soql.STANDARD_INDEXED_FIELDS}),
+        ):
+            patcher = mock.patch.object(profile_soql, target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_failed_count_doesnt_stop_batch(self):
+        """Test that a COUNT() the CLI rejects leaves the rest of the batch running."""
+        input_file = Path(self.tmp.name) / 'queries.txt'
+        input_file.write_text(
+            "SELECT Id FROM Missing__c WHERE Name = 'a'\n"
+            "SELECT Id FROM Account WHERE Name = 'b'\n",
+            encoding='utf-8'
+        )
+        output = io.StringIO()
+        with mock.patch('subprocess.run', side_effect=failing_run), contextlib.redirect_stdout(output):
+            failed = profile_soql.profile_batch(input_file, 'test-org', 2)
+
+        self.assertEqual(failed, 0)
+        self.assertIn('BATCH SUMMARY: 2 profiled, 0 failed', output.getvalue())
+
+    def test_errors_printed_under_their_query(self):
+        """Test that a failing query's error follows its own header, not another's."""
+        input_file = Path(self.tmp.name) / 'queries.txt'
+        input_file.write_text(
+            "SELECT Id FROM Missing__c WHERE Name = 'a'\n"
+            "SELECT Id FROM Account WHERE Name = 'b'\n",
+            encoding='utf-8'
+        )
+        result = profile_soql.execute_query_with_timing.return_value
+
+        def execute_query_with_timing(query, org_alias, warm=False, out=None):
+            if 'Missing__c' in query:
+                print("Error: INVALID_TYPE", file=out)
+                return None
+            time.sleep(0.05)
+            return result
+
+        output = io.StringIO()
+        with mock.patch.object(profile_soql, 'execute_query_with_timing', side_effect=execute_query_with_timing), \
+                mock.patch('subprocess.run', side_effect=failing_run), contextlib.redirect_stdout(output):
+            failed = profile_soql.profile_batch(input_file, 'test-org', 2)
+
+        self.assertEqual(failed, 1)
+        self.assertIn(
+            "Query: SELECT Id FROM Missing__c WHERE Name = 'a'\nError: INVALID_TYPE\n❌ Profiling failed",
+            output.getvalue()
+        )
+
+    def test_failed_count_returns_none(self):
+        """Test that get_total_count returns None rather than exiting."""
+        with mock.patch('subprocess.run', side_effect=failing_run), contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(profile_soql.get_total_count('Missing__c', 'test-org'))
+
+
+class TestProfileQueryTiming(unittest.TestCase):
+    """Tests for keeping the timed query clear of the other fetches."""
+
+    def test_cli_query_timed_alone(self):
+        """Test that over the CLI no count or describe runs during the timed query."""
+        events = []
+
+        def execute_query_with_timing(query, org_alias, warm=False, out=None):
+            events.append('query start')
+            time.sleep(0.05)
+            events.append('query end')
+            return {
+                'execution_time_ms': 50, 'wall_time_ms': 50, 'server_timing': False,
+                'record_count': 1, 'records': []
+            }
+
+        def auxiliary(name, value):
+            return lambda *args: events.append(name) or value
+
+        for target, side_effect in (
+            ('get_api_session', lambda org_alias: None),
+            ('execute_query_with_timing', execute_query_with_timing),
+            ('get_total_count', auxiliary('count', 100)),
+            ('get_indexed_fields', auxiliary('indexed', profile_soql.STANDARD_INDEXED_FIELDS)),
+        ):
+            patcher = mock.patch.object(profile_soql, target, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        profile = profile_soql.profile_query("SELECT Id FROM Account WHERE Name = 'Acme'", 'test-org')
+
+        self.assertEqual(events[:2], ['query start', 'query end'])
+        self.assertEqual(sorted(events[2:]), ['count', 'indexed'])
+        self.assertEqual(profile['selectivity']['selectivity_pct'], 1.0)
+
+
+class TestRestTiming(unittest.TestCase):
+    """Tests for timing a query over a REST session."""
+
+    def test_pages_timed_through_public_session(self):
+        """Test that every page is fetched with the public requests session and timed."""
+        pages = [
+            {'records': [{'Id': '001A'}], 'nextRecordsUrl': '/services/data/v59.0/query/01g-2000'},
+            {'records': [{'Id': '001B'}]},
+        ]
+        responses = [
+            mock.Mock(status_code=200, elapsed=timedelta(milliseconds=120), json=mock.Mock(return_value=page))
+            for page in pages
+        ]
+        session = mock.Mock(
+            base_url='https://example.my.salesforce.com/services/data/v59.0/',
+            sf_instance='example.my.salesforce.com',
+            headers={'Authorization': 'Bearer token'},
+            spec=['base_url', 'sf_instance', 'headers', 'session'],
+        )
+        session.session.get.side_effect = responses
+
+        with mock.patch.object(profile_soql, 'get_api_session', return_value=session):
+            result = profile_soql.execute_query_with_timing('SELECT Id FROM Account', 'test-org')
+
+        self.assertEqual(result['execution_time_ms'], 240)
+        self.assertTrue(result['server_timing'])
+        self.assertEqual(result['record_count'], 2)
+        self.assertEqual(
+            session.session.get.call_args_list[1],
+            mock.call('https://example.my.salesforce.com/services/data/v59.0/query/01g-2000',
+                      headers=session.headers, params=None)
+        )
+
+
+class TestHeuristicSelectivity(unittest.TestCase):
+    """Tests for the filters that settle selectivity without a COUNT()."""
+
+    def estimate(self, query):
+        """Return the heuristic estimate for a query."""
+        return profile_soql.heuristic_selectivity(profile_soql.parse_soql(query))
+
+    def test_own_id_equality(self):
+        """Test that an equality match on the object's Id selects one record."""
+        result = self.estimate("SELECT Name FROM Account WHERE Id = '001000000000001AAA'")
+        self.assertEqual(result['selectivity_pct'], 0.01)
+
+    def test_no_where_clause(self):
+        """Test that a query with no WHERE clause selects every record."""
+        result = self.estimate("SELECT Id FROM Account")
+        self.assertEqual(result['selectivity_pct'], 100.0)
+
+    def test_relationship_id_not_unique(self):
+        """Test that an Id reached through a relationship needs a count."""
+        for query in (
+            "SELECT Id FROM Opportunity WHERE Owner.Id = '005000000000001AAA'",
+            "SELECT Id FROM Contact WHERE Account.Id = '001000000000001AAA'",
+            "SELECT Id FROM Case WHERE Contact.Account.Id = '001000000000001AAA'",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(self.estimate(query))
+
+    def test_email_not_unique(self):
+        """Test that Email equality needs a count, as Email isn't unique."""
+        for query in (
+            "SELECT Id FROM Contact WHERE Email = 'a@b.com'",
+            "SELECT Id FROM Lead WHERE Email = 'a@b.com'",
+            "SELECT Id FROM Case WHERE Contact.Email = 'a@b.com'",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(self.estimate(query))
+
+    def test_id_with_or_not_unique(self):
+        """Test that an Id equality joined by OR needs a count."""
+        query = "SELECT Id FROM Account WHERE Id = '001000000000001AAA' OR Name = 'Acme'"
+        self.assertIsNone(self.estimate(query))
+
+
+if __name__ == '__main__':
+    unittest.main()
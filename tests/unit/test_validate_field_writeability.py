@@ -11,11 +11,14 @@ import tempfile
 import json
 from typing import Dict, Set
 import sys
+from unittest import mock
 
 # Add scripts directory to path so we can import the validator
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
 
-from validate_field_writeability import FieldValidator, FieldInfo
+import validate_field_writeability
+from validate_field_writeability import FieldValidator, FieldInfo, PARALLEL_MIN_FILES
+from source_files import SKIP_DIRS, find_files
 
 
 class TestFieldInfo(unittest.TestCase):
@@ -205,6 +208,39 @@ class TestCacheBehavior(unittest.TestCase):
         self.assertEqual(norm1, norm2)
 
 
+class TestDescribeCache(unittest.TestCase):
+    """Tests for the on-disk describe cache."""
+
+    def setUp(self):
+        """Point the cache at a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(validate_field_writeability, 'CACHE_DIR', Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.fields = [{'name': 'Name', 'label': 'Account Name', 'updateable': True, 'type': 'string'}]
+
+    def test_cached_describe_skips_cli(self):
+        """Test that a fresh cache entry is used without running sf."""
+        FieldValidator('test-org')._write_cached_fields('Account', self.fields)
+        with mock.patch('subprocess.run', side_effect=AssertionError('sf called')):
+            metadata = FieldValidator('test-org')._get_sobject_metadata('Account')
+        self.assertTrue(metadata['Name'].is_writeable)
+
+    def test_cache_keyed_by_org(self):
+        """Test that one org's describe isn't reused for another."""
+        FieldValidator('test-org')._write_cached_fields('Account', self.fields)
+        self.assertIsNone(FieldValidator('other-org')._read_cached_fields('Account'))
+
+    def test_no_cache(self):
+        """Test that a zero TTL neither reads nor writes the cache."""
+        FieldValidator('test-org')._write_cached_fields('Account', self.fields)
+        validator = FieldValidator('test-org', cache_ttl=0)
+        self.assertIsNone(validator._read_cached_fields('Account'))
+        validator._write_cached_fields('Contact', self.fields)
+        self.assertIsNone(FieldValidator('test-org')._read_cached_fields('Contact'))
+
+
 class TestFieldValidatorIntegration(unittest.TestCase):
     """Integration tests for FieldValidator class."""
 
@@ -226,6 +262,20 @@ class TestFieldValidatorIntegration(unittest.TestCase):
         # JS files don't have Apex pattern matching implemented yet
         self.assertEqual(len(assignments), 0)
 
+    def test_lwc_schema_field_write(self):
+        """Test detection of LWC writes through schema imports."""
+        js_code = """
+        import NAME_FIELD from '@salesforce/schema/Account.Name';
+        import RATING_FIELD from "@salesforce/schema/Account.Rating__c";
+        import OWNER_NAME from '@salesforce/schema/Account.Owner.Name';
+        const fields = {};
+        fields[NAME_FIELD.fieldApiName] = this.name;
+        fields[OWNER_NAME.fieldApiName] = this.owner;
+        if (fields[RATING_FIELD.fieldApiName] === 'Hot') {}
+        """
+        assignments = self.validator._extract_assignments(Path('accountForm.js'), js_code)
+        self.assertEqual(assignments, {'Account': {'Name'}})
+
     def test_unicode_handling(self):
         """Test handling of unicode characters in code."""
         code = "account.Name = 'טסט'; // Hebrew comment"
@@ -234,6 +284,86 @@ class TestFieldValidatorIntegration(unittest.TestCase):
         self.assertIn('Name', assignments['Account'])
 
 
+class TestFindFiles(unittest.TestCase):
+    """Tests for source file discovery."""
+
+    def test_skips_excluded_directories(self):
+        """Test that node_modules and extra excluded directories aren't searched."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ('classes/A.cls', 'lwc/b/b.js', 'node_modules/x/x.js', 'vendor/V.cls', 'classes/A.cls-meta.xml'):
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text('', encoding='utf-8')
+
+            names = [p.name for p in find_files(root, ('.cls', '.js'))]
+            self.assertEqual(sorted(names), ['A.cls', 'V.cls', 'b.js'])
+
+            names = [p.name for p in find_files(root, ('.cls', '.js'), SKIP_DIRS | {'vendor'})]
+            self.assertEqual(sorted(names), ['A.cls', 'b.js'])
+
+
+class TestParallelScan(unittest.TestCase):
+    """Tests for scanning files across worker processes."""
+
+    def test_parallel_matches_sequential(self):
+        """Test that worker processes find the same assignments as one process."""
+        with tempfile.TemporaryDirectory() as tmp:
+            files = []
+            for i in range(PARALLEL_MIN_FILES + 6):
+                path = Path(tmp) / f'Class{i}.cls'
+                path.write_text(f"account.Field{i % 7}__c = 'x';\nnew Contact(Email = 'a');\n", encoding='utf-8')
+                files.append(path)
+            bad = Path(tmp) / 'Latin1.cls'
+            bad.write_bytes(b"quote.Name = '\xe9';")
+            files.append(bad)
+
+            sequential = FieldValidator('test-org', jobs=1)._collect_assignments(files)
+            parallel = FieldValidator('test-org', jobs=2)._collect_assignments(files)
+
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(len(sequential['Account']), 7)
+        self.assertEqual(sequential['Contact'], {'Email'})
+        self.assertNotIn('Quote', sequential)  # not UTF-8, skipped
+
+
+@unittest.skipIf(validate_field_writeability.HS_DIRECT_DATABASE is None, 'hyperscan not installed')
+class TestHyperscanScan(unittest.TestCase):
+    """Tests for the hyperscan direct-assignment scan."""
+
+    def test_matches_re(self):
+        """Test that hyperscan finds the same direct assignments as re."""
+        code = (
+            "account.Name = 'x';\nfoo(a.b) ;accounts[0].Phone\t=\n1;\n"
+            "x.y.z = 1; if (a.Bc == 2) {}\n\x1cquote.Status = 'Draft';"
+        )
+        found = [match.span() for match in validate_field_writeability._direct_assignments(code)]
+        expected = [match.span() for match in validate_field_writeability.APEX_DIRECT_PATTERN.finditer(code)]
+        self.assertEqual(found, expected)
+        self.assertEqual(len(found), 3)
+
+
+class TestMaxIssues(unittest.TestCase):
+    """Tests for stopping early with --max-issues."""
+
+    def test_stops_at_max_issues(self):
+        """Test that validation stops once max_issues issues are found."""
+        read_only = {'updateable': False, 'type': 'id'}
+        validator = FieldValidator('test-org', max_issues=2)
+        for sobj in ('Account', 'Contact'):
+            validator.metadata_cache[sobj] = {
+                field: FieldInfo(field, field, sobj, read_only) for field in ('Id', 'Name', 'Phone')
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'Test.cls').write_text(
+                "account.Id = 1; account.Name = 'x'; account.Phone = 'y'; contact.Id = 2;", encoding='utf-8'
+            )
+            issues, exit_code = validator.validate(Path(tmp))
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual([(i['sobject'], i['field']) for i in issues], [('Account', 'Id'), ('Account', 'Name')])
+
+
 class TestEdgeCases(unittest.TestCase):
     """Tests for edge cases and error conditions."""
 
@@ -15,7 +15,8 @@ import sys
 # Add scripts directory to path so we can import the validator
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
 
-from validate_visualforce import VFValidator, SAFE_XML_PARSE, SECURITY_LEVEL
+import validate_visualforce
+from validate_visualforce import VFValidator, SAFE_XML_PARSE, SECURITY_LEVEL, PARALLEL_MIN_FILES
 
 
 class TestXMLSecurityParsing(unittest.TestCase):
@@ -100,20 +101,26 @@ class TestUnsupportedAttributes(unittest.TestCase):
             <apex:form></apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                # Should find unsupported attribute
-                unsupported_issues = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'UNSUPPORTED_ATTRIBUTE'
-                ]
-                self.assertGreater(len(unsupported_issues), 0)
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        # Should find unsupported attribute
+        unsupported_issues = [
+            i for i in self.validator.issues
+            if i.get('type') == 'UNSUPPORTED_ATTRIBUTE'
+        ]
+        self.assertGreater(len(unsupported_issues), 0)
+
+    def test_attributes_checked_around_entities(self):
+        """Test that entity references in the page don't stop attribute checks."""
+        xml = '''<?xml version="1.0" ?>
+        <!DOCTYPE page [<!ENTITY brand "Acme">]>
+        <apex:page xmlns:apex="http://www.force.com/2006/04/apex">
+            <apex:form name="f">&brand;</apex:form>
+        </apex:page>'''
+
+        self.validator._validate_source(xml, 'Test.page')
+        types = [i.get('type') for i in self.validator.issues]
+        self.assertIn('UNSUPPORTED_ATTRIBUTE', types)
+        self.assertNotIn('SYNTAX_ERROR', types)
 
     def test_valid_attributes_allowed(self):
         """Test that valid attributes don't raise issues."""
@@ -124,22 +131,15 @@ class TestUnsupportedAttributes(unittest.TestCase):
             <apex:form></apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                initial_issues = len(self.validator.issues)
-                self.validator._validate_file(file_path)
-                new_issues = len(self.validator.issues) - initial_issues
-                # Valid attributes shouldn't create UNSUPPORTED_ATTRIBUTE issues
-                unsupported_issues = [
-                    i for i in self.validator.issues[initial_issues:]
-                    if i.get('type') == 'UNSUPPORTED_ATTRIBUTE'
-                ]
-                self.assertEqual(len(unsupported_issues), 0)
-            finally:
-                file_path.unlink()
+        initial_issues = len(self.validator.issues)
+        self.validator._validate_source(xml, 'Test.page')
+        new_issues = len(self.validator.issues) - initial_issues
+        # Valid attributes shouldn't create UNSUPPORTED_ATTRIBUTE issues
+        unsupported_issues = [
+            i for i in self.validator.issues[initial_issues:]
+            if i.get('type') == 'UNSUPPORTED_ATTRIBUTE'
+        ]
+        self.assertEqual(len(unsupported_issues), 0)
 
 
 class TestDeprecatedTags(unittest.TestCase):
@@ -156,19 +156,12 @@ class TestDeprecatedTags(unittest.TestCase):
             <apex:include pageName="IncludedPage"/>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                deprecated_issues = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'DEPRECATED_TAG'
-                ]
-                self.assertGreater(len(deprecated_issues), 0)
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        deprecated_issues = [
+            i for i in self.validator.issues
+            if i.get('type') == 'DEPRECATED_TAG'
+        ]
+        self.assertGreater(len(deprecated_issues), 0)
 
     def test_non_deprecated_tags(self):
         """Test that non-deprecated tags don't raise issues."""
@@ -181,21 +174,14 @@ class TestDeprecatedTags(unittest.TestCase):
             </apex:pageBlock>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                initial_issues = len(self.validator.issues)
-                self.validator._validate_file(file_path)
-                new_issues = len(self.validator.issues) - initial_issues
-                deprecated_issues = [
-                    i for i in self.validator.issues[initial_issues:]
-                    if i.get('type') == 'DEPRECATED_TAG'
-                ]
-                self.assertEqual(len(deprecated_issues), 0)
-            finally:
-                file_path.unlink()
+        initial_issues = len(self.validator.issues)
+        self.validator._validate_source(xml, 'Test.page')
+        new_issues = len(self.validator.issues) - initial_issues
+        deprecated_issues = [
+            i for i in self.validator.issues[initial_issues:]
+            if i.get('type') == 'DEPRECATED_TAG'
+        ]
+        self.assertEqual(len(deprecated_issues), 0)
 
 
 class TestXSSPatternDetection(unittest.TestCase):
@@ -212,20 +198,35 @@ class TestXSSPatternDetection(unittest.TestCase):
             <apex:outputText value="{!variable}"/>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                xss_issues = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'POTENTIAL_XSS'
-                ]
-                # May or may not detect depending on pattern
-                # This test documents behavior
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        xss_issues = [
+            i for i in self.validator.issues
+            if i.get('type') == 'POTENTIAL_XSS'
+        ]
+        # May or may not detect depending on pattern
+        # This test documents behavior
+
+
+@unittest.skipIf(validate_visualforce.HS_XSS_DATABASE is None, 'hyperscan not installed')
+class TestHyperscanXSS(unittest.TestCase):
+    """Tests for the hyperscan XSS pattern scan."""
+
+    def test_matches_re(self):
+        """Test that hyperscan finds the same XSS patterns as re."""
+        samples = (
+            '<apex:page/>',
+            '<div>{! name }</div>',
+            '<apex:outputText\x1cvalue =\t"{!name}"/>',
+            '<apex:outputText value="{!a.b}"/>',
+        )
+        for content in samples:
+            expected = [
+                message for pattern, message in validate_visualforce.XSS_PATTERNS[:1] if pattern.search(content)
+            ]
+            if expected and validate_visualforce.XSS_PATTERNS[1][0].search(content):
+                expected.append(validate_visualforce.XSS_PATTERNS[1][1])
+            self.assertEqual(validate_visualforce._xss_messages(content), expected, content)
+        self.assertEqual(len(validate_visualforce._xss_messages(samples[2])), 2)
 
 
 class TestMissingSLDS(unittest.TestCase):
@@ -242,19 +243,12 @@ class TestMissingSLDS(unittest.TestCase):
             <apex:form></apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                slds_issues = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'MISSING_SLDS'
-                ]
-                self.assertGreater(len(slds_issues), 0)
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        slds_issues = [
+            i for i in self.validator.issues
+            if i.get('type') == 'MISSING_SLDS'
+        ]
+        self.assertGreater(len(slds_issues), 0)
 
     def test_slds_present_no_warning(self):
         """Test that pages with SLDS don't get warning."""
@@ -264,20 +258,13 @@ class TestMissingSLDS(unittest.TestCase):
             <apex:form></apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                initial_issues = len(self.validator.issues)
-                self.validator._validate_file(file_path)
-                slds_issues = [
-                    i for i in self.validator.issues[initial_issues:]
-                    if i.get('type') == 'MISSING_SLDS'
-                ]
-                self.assertEqual(len(slds_issues), 0)
-            finally:
-                file_path.unlink()
+        initial_issues = len(self.validator.issues)
+        self.validator._validate_source(xml, 'Test.page')
+        slds_issues = [
+            i for i in self.validator.issues[initial_issues:]
+            if i.get('type') == 'MISSING_SLDS'
+        ]
+        self.assertEqual(len(slds_issues), 0)
 
 
 class TestSyntaxValidation(unittest.TestCase):
@@ -296,19 +283,12 @@ class TestSyntaxValidation(unittest.TestCase):
             </apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                syntax_errors = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'SYNTAX_ERROR'
-                ]
-                self.assertEqual(len(syntax_errors), 0)
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        syntax_errors = [
+            i for i in self.validator.issues
+            if i.get('type') == 'SYNTAX_ERROR'
+        ]
+        self.assertEqual(len(syntax_errors), 0)
 
     def test_invalid_syntax_produces_error(self):
         """Test that invalid VF syntax produces syntax error."""
@@ -319,24 +299,28 @@ class TestSyntaxValidation(unittest.TestCase):
             </apex:form>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                syntax_errors = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'SYNTAX_ERROR'
-                ]
-                self.assertGreater(len(syntax_errors), 0)
-            finally:
-                file_path.unlink()
+        self.validator._validate_source(xml, 'Test.page')
+        syntax_errors = [
+            i for i in self.validator.issues
+            if i.get('type') == 'SYNTAX_ERROR'
+        ]
+        self.assertGreater(len(syntax_errors), 0)
 
 
 class TestFileHandling(unittest.TestCase):
     """Tests for file handling and edge cases."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for the class's test files."""
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        cls.tmp = Path(cls._tmpdir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the class's test files."""
+        cls._tmpdir.cleanup()
+
     def setUp(self):
         """Set up test fixtures."""
         self.validator = VFValidator(verbose=False)
@@ -346,32 +330,22 @@ class TestFileHandling(unittest.TestCase):
         xml = '''<?xml version="1.0" ?>
         <apex:page xmlns:apex="http://www.force.com/2006/04/apex"/>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                # Should parse without errors
-                self.assertIsNotNone(self.validator.files_checked)
-            finally:
-                file_path.unlink()
+        file_path = self.tmp / f'{self._testMethodName}.page'
+        file_path.write_text(xml, encoding='utf-8')
+        self.validator._validate_file(file_path)
+        # Should parse without errors
+        self.assertIsNotNone(self.validator.files_checked)
 
     def test_component_file_detection(self):
         """Test that .component files are validated."""
         xml = '''<?xml version="1.0" ?>
         <apex:component xmlns:apex="http://www.force.com/2006/04/apex"/>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.component', delete=False) as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                # Should parse without errors
-                self.assertIsNotNone(self.validator.files_checked)
-            finally:
-                file_path.unlink()
+        file_path = self.tmp / f'{self._testMethodName}.component'
+        file_path.write_text(xml, encoding='utf-8')
+        self.validator._validate_file(file_path)
+        # Should parse without errors
+        self.assertIsNotNone(self.validator.files_checked)
 
     def test_unicode_handling(self):
         """Test handling of unicode characters in VF."""
@@ -380,19 +354,76 @@ class TestFileHandling(unittest.TestCase):
             <apex:form/>
         </apex:page>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.page', delete=False, encoding='utf-8') as f:
-            f.write(xml)
-            f.flush()
-            try:
-                file_path = Path(f.name)
-                self.validator._validate_file(file_path)
-                syntax_errors = [
-                    i for i in self.validator.issues
-                    if i.get('type') == 'SYNTAX_ERROR'
-                ]
-                self.assertEqual(len(syntax_errors), 0)
-            finally:
-                file_path.unlink()
+        file_path = self.tmp / f'{self._testMethodName}.page'
+        file_path.write_text(xml, encoding='utf-8')
+        self.validator._validate_file(file_path)
+        syntax_errors = [
+            i for i in self.validator.issues
+            if i.get('type') == 'SYNTAX_ERROR'
+        ]
+        self.assertEqual(len(syntax_errors), 0)
+
+    def test_element_limit(self):
+        """Test that elements past MAX_ELEMENTS are not checked."""
+        xml = '''<apex:page xmlns:apex="http://www.force.com/2006/04/apex">
+            <apex:form name="a"/><apex:form name="b"/><apex:form name="c"/>
+        </apex:page>'''
+        self.validator.MAX_ELEMENTS = 3
+
+        self.validator._validate_source(xml, 'Test.page')
+        types = [i.get('type') for i in self.validator.issues]
+        self.assertEqual(types.count('UNSUPPORTED_ATTRIBUTE'), 2)
+        self.assertIn('TOO_MANY_ELEMENTS', types)
+
+    def test_in_memory_source(self):
+        """Test that in-memory source is reported under the origin it is given."""
+        xml = '<apex:page xmlns:apex="http://www.force.com/2006/04/apex" dir="rtl"/>'
+
+        self.validator._validate_source(xml, 'pages/Test.page')
+        files = {i['file'] for i in self.validator.issues}
+        self.assertEqual(files, {str(Path('pages/Test.page'))})
+
+    def test_symlink_outside_source_dir_skipped(self):
+        """Test that a symlinked file pointing outside the source directory is not validated."""
+        xml = '<apex:page xmlns:apex="http://www.force.com/2006/04/apex" dir="rtl"/>'
+
+        with tempfile.TemporaryDirectory() as outside, tempfile.TemporaryDirectory() as tmp:
+            target = Path(outside) / 'Outside.page'
+            target.write_text(xml, encoding='utf-8')
+            (Path(tmp) / 'Inside.page').write_text(xml, encoding='utf-8')
+            (Path(tmp) / 'Link.page').symlink_to(target)
+            (Path(tmp) / 'InsideLink.page').symlink_to(Path(tmp) / 'Inside.page')
+
+            self.validator.validate(Path(tmp))
+            checked = {Path(i['file']).name for i in self.validator.issues}
+            self.assertEqual(checked, {'Inside.page', 'InsideLink.page'})
+
+
+class TestParallelValidation(unittest.TestCase):
+    """Tests for validating files across worker processes."""
+
+    def test_parallel_matches_sequential(self):
+        """Test that worker processes report the same issues, in the same order."""
+        pages = [
+            '<apex:page xmlns:apex="http://www.force.com/2006/04/apex" dir="rtl"><apex:form/></apex:page>',
+            '<apex:page xmlns:apex="http://www.force.com/2006/04/apex"><apex:include pageName="P"/></apex:page>',
+            '<apex:page><unclosed></apex:page>',
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(PARALLEL_MIN_FILES + 5):
+                (Path(tmp) / f'Page{i:03}.page').write_text(pages[i % len(pages)], encoding='utf-8')
+
+            sequential = VFValidator(jobs=1)
+            sequential.validate(Path(tmp))
+            parallel = VFValidator(jobs=2)
+            parallel.validate(Path(tmp))
+
+        self.assertEqual(sequential.issues, parallel.issues)
+        self.assertEqual(parallel.files_checked, PARALLEL_MIN_FILES + 5)
+        self.assertEqual(
+            {i['type'] for i in parallel.issues},
+            {'UNSUPPORTED_ATTRIBUTE', 'DEPRECATED_TAG', 'SYNTAX_ERROR', 'MISSING_SLDS'}
+        )
 
 
 if __name__ == '__main__':